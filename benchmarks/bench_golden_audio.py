@@ -0,0 +1,243 @@
+"""Golden-audio regression check: audio quality and speed against a recorded baseline
+
+Renders a fixed corpus through ModelManager.generate_speech (16-bit PCM,
+seeded torch RNG, one inference worker) and stores a fingerprint per item:
+duration, a hash of the exact PCM, an RMS envelope (10 ms frames) and
+log band energies (32 bands, 20 ms frames), plus median latency and
+realtime factor. Run with --record on the baseline build, then without
+it on a candidate build: each item is compared by duration, envelope
+correlation and spectral distance, and latency/RTF are reported side by
+side, so a speedup can be accepted or rejected with its quality impact
+quantified. Exits 1 if any item is outside the tolerances.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_golden_audio.py --record \
+        [--golden golden_audio.json] [--iterations 3] [--items short,numbers]
+    PYTHONPATH=src python benchmarks/bench_golden_audio.py \
+        [--golden golden_audio.json] [--max-duration-delta 0.03] \
+        [--min-envelope-corr 0.95] [--max-spectral-db 3.0]
+
+Compare on the same machine and thread settings as the recording; the
+fingerprints are only bit-exact across identical builds. Requires the
+service configuration in the environment (PA_TTS_* or PA_TTS_DOT_ENV),
+as for running the service.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+SEED = 1234
+
+# Fingerprint frames: RMS envelope and band energies
+ENVELOPE_FRAME_S = 0.010
+SPECTRUM_FRAME = 512
+SPECTRUM_HOP_S = 0.020
+SPECTRUM_BANDS = 32
+SPECTRUM_FMIN = 60.0
+
+# (name, voice, speed, text): chunking, normalization, pacing and voices
+CORPUS = [
+    ("short", "af_heart", 1.0, "Your order has shipped and should arrive on Thursday."),
+    ("question", "af_heart", 1.0, "Did you remember to lock the back door before you left?"),
+    ("numbers", "af_heart", 1.0,
+     "Call 555-0142 before 5:30 pm on March 3rd, 2025; the fee is $1,249.99 (about 12%)."),
+    ("fast", "af_heart", 1.3,
+     "Please hold while we transfer your call to the next available representative."),
+    ("british", "bm_george", 1.0,
+     "The committee will reconvene on Tuesday to review the revised proposal."),
+    ("blend", "af_bella(2)+af_sky(1)", 1.0,
+     "Blended voices mix the style of two speakers into one."),
+    ("paragraph", "af_heart", 1.0,
+     "Welcome back. In this episode we look at how speech synthesis services stream "
+     "audio. The model converts text to phonemes, predicts durations and generates a "
+     "waveform one segment at a time. The first segment decides how long a listener "
+     "waits, so it should be short. Later segments can be longer, because audio is "
+     "already playing while they are synthesized, and longer segments make better "
+     "use of each forward pass.\nA second paragraph starts on a new line, which the "
+     "pipeline treats as a hard boundary."),
+]
+
+
+def fingerprint(pcm: bytes, sample_rate: int) -> dict:
+    """Fingerprint 16-bit mono PCM: duration, hash, RMS envelope and log band energies"""
+    audio = np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+
+    frame = max(1, int(sample_rate * ENVELOPE_FRAME_S))
+    frames = audio[: len(audio) // frame * frame].reshape(-1, frame)
+    envelope = np.sqrt(np.mean(frames ** 2, axis=1))
+
+    hop = int(sample_rate * SPECTRUM_HOP_S)
+    bands = np.zeros((0, SPECTRUM_BANDS))
+    if len(audio) >= SPECTRUM_FRAME:
+        starts = np.arange(0, len(audio) - SPECTRUM_FRAME + 1, hop)
+        windows = audio[starts[:, None] + np.arange(SPECTRUM_FRAME)] * np.hanning(SPECTRUM_FRAME)
+        power = np.abs(np.fft.rfft(windows, axis=1)) ** 2
+        freqs = np.fft.rfftfreq(SPECTRUM_FRAME, 1 / sample_rate)
+        edges = np.geomspace(SPECTRUM_FMIN, sample_rate / 2, SPECTRUM_BANDS + 1)
+        bands = np.stack(
+            [power[:, (freqs >= lo) & (freqs < hi)].sum(axis=1)
+             for lo, hi in zip(edges, edges[1:])],
+            axis=1,
+        )
+        bands = 10 * np.log10(bands + 1e-10)
+
+    return {
+        "duration": round(len(audio) / sample_rate, 4),
+        "sha256": hashlib.sha256(pcm).hexdigest(),
+        "rms": round(float(np.sqrt(np.mean(audio ** 2))) if audio.size else 0.0, 6),
+        "envelope": np.round(envelope, 5).tolist(),
+        "bands_db": np.round(bands, 2).tolist(),
+    }
+
+
+def compare(golden: dict, new: dict) -> dict:
+    """Quality metrics of a new fingerprint against the golden one (time-aligned from the start)"""
+    duration_delta = (new["duration"] - golden["duration"]) / max(golden["duration"], 1e-6)
+
+    a, b = np.array(golden["envelope"]), np.array(new["envelope"])
+    n = min(len(a), len(b))
+    if n > 1 and a[:n].std() > 0 and b[:n].std() > 0:
+        envelope_corr = float(np.corrcoef(a[:n], b[:n])[0, 1])
+    else:
+        envelope_corr = 1.0 if np.array_equal(a, b) else 0.0
+
+    a, b = np.array(golden["bands_db"]), np.array(new["bands_db"])
+    n = min(len(a), len(b))
+    # Floor both at 60 dB below the golden peak: differences in near-silent
+    # bands (e.g. exact zeros vs dither) are inaudible but huge in dB
+    floor = a.max() - 60 if a.size else 0.0
+    spectral_db = (
+        float(np.abs(np.maximum(a[:n], floor) - np.maximum(b[:n], floor)).mean()) if n else 0.0
+    )
+
+    return {
+        "exact": golden["sha256"] == new["sha256"],
+        "duration_delta": duration_delta,
+        "envelope_corr": envelope_corr,
+        "spectral_db": spectral_db,
+    }
+
+
+async def render(manager, voice: str, speed: float, text: str, iterations: int):
+    """Synthesize one item; return (pcm of the first run, median latency s)"""
+    import torch
+
+    pcm, latencies = None, []
+    for _ in range(iterations):
+        # Same seed every run: the vocoder's noise source draws from the torch RNG
+        torch.manual_seed(SEED)
+        start = time.perf_counter()
+        audio = await manager.generate_speech(text, voice=voice, speed=speed, response_format="pcm")
+        latencies.append(time.perf_counter() - start)
+        if pcm is None:
+            pcm = audio
+        elif audio != pcm:
+            print(f"  warning: output differs between runs of the same input ({voice})")
+    return pcm, statistics.median(latencies)
+
+
+async def run(args) -> int:
+    import torch
+
+    from pattern_tts.core.config import settings
+    from pattern_tts.services.model_manager import KOKORO_SAMPLE_RATE, ModelManager
+    from pattern_tts.services.voice_manager import VoiceManager
+
+    # One worker, so the seeded global RNG is only drawn by one request at a time
+    settings.max_concurrent_requests = 1
+    manager = ModelManager(settings.model_dir, voice_manager=VoiceManager())
+    await manager.initialize()
+    await manager.generate_speech("Warm up.", voice="af_heart", response_format="pcm")
+
+    items = [item for item in CORPUS if not args.items or item[0] in args.items.split(",")]
+    golden_path = Path(args.golden)
+    golden = {} if args.record else json.loads(golden_path.read_text())
+
+    results = {}
+    for name, voice, speed, text in items:
+        pcm, latency = await render(manager, voice, speed, text, args.iterations)
+        result = fingerprint(pcm, KOKORO_SAMPLE_RATE)
+        result.update(
+            latency_ms=round(latency * 1000, 1), rtf=round(result["duration"] / latency, 3)
+        )
+        results[name] = result
+
+    environment = {
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "machine": platform.machine(),
+        "threads": manager.thread_plan.intra_op_threads,
+        "target_max_tokens": settings.target_max_tokens,
+        "seed": SEED,
+    }
+
+    if args.record:
+        golden_path.write_text(json.dumps({"environment": environment, "items": results}))
+        print(f"Recorded {len(results)} items to {golden_path}\n")
+        print(f"{'item':<10} {'audio s':>8} {'latency ms':>11} {'rtf':>6}")
+        for name, result in results.items():
+            print(f"{name:<10} {result['duration']:>8.2f} {result['latency_ms']:>11.0f} "
+                  f"{result['rtf']:>6.2f}")
+        return 0
+
+    if golden["environment"] != environment:
+        print(f"warning: environment differs from the recording\n"
+              f"  golden: {golden['environment']}\n  now:    {environment}")
+
+    print(f"{'item':<10} {'exact':>5} {'dur Δ%':>7} {'env r':>6} {'spec dB':>8} "
+          f"{'latency ms':>17} {'rtf':>13} {'':>5}")
+    failures = 0
+    for name, result in results.items():
+        reference = golden["items"].get(name)
+        if reference is None:
+            print(f"{name:<10} not in golden file")
+            continue
+        m = compare(reference, result)
+        ok = (
+            abs(m["duration_delta"]) <= args.max_duration_delta
+            and m["envelope_corr"] >= args.min_envelope_corr
+            and m["spectral_db"] <= args.max_spectral_db
+        )
+        failures += not ok
+        print(
+            f"{name:<10} {'yes' if m['exact'] else 'no':>5} {m['duration_delta'] * 100:>7.2f} "
+            f"{m['envelope_corr']:>6.3f} {m['spectral_db']:>8.2f} "
+            f"{reference['latency_ms']:>7.0f} → {result['latency_ms']:>7.0f} "
+            f"{reference['rtf']:>5.2f} → {result['rtf']:>5.2f} {'ok' if ok else 'FAIL':>5}"
+        )
+
+    golden_latency = sum(golden["items"][n]["latency_ms"] for n in results if n in golden["items"])
+    new_latency = sum(r["latency_ms"] for n, r in results.items() if n in golden["items"])
+    if new_latency:
+        print(f"\nTotal latency {golden_latency:.0f} → {new_latency:.0f} ms "
+              f"({golden_latency / new_latency:.2f}x), {failures} items out of tolerance")
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--record", action="store_true",
+                        help="Write the golden file instead of comparing against it")
+    parser.add_argument("--golden", default="golden_audio.json", help="Golden fingerprint file")
+    parser.add_argument("--items", default="", help="Comma-separated corpus items (default all)")
+    parser.add_argument("--iterations", type=int, default=3, help="Runs per item (median latency)")
+    parser.add_argument("--max-duration-delta", type=float, default=0.03,
+                        help="Largest relative duration change")
+    parser.add_argument("--min-envelope-corr", type=float, default=0.95,
+                        help="Smallest correlation of the RMS envelopes")
+    parser.add_argument("--max-spectral-db", type=float, default=3.0,
+                        help="Largest mean absolute band-energy difference (dB)")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
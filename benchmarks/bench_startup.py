@@ -0,0 +1,123 @@
+"""Benchmark application import and startup time
+
+Imports the ASGI app under ``python -X importtime`` and reports the total
+import time, the slowest modules, and whether any heavy ML package (torch,
+kokoro, spaCy, ...) was imported on the startup path. Optionally starts the
+service with uvicorn and measures time until /health and /ready answer.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_startup.py [--top 15] [--serve]
+
+Requires the service configuration in the environment (PA_TTS_* or
+PA_TTS_DOT_ENV), as for running the service.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+APP_MODULE = "pattern_tts.api.main"
+
+# Packages that must only be imported by the background model load
+HEAVY_PACKAGES = ("torch", "kokoro", "misaki", "spacy", "phonemizer", "transformers")
+
+
+def import_profile() -> list[tuple[int, int, str]]:
+    """Import the app in a fresh interpreter with -X importtime
+
+    Returns:
+        List of (self_us, cumulative_us, module) in import order
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {APP_MODULE}"],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+    )
+    if proc.returncode != 0:
+        sys.exit(f"Importing {APP_MODULE} failed:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), module.rstrip()))
+    return rows
+
+
+def report_imports(rows: list[tuple[int, int, str]], top: int) -> bool:
+    """Print the import profile; return False if a heavy package was imported"""
+    total_us = sum(self_us for self_us, _, _ in rows)
+    print(f"Import of {APP_MODULE}: {total_us / 1000:.1f}ms, {len(rows)} modules")
+
+    print(f"\nSlowest {top} imports (cumulative):")
+    for _, cumulative_us, module in sorted(rows, key=lambda r: -r[1])[:top]:
+        print(f"  {cumulative_us / 1000:9.1f}ms  {module}")
+
+    heavy = sorted({
+        module.strip() for _, _, module in rows
+        if module.strip().split(".")[0] in HEAVY_PACKAGES
+    })
+    if heavy:
+        print(f"\nFAIL: heavy packages imported at startup: {', '.join(heavy[:10])}")
+        return False
+    print(f"\nOK: none of {', '.join(HEAVY_PACKAGES)} imported at startup")
+    return True
+
+
+def wait_for(url: str, deadline: float) -> float | None:
+    """Poll url until it returns 200; return the time it did, or None"""
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                if response.status == 200:
+                    return time.perf_counter()
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            pass
+        time.sleep(0.02)
+    return None
+
+
+def report_serve(port: int, timeout_s: float) -> None:
+    """Start uvicorn and time /health (liveness) and /ready (model loaded)"""
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", f"{APP_MODULE}:app", "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = start + timeout_s
+        health = wait_for(f"http://127.0.0.1:{port}/health", deadline)
+        ready = wait_for(f"http://127.0.0.1:{port}/ready", deadline)
+    finally:
+        server.terminate()
+        server.wait()
+
+    print("\nServer startup:")
+    for name, at in (("/health", health), ("/ready", ready)):
+        value = f"{(at - start) * 1000:9.0f}ms" if at else f"  timeout ({timeout_s:.0f}s)"
+        print(f"  {name:<8} {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--serve", action="store_true", help="Also time /health and /ready")
+    parser.add_argument("--port", type=int, default=18205)
+    parser.add_argument("--timeout", type=float, default=300.0, help="Seconds to wait for /ready")
+    args = parser.parse_args()
+
+    ok = report_imports(import_profile(), args.top)
+    if args.serve:
+        report_serve(args.port, args.timeout)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark time-to-first-audio and throughput of streamed synthesis
+
+Loads the model in process and streams a few texts under different
+first-chunk policies (PA_TTS_STREAM_FIRST_CHUNK_WORDS and
+PA_TTS_STREAM_CHUNK_GROWTH), against a non-streamed request whose first
+audio is the whole response. Reports median time to first audio, total
+time and the realtime factor (audio seconds per wall second), so the
+policy can be tuned for a deployment's hardware.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_streaming.py \
+        [--policies 0:2,4:2,8:2,8:3,16:2] [--iterations 3] [--format pcm]
+
+Each policy is FIRST_CHUNK_WORDS:GROWTH. Requires the service
+configuration in the environment (PA_TTS_* or PA_TTS_DOT_ENV), as for
+running the service.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+TEXTS = {
+    "short": "Your order has shipped and should arrive on Thursday.",
+    "long-sentence": (
+        "Before we get started with today's agenda, which covers the roadmap for the "
+        "next two quarters, the hiring plan and the results of the customer survey, I "
+        "want to thank everyone who helped with the launch last week."
+    ),
+    "paragraph": (
+        "Welcome back. In this episode we look at how speech synthesis services stream "
+        "audio. The model converts text to phonemes, predicts durations and generates a "
+        "waveform one segment at a time. The first segment decides how long a listener "
+        "waits, so it should be short. Later segments can be longer, because audio is "
+        "already playing while they are synthesized, and longer segments make better "
+        "use of each forward pass."
+    ),
+}
+
+
+async def measure_stream(manager, text: str, voice: str, fmt: str) -> tuple[float, float, float]:
+    """Stream one request; return (first audio s, total s, audio s)"""
+    from pattern_tts.services.model_manager import KOKORO_SAMPLE_RATE
+
+    start = time.perf_counter()
+    first = None
+    audio_bytes = 0
+    async for chunk in manager.stream_speech(text, voice=voice, response_format=fmt):
+        if first is None:
+            first = time.perf_counter() - start
+        audio_bytes += len(chunk)
+    total = time.perf_counter() - start
+    # Only exact for pcm (16-bit mono at the native rate)
+    return first, total, audio_bytes / 2 / KOKORO_SAMPLE_RATE
+
+
+async def measure_full(manager, text: str, voice: str, fmt: str) -> tuple[float, float, float]:
+    """Non-streamed request: first audio arrives with the whole response"""
+    from pattern_tts.services.model_manager import KOKORO_SAMPLE_RATE
+
+    start = time.perf_counter()
+    audio = await manager.generate_speech(text, voice=voice, response_format=fmt)
+    total = time.perf_counter() - start
+    return total, total, len(audio) / 2 / KOKORO_SAMPLE_RATE
+
+
+async def run(args) -> None:
+    from pattern_tts.core.config import settings
+    from pattern_tts.services.model_manager import ModelManager
+    from pattern_tts.services.voice_manager import VoiceManager
+
+    manager = ModelManager(settings.model_dir, voice_manager=VoiceManager())
+    await manager.initialize()
+    await manager.generate_speech(TEXTS["short"], voice=args.voice, response_format=args.format)
+
+    policies = [("full", None, None)]
+    for policy in args.policies.split(","):
+        words, growth = policy.strip().split(":")
+        policies.append((f"stream {words}:{growth}", int(words), float(growth)))
+
+    print(f"target_max_tokens={settings.target_max_tokens}, format={args.format}, "
+          f"median of {args.iterations}\n")
+    print(f"{'text':<14} {'policy':<14} {'first ms':>9} {'total ms':>9} {'rtf':>6}")
+    for name, text in TEXTS.items():
+        for label, words, growth in policies:
+            if words is not None:
+                settings.stream_first_chunk_words = words
+                settings.stream_chunk_growth = growth
+            measure = measure_full if words is None else measure_stream
+            runs = [
+                await measure(manager, text, args.voice, args.format)
+                for _ in range(args.iterations)
+            ]
+            first = statistics.median(r[0] for r in runs) * 1000
+            total = statistics.median(r[1] for r in runs) * 1000
+            rtf = statistics.median(r[2] / r[1] for r in runs)
+            print(f"{name:<14} {label:<14} {first:>9.0f} {total:>9.0f} {rtf:>6.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--policies", default="0:2,4:2,8:2,8:3,16:2",
+                        help="Comma-separated FIRST_CHUNK_WORDS:GROWTH policies")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--format", default="pcm", help="Streamable response format")
+    parser.add_argument("--voice", default="af_heart")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark text normalization cost per request
+
+Normalizes a maximum-size (4096 char) request mixing prose, numbers,
+currency, dates, times, URLs and abbreviations, both with a cold fragment
+cache (every fragment parsed and spelled out) and a warm one.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_text_normalization.py [--iterations 200]
+"""
+
+import argparse
+import statistics
+import time
+
+from pattern_tts.utils.text_normalization import (
+    normalize_fragment,
+    normalize_text,
+    number_to_words,
+)
+
+# Worst case: a fragment to normalize every ~20 characters
+DENSE_SAMPLE = (
+    "Dr. Smith paid $12.50 on 2024-01-15 at 3:30 pm for 3 tickets. "
+    "Revenue grew 45% to $1.5M in 1990, the 21st consecutive year. "
+    "See https://example.com/docs/v2 or email support@example.com. "
+    "Meet at 221 Baker St. on 01/15/2024, approx. 1,234,567 people vs. 42 "
+    "expected & the temperature was -5 degrees. St. Louis is 2,000 miles away. "
+    "Version 2.10.1 of No. 7 ships etc. Music of the 1990s was 3x louder. "
+    "The quick brown fox jumps over the lazy dog, again and again, until dusk. "
+)
+
+# Typical article/assistant text: a few numbers per paragraph
+TYPICAL_SAMPLE = (
+    "The committee met on Tuesday to review the proposal in detail. Members "
+    "agreed that the new schedule would reduce delays for most passengers, "
+    "although several raised concerns about weekend service. The budget of "
+    "$4.2M was approved, and work is expected to begin in 2025. "
+)
+
+PROSE_SAMPLE = "The quick brown fox jumps over the lazy dog, again and again. "
+
+MAX_INPUT_CHARS = 4096
+
+
+def build_input(sample: str = DENSE_SAMPLE, max_chars: int = MAX_INPUT_CHARS) -> str:
+    text = sample * (max_chars // len(sample) + 1)
+    return text[:max_chars]
+
+
+def clear_caches() -> None:
+    normalize_fragment.cache_clear()
+    number_to_words.cache_clear()
+
+
+def bench(text: str, iterations: int, cold: bool) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        if cold:
+            clear_caches()
+        start = time.perf_counter()
+        normalize_text(text)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    p50 = statistics.median(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<14} p50={p50:7.3f}ms  p95={p95:7.3f}ms  max={timings[-1]:7.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    # Import inflect and build the engine outside the timed region
+    normalize_text("1")
+
+    print(f"Input: {MAX_INPUT_CHARS} chars, {args.iterations} iterations")
+    for name, sample in (
+        ("dense", DENSE_SAMPLE),
+        ("typical", TYPICAL_SAMPLE),
+        ("prose", PROSE_SAMPLE),
+    ):
+        text = build_input(sample)
+        report(f"{name} cold", bench(text, args.iterations, cold=True))
+        report(f"{name} warm", bench(text, args.iterations, cold=False))
+
+
+if __name__ == "__main__":
+    main()
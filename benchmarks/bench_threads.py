@@ -0,0 +1,123 @@
+"""Benchmark torch thread / inference worker splits under concurrent load
+
+Runs one fresh process per configuration (torch thread pools can only be
+sized once per process) with PA_TTS_TORCH_NUM_THREADS and
+PA_TTS_MAX_CONCURRENT_REQUESTS set, loads the model, fires concurrent
+requests and reports throughput and latency. Run it inside a container
+with the production CPU limit to pick the split for that node type.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_threads.py \
+        [--configs 0x1,1x4,2x2] [--requests 16] [--voice af_heart]
+
+Each config is THREADSxWORKERS; THREADS=0 derives the intra-op threads
+from the CPU budget. Requires the service configuration in the
+environment (PA_TTS_* or PA_TTS_DOT_ENV), as for running the service.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+TEXT = (
+    "The quarterly report shows steady growth across all regions. "
+    "Customer satisfaction improved, and the support backlog is the lowest "
+    "it has been in two years."
+)
+
+
+async def run_worker(requests: int, voice: str) -> dict:
+    """Load the model and synthesize `requests` utterances concurrently"""
+    from pattern_tts.core.config import settings
+    from pattern_tts.services.model_manager import ModelManager
+    from pattern_tts.services.voice_manager import VoiceManager
+    from pattern_tts.utils.cpu import available_cpus
+
+    manager = ModelManager(settings.model_dir, voice_manager=VoiceManager())
+    await manager.initialize()
+    # Warm up every worker so lazy per-thread setup is not timed
+    await asyncio.gather(*(
+        manager.generate_speech(TEXT, voice=voice, response_format="pcm")
+        for _ in range(manager.thread_plan.workers)
+    ))
+
+    latencies = []
+    audio_bytes = 0
+
+    async def one() -> None:
+        nonlocal audio_bytes
+        start = time.perf_counter()
+        audio = await manager.generate_speech(TEXT, voice=voice, response_format="pcm")
+        latencies.append(time.perf_counter() - start)
+        audio_bytes += len(audio)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    wall = time.perf_counter() - start
+
+    # pcm is 16-bit mono at the voice sample rate
+    audio_seconds = audio_bytes / 2 / manager.voice_manager.get_sample_rate(voice)
+    info = manager.thread_info()
+    return {
+        "cpu_budget": available_cpus(),
+        "intra_op": info["intra_op_threads"],
+        "workers": info["workers"],
+        "req_per_s": requests / wall,
+        "audio_s_per_s": audio_seconds / wall,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": sorted(latencies)[math.ceil(0.95 * len(latencies)) - 1] * 1000,
+    }
+
+
+def run_config(threads: int, workers: int, requests: int, voice: str) -> dict | None:
+    """Run one THREADSxWORKERS configuration in a fresh interpreter"""
+    env = os.environ.copy()
+    env["PA_TTS_TORCH_NUM_THREADS"] = str(threads)
+    env["PA_TTS_MAX_CONCURRENT_REQUESTS"] = str(workers)
+    env.setdefault("PA_TTS_LOG_LEVEL", "WARNING")
+    proc = subprocess.run(
+        [sys.executable, __file__, "--worker", "--requests", str(requests), "--voice", voice],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if proc.returncode != 0:
+        print(f"  {threads}x{workers} failed:\n{proc.stderr[-2000:]}", file=sys.stderr)
+        return None
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--configs", default="0x1,1x2,1x4,2x2",
+                        help="Comma-separated THREADSxWORKERS configs")
+    parser.add_argument("--requests", type=int, default=16, help="Concurrent requests per config")
+    parser.add_argument("--voice", default="af_heart")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(asyncio.run(run_worker(args.requests, args.voice))))
+        return
+
+    print(f"{args.requests} concurrent requests per config\n")
+    print(f"{'config':>8} {'budget':>6} {'intra':>5} {'workers':>7} "
+          f"{'req/s':>7} {'audio s/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for config in args.configs.split(","):
+        threads, workers = (int(part) for part in config.strip().split("x"))
+        result = run_config(threads, workers, args.requests, args.voice)
+        if result is None:
+            continue
+        print(f"{config:>8} {result['cpu_budget']:>6} {result['intra_op']:>5} "
+              f"{result['workers']:>7} {result['req_per_s']:>7.2f} "
+              f"{result['audio_s_per_s']:>9.2f} {result['p50_ms']:>8.0f} {result['p95_ms']:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
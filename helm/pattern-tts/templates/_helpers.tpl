@@ -82,4 +82,5 @@ Helper to convert .Values.config to ConfigMap data with PA_TTS_ prefix
 {{- range $key, $val := .Values.config -}}
 {{- printf "PA_TTS_%s: %s\n" $key ($val | toString | quote) }}
 {{- end -}}
+{{- printf "PA_TTS_JOBS_ENABLED: %s\n" (.Values.jobs.enabled | toString | quote) }}
 {{- end -}}
@@ -3,14 +3,17 @@ Pattern TTS Service - FastAPI Application
 OpenAI-compatible Text-to-Speech API using Kokoro TTS
 """
 
+import asyncio
+import signal
 import sys
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime
 
-import torch
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from loguru import logger
 
 from ..core.config import settings
@@ -40,31 +43,46 @@ def setup_logger():
 setup_logger()
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Lifespan context manager for model initialization"""
+def _import_model_stack():
+    """Import torch, kokoro and the model services (slow; run in a thread)"""
+    from ..services.job_manager import JobManager
     from ..services.model_manager import ModelManager
-    from ..services.voice_manager import VoiceManager
+    from ..services.resource_manager import ResourceManager
+
+    return ModelManager, ResourceManager, JobManager
 
-    logger.info("🚀 Initializing Pattern TTS Service")
 
+async def load_model(app: FastAPI) -> None:
+    """Import the ML stack, load and warm up the model, then mark the app ready
+
+    Runs as a background task so the app (and /health) come up immediately;
+    /ready reports not ready until this completes.
+    """
+    start = time.perf_counter()
     try:
-        # Initialize managers
-        model_manager = ModelManager()
-        voice_manager = VoiceManager()
+        ModelManager, ResourceManager, JobManager = await asyncio.to_thread(
+            _import_model_stack
+        )
+        voice_manager = app.state.voice_manager
+        model_manager = ModelManager(settings.model_dir, voice_manager=voice_manager)
 
         # Initialize model with warmup
         device, model_name, voice_count = await model_manager.initialize_with_warmup(
             voice_manager
         )
 
-        # Store in app state
+        resource_manager = ResourceManager(model_manager)
+        app.state.resource_manager = resource_manager
+        job_manager = JobManager() if settings.jobs_enabled else None
+        app.state.job_manager = job_manager
+        app.state.load_seconds = round(time.perf_counter() - start, 2)
+        # Publishing model_manager marks the service ready
         app.state.model_manager = model_manager
-        app.state.voice_manager = voice_manager
 
     except Exception as e:
         logger.error(f"Failed to initialize model: {e}")
-        raise
+        app.state.load_error = str(e)
+        return
 
     boundary = "=" * 60
     startup_msg = f"""
@@ -75,18 +93,98 @@ async def lifespan(app: FastAPI):
 {boundary}
 """
     if device == "cuda":
+        import torch
+
         startup_msg += f"\nCUDA: {torch.cuda.is_available()}"
         if torch.cuda.is_available():
             startup_msg += f"\nGPU: {torch.cuda.get_device_name(0)}"
     startup_msg += f"\nVoices: {voice_count} voice packs loaded"
+    startup_msg += f"\nModel ready in {app.state.load_seconds}s"
     startup_msg += f"\n{boundary}\n"
 
     logger.info(startup_msg)
 
+    # Enforce memory budget and idle unload; run speech jobs (including
+    # ones interrupted by a previous shutdown)
+    background = [resource_manager.run()]
+    if job_manager is not None:
+        background.append(job_manager.run(model_manager))
+    await asyncio.gather(*background)
+
+
+def install_drain_handler(app: FastAPI) -> None:
+    """Drain in-flight work on SIGTERM before the server starts shutting down
+
+    The server's own SIGTERM handler stops accepting connections right
+    away. This handler replaces it: the service fails readiness and
+    finishes admitted requests first, then hands the signal on to the
+    server's handler. Signal handlers can only be installed from the main
+    thread; elsewhere (e.g. test clients) the drain runs at shutdown only.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        previous = signal.getsignal(signal.SIGTERM)
+    except ValueError:
+        return
+
+    async def drain_then_exit(signum: int, frame) -> None:
+        await app.state.drain.drain()
+        signal.signal(signal.SIGTERM, previous)
+        if callable(previous):
+            previous(signum, frame)
+        else:
+            signal.raise_signal(signum)
+
+    def handle_sigterm(signum: int, frame) -> None:
+        loop.call_soon_threadsafe(
+            lambda: asyncio.ensure_future(drain_then_exit(signum, frame))
+        )
+
+    try:
+        signal.signal(signal.SIGTERM, handle_sigterm)
+    except ValueError:
+        logger.debug("Not in the main thread; SIGTERM drain handler not installed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Lifespan context manager: start serving now, load the model in the background"""
+    from ..services.audio_cache import create_audio_cache
+    from ..services.drain import DrainController
+    from ..services.profiler import Profiler
+    from ..services.voice_manager import VoiceManager
+
+    logger.info("🚀 Initializing Pattern TTS Service")
+
+    app.state.load_error = None
+    app.state.voice_manager = VoiceManager()
+    app.state.audio_cache = create_audio_cache()
+    app.state.profiler = Profiler()
+    app.state.drain = DrainController()
+    install_drain_handler(app)
+
+    # Hot-load voice packs added to the voices directory
+    voice_watch_task = asyncio.create_task(app.state.voice_manager.watch())
+    # Load the model, then run resource checks and speech jobs
+    model_task = asyncio.create_task(load_model(app))
+
     yield
 
-    # Cleanup on shutdown
+    # Cleanup on shutdown: finish admitted work first (already done if the
+    # drain was started by SIGTERM), then store results and free the model
     logger.info("Shutting down Pattern TTS Service")
+    await app.state.drain.drain()
+    voice_watch_task.cancel()
+    model_task.cancel()
+    # Let an interrupted speech job release its lease so it resumes elsewhere
+    await asyncio.gather(model_task, return_exceptions=True)
+    if app.state.audio_cache is not None:
+        # Backends write through on set; closing flushes the connection
+        await app.state.audio_cache.close()
+    model_manager = getattr(app.state, "model_manager", None)
+    if model_manager is not None:
+        model_manager.shutdown()
+    logger.info(f"Shutdown complete: {app.state.drain.snapshot()}")
 
 
 # Initialize FastAPI app
@@ -110,7 +208,21 @@ app.add_middleware(
 # Health check endpoint
 @app.get("/health")
 async def health_check():
-    """Health check endpoint for Kubernetes probes"""
+    """Health check endpoint for Kubernetes probes
+
+    Answers as soon as the app is up, while the model loads. Fails only
+    if the model failed to load, so the liveness probe restarts the pod.
+    """
+    if getattr(app.state, "load_error", None):
+        return JSONResponse(
+            status_code=503,
+            content={
+                "status": "unhealthy",
+                "service": settings.app_name,
+                "reason": f"model load failed: {app.state.load_error}",
+            },
+        )
+
     return {
         "status": "healthy",
         "service": settings.app_name,
@@ -121,23 +233,43 @@ async def health_check():
 
 @app.get("/ready")
 async def readiness_check():
-    """Readiness check - verifies model is loaded"""
-    if not hasattr(app.state, "model_manager"):
-        return {"status": "not_ready", "reason": "model_manager not initialized"}
-
+    """Readiness check - verifies model is loaded (503 until it is)"""
     if not hasattr(app.state, "voice_manager"):
-        return {"status": "not_ready", "reason": "voice_manager not initialized"}
+        return JSONResponse(
+            status_code=503,
+            content={"status": "not_ready", "reason": "voice_manager not initialized"},
+        )
+
+    drain = getattr(app.state, "drain", None)
+    if drain is not None and drain.draining:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "draining", "in_flight": drain.in_flight},
+        )
+
+    if not hasattr(app.state, "model_manager"):
+        reason = "model loading"
+        if app.state.load_error:
+            reason = f"model load failed: {app.state.load_error}"
+        return JSONResponse(
+            status_code=503,
+            content={"status": "not_ready", "reason": reason},
+        )
 
     return {
         "status": "ready",
         "service": settings.app_name,
         "timestamp": datetime.utcnow().isoformat(),
+        "load_seconds": getattr(app.state, "load_seconds", None),
+        "residency": app.state.resource_manager.snapshot(),
     }
 
 
 # Include routers
+from .routers.admin import router as admin_router
 from .routers.openai_compatible import router as openai_router
 app.include_router(openai_router)
+app.include_router(admin_router)
 
 
 def main():
@@ -146,6 +278,8 @@ def main():
         host="0.0.0.0",
         port=8205,
         reload=False,
+        # The app drains in-flight work on SIGTERM; cancel what outlives it
+        timeout_graceful_shutdown=5,
     )
 
 
@@ -0,0 +1,110 @@
+"""Admin endpoints for Pattern TTS Service (request traces)"""
+
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from ...core.config import settings
+
+
+def is_admin_request(request: Request) -> bool:
+    """Whether the request carries the configured X-Admin-Token
+
+    Args:
+        request: FastAPI request
+
+    Returns:
+        True if an admin token is configured and the header matches it
+    """
+    token = request.headers.get("X-Admin-Token", "")
+    return bool(settings.admin_token) and secrets.compare_digest(token, settings.admin_token)
+
+
+def require_admin(request: Request) -> None:
+    """Dependency guarding admin endpoints
+
+    Raises:
+        HTTPException: 404 if the admin API is disabled, 403 if the token is wrong
+    """
+    if not settings.admin_token:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "not_found",
+                "message": "Admin API is disabled (PA_TTS_ADMIN_TOKEN not set)",
+                "type": "invalid_request_error"
+            }
+        )
+    if not is_admin_request(request):
+        raise HTTPException(
+            status_code=403,
+            detail={
+                "error": "forbidden",
+                "message": "Missing or invalid X-Admin-Token",
+                "type": "invalid_request_error"
+            }
+        )
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin)],
+)
+
+
+@router.get("/traces")
+async def list_traces(request: Request):
+    """List kept request traces (profiled or slow), newest first
+
+    Args:
+        request: FastAPI request for app state access
+
+    Returns:
+        Dict with profiler settings/counters and trace summaries
+    """
+    profiler = request.app.state.profiler
+    return {
+        "profiler": profiler.snapshot(),
+        "traces": profiler.list(),
+    }
+
+
+@router.get("/traces/{trace_id}")
+async def get_trace(trace_id: str, request: Request):
+    """Full trace: spans, per-segment breakdown and profiler report
+
+    Args:
+        trace_id: Trace ID (also returned in the X-Trace-Id response header)
+        request: FastAPI request for app state access
+
+    Returns:
+        Trace dict
+
+    Raises:
+        HTTPException: If the trace is not (or no longer) in the buffer
+    """
+    trace = request.app.state.profiler.get(trace_id)
+    if trace is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "not_found",
+                "message": f"Trace '{trace_id}' not found",
+                "type": "invalid_request_error"
+            }
+        )
+    return trace.to_dict()
+
+
+@router.delete("/traces")
+async def clear_traces(request: Request):
+    """Drop all kept traces
+
+    Args:
+        request: FastAPI request for app state access
+
+    Returns:
+        Dict with the number of traces removed
+    """
+    return {"deleted": request.app.state.profiler.clear()}
@@ -1,10 +1,23 @@
 """OpenAI-compatible TTS endpoint for Pattern TTS Service"""
 
+import base64
+import re
+from contextlib import nullcontext
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import Response
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from loguru import logger
 from pydantic import BaseModel, Field
 
+from ...core.config import settings
+from ...services.voice_manager import (
+    OPENAI_VOICE_MAPPING,
+    canonical_voice_blend,
+    parse_voice_blend,
+)
+from ...utils.precomputed_json import PrecomputedJSON
+from .admin import is_admin_request
 
 router = APIRouter(
     prefix="/v1",
@@ -29,7 +42,8 @@ class SpeechRequest(BaseModel):
     )
     voice: str = Field(
         default="alloy",
-        description="Voice ID (alloy, echo, fable, onyx, nova, shimmer)"
+        description="Voice ID (alloy, echo, fable, onyx, nova, shimmer), or a blend "
+                    "such as af_bella(2)+af_sky(1)"
     )
     speed: float = Field(
         default=1.0,
@@ -39,39 +53,97 @@ class SpeechRequest(BaseModel):
     )
     response_format: str = Field(
         default="mp3",
-        description="Audio format (mp3, opus, aac, flac)"
+        description="Audio format (mp3, opus, aac, flac, wav, pcm, mulaw)"
+    )
+    sample_rate: Optional[int] = Field(
+        default=None,
+        description="Output sample rate in Hz (default: the voice's native rate, 24000)"
+    )
+    bitrate: Optional[int] = Field(
+        default=None,
+        ge=8,
+        le=320,
+        description="Bitrate in kbps for mp3/opus/aac (default scales with sample rate)"
+    )
+    channels: int = Field(
+        default=1,
+        ge=1,
+        le=2,
+        description="Output channels (1 = mono, 2 = stereo)"
+    )
+    stream: bool = Field(
+        default=False,
+        description="Stream audio segment by segment as it is synthesized "
+                    "(mp3, opus, aac, pcm or mulaw; not cached)"
+    )
+
+
+class SpeechJobRequest(SpeechRequest):
+    """Speech job request: a SpeechRequest for documents up to jobs_max_chars"""
+
+    input: str = Field(
+        ...,
+        max_length=settings.jobs_max_chars,
+        description=f"Text to synthesize (max {settings.jobs_max_chars} characters)"
     )
 
 
 # Voice mapping: OpenAI voice names → Kokoro voice IDs
-VOICE_MAPPING = {
-    "alloy": "af_sky",      # Female, clear
-    "echo": "am",           # Male
-    "fable": "af",          # Female
-    "onyx": "am_adam",      # Male, deep
-    "nova": "af_bella",     # Female, warm
-    "shimmer": "af_sarah"   # Female, bright
-}
+VOICE_MAPPING = OPENAI_VOICE_MAPPING
+OPENAI_VOICES_TEXT = ", ".join(VOICE_MAPPING)
+
+# Voice names within a voice spec (not blend weights)
+_VOICE_NAME_RE = re.compile(r"[\w-]+(?=\s*(?:\(|\+|$))")
 
 # Supported models (both map to same Kokoro model)
 SUPPORTED_MODELS = {"tts-1", "tts-1-hd", "kokoro"}
 
+# GET /v1/models body (static, serialized once)
+MODELS_JSON = PrecomputedJSON.serialize({
+    "object": "list",
+    "data": [
+        {
+            "id": model_id,
+            "object": "model",
+            "created": 1699046400,
+            "owned_by": "pattern-tts"
+        }
+        for model_id in ("tts-1", "tts-1-hd", "kokoro")
+    ]
+})
+
+
+def _precomputed_response(payload: PrecomputedJSON, request: Request) -> Response:
+    """Serve a pre-serialized body, or 304 if the client already has it
+
+    Args:
+        payload: Pre-serialized body and ETag
+        request: FastAPI request (for If-None-Match)
+
+    Returns:
+        200 with the body, or 304 with no body when the ETag matches
+    """
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache"}
+    if payload.matches(request.headers.get("If-None-Match", "")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type="application/json", headers=headers)
 
-@router.post("/audio/speech")
-async def create_speech(request: SpeechRequest, fastapi_request: Request):
-    """OpenAI-compatible endpoint for text-to-speech
 
-    Accepts OpenAI-style TTS requests and returns MP3 audio.
+def _resolve_request(
+    request: SpeechRequest, fastapi_request: Request, max_chars: int = 4096
+) -> tuple:
+    """Validate a speech request and resolve the Kokoro voice
 
     Args:
         request: SpeechRequest with text, voice, and parameters
         fastapi_request: FastAPI request object for app state access
+        max_chars: Input length limit
 
     Returns:
-        Response with audio/mpeg content
+        Tuple of (model_manager, kokoro_voice)
 
     Raises:
-        HTTPException: For validation errors or generation failures
+        HTTPException: For validation errors or if the model is not ready
     """
     # Validate model
     if request.model not in SUPPORTED_MODELS:
@@ -79,18 +151,21 @@ async def create_speech(request: SpeechRequest, fastapi_request: Request):
             status_code=400,
             detail={
                 "error": "invalid_model",
-                "message": f"Unsupported model: {request.model}. Supported: {', '.join(SUPPORTED_MODELS)}",
+                "message": (
+                    f"Unsupported model: {request.model}. "
+                    f"Supported: {', '.join(SUPPORTED_MODELS)}"
+                ),
                 "type": "invalid_request_error"
             }
         )
 
     # Validate input length
-    if len(request.input) > 4096:
+    if len(request.input) > max_chars:
         raise HTTPException(
             status_code=422,
             detail={
                 "error": "validation_error",
-                "message": f"Input text too long: {len(request.input)} chars (max 4096)",
+                "message": f"Input text too long: {len(request.input)} chars (max {max_chars})",
                 "type": "invalid_request_error"
             }
         )
@@ -106,68 +181,86 @@ async def create_speech(request: SpeechRequest, fastapi_request: Request):
             }
         )
 
-    try:
-        # Get managers from app state
-        model_manager = fastapi_request.app.state.model_manager
-        voice_manager = fastapi_request.app.state.voice_manager
-
-        # Check model is ready
-        if not model_manager.is_ready():
-            raise HTTPException(
-                status_code=503,
-                detail={
-                    "error": "service_unavailable",
-                    "message": "TTS model not ready",
-                    "type": "server_error"
-                }
-            )
+    # Stop admitting work once the pod is draining for shutdown
+    drain = getattr(fastapi_request.app.state, "drain", None)
+    if drain is not None and drain.draining:
+        drain.reject()
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": "service_draining",
+                "message": "Service is shutting down, retry on another instance",
+                "type": "server_error"
+            },
+            headers={"Retry-After": "1"},
+        )
 
-        # Map OpenAI voice to Kokoro voice
-        kokoro_voice = VOICE_MAPPING.get(request.voice, request.voice)
-
-        # Validate voice exists
-        if not voice_manager.validate_voice(kokoro_voice):
-            available_openai = list(VOICE_MAPPING.keys())
-            available_kokoro = voice_manager.get_voice_ids()
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "error": "invalid_voice",
-                    "message": f"Voice '{request.voice}' not found. "
-                               f"OpenAI voices: {', '.join(available_openai)}. "
-                               f"Kokoro voices: {', '.join(available_kokoro)}",
-                    "type": "invalid_request_error"
-                }
-            )
+    # Get managers from app state (model_manager is set once loading completes)
+    model_manager = getattr(fastapi_request.app.state, "model_manager", None)
+    voice_manager = fastapi_request.app.state.voice_manager
 
-        logger.info(
-            f"Generating speech: voice={request.voice}→{kokoro_voice}, "
-            f"speed={request.speed}, length={len(request.input)} chars"
+    # Check model is ready (or reloadable after an idle unload)
+    if model_manager is None or not model_manager.is_available():
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": "service_unavailable",
+                "message": "TTS model not ready",
+                "type": "server_error"
+            }
         )
 
-        # Generate audio
-        audio_bytes = await model_manager.generate_speech(
-            text=request.input,
-            voice=kokoro_voice,
-            speed=request.speed
+    # Map OpenAI voice to Kokoro voice (also within blends)
+    kokoro_voice = _VOICE_NAME_RE.sub(
+        lambda match: VOICE_MAPPING.get(match.group(), match.group()), request.voice
+    )
+
+    # Validate voice exists
+    if not voice_manager.validate_voice(kokoro_voice):
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "invalid_voice",
+                "message": f"Voice '{request.voice}' not found. "
+                           f"OpenAI voices: {OPENAI_VOICES_TEXT}. "
+                           f"Kokoro voices: {voice_manager.voice_ids_text}",
+                "type": "invalid_request_error"
+            }
         )
 
-        # Return audio response
-        return Response(
-            content=audio_bytes,
-            media_type="audio/mpeg",
-            headers={
-                "Content-Disposition": f"attachment; filename=speech.{request.response_format}",
-                "Cache-Control": "no-cache"
+    # Validate output format against the resolved sample rate (audio_encoding
+    # pulls in numpy; it is already loaded with the model by this point)
+    from ...utils.audio_encoding import validate_output
+
+    try:
+        validate_output(
+            request.response_format,
+            request.sample_rate or voice_manager.get_sample_rate(kokoro_voice),
+            request.channels,
+            stream=request.stream,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "invalid_output_format",
+                "message": str(e),
+                "type": "invalid_request_error"
             }
         )
 
-    except HTTPException:
-        # Re-raise HTTP exceptions
-        raise
-    except FileNotFoundError as e:
+    logger.info(
+        f"Generating speech: voice={request.voice}→{kokoro_voice}, "
+        f"speed={request.speed}, length={len(request.input)} chars"
+    )
+    return model_manager, kokoro_voice
+
+
+def _generation_error(e: Exception, kokoro_voice: str) -> HTTPException:
+    """Map a generation failure to an OpenAI-style HTTPException"""
+    if isinstance(e, FileNotFoundError):
         logger.error(f"Voice file not found: {e}")
-        raise HTTPException(
+        return HTTPException(
             status_code=500,
             detail={
                 "error": "voice_unavailable",
@@ -175,9 +268,9 @@ async def create_speech(request: SpeechRequest, fastapi_request: Request):
                 "type": "server_error"
             }
         )
-    except RuntimeError as e:
+    if isinstance(e, RuntimeError):
         logger.error(f"Speech generation failed: {e}")
-        raise HTTPException(
+        return HTTPException(
             status_code=500,
             detail={
                 "error": "generation_failed",
@@ -185,93 +278,446 @@ async def create_speech(request: SpeechRequest, fastapi_request: Request):
                 "type": "server_error"
             }
         )
-    except Exception as e:
-        logger.error(f"Unexpected error in speech generation: {e}")
+    logger.error(f"Unexpected error in speech generation: {e}")
+    return HTTPException(
+        status_code=500,
+        detail={
+            "error": "internal_error",
+            "message": "An unexpected error occurred",
+            "type": "server_error"
+        }
+    )
+
+
+def _track(fastapi_request: Request):
+    """Count a request as in flight so shutdown waits for it
+
+    Returns:
+        Async context manager
+    """
+    drain = getattr(fastapi_request.app.state, "drain", None)
+    return drain.track() if drain is not None else nullcontext()
+
+
+class _TrackedStreamingResponse(StreamingResponse):
+    """StreamingResponse counted as in flight from creation until it is done
+
+    A streamed body only starts running once the response is sent, so
+    tracking inside it would miss a stream admitted just before a drain
+    starts. The count is taken when the response is created and released
+    when sending ends, however it ends (completed, failed or disconnected).
+    The body generator is closed here too: Starlette leaves it open when
+    the client disconnects, which would keep synthesis and the encoder
+    running until the generator is garbage collected.
+    """
+
+    def __init__(self, content, drain, **kwargs):
+        super().__init__(content, **kwargs)
+        self._drain = drain
+        if drain is not None:
+            drain.begin()
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            try:
+                await self.body_iterator.aclose()
+            finally:
+                if self._drain is not None:
+                    self._drain.end()
+                    self._drain = None
+
+
+def _trace_request(request: SpeechRequest, fastapi_request: Request, kokoro_voice: str):
+    """Trace a speech request; profile it if sampled or an admin sent X-Profile
+
+    Returns:
+        Async context manager yielding the RequestTrace
+    """
+    profiler = fastapi_request.app.state.profiler
+    requested = fastapi_request.headers.get("X-Profile", "").lower() in ("1", "true", "yes")
+    return profiler.trace(
+        fastapi_request.url.path,
+        {
+            "voice": kokoro_voice,
+            "speed": request.speed,
+            "chars": len(request.input),
+            "response_format": request.response_format,
+            "sample_rate": request.sample_rate,
+            "channels": request.channels,
+        },
+        profile=profiler.should_profile(requested and is_admin_request(fastapi_request)),
+    )
+
+
+def _stream_speech(
+    request: SpeechRequest, fastapi_request: Request, model_manager, kokoro_voice: str
+) -> StreamingResponse:
+    """Stream encoded audio chunks as segments are synthesized
+
+    The request is validated before the response starts; a failure after
+    that can only end the stream early, so it is logged and the connection
+    closed.
+    """
+    from ...utils.audio_encoding import FORMATS
+
+    async def chunks():
+        async with _trace_request(request, fastapi_request, kokoro_voice) as trace:
+            trace.params["stream"] = True
+            try:
+                async for chunk in model_manager.stream_speech(
+                    text=request.input,
+                    voice=kokoro_voice,
+                    speed=request.speed,
+                    response_format=request.response_format,
+                    sample_rate=request.sample_rate,
+                    bitrate=request.bitrate,
+                    channels=request.channels,
+                ):
+                    yield chunk
+            except Exception as e:
+                logger.error(f"Streaming aborted after {trace.audio_seconds:.1f}s of audio: {e}")
+                raise
+
+    return _TrackedStreamingResponse(
+        chunks(),
+        getattr(fastapi_request.app.state, "drain", None),
+        media_type=FORMATS[request.response_format].media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename=speech.{request.response_format}",
+            "Cache-Control": "no-cache",
+        },
+    )
+
+
+@router.post("/audio/speech")
+async def create_speech(request: SpeechRequest, fastapi_request: Request):
+    """OpenAI-compatible endpoint for text-to-speech
+
+    Accepts OpenAI-style TTS requests and returns audio in the requested
+    format, sample rate and channel layout (MP3 at 24 kHz mono by default).
+    With stream=true, audio is sent as each text segment is synthesized.
+
+    Args:
+        request: SpeechRequest with text, voice, and parameters
+        fastapi_request: FastAPI request object for app state access
+
+    Returns:
+        Response with encoded audio content
+
+    Raises:
+        HTTPException: For validation errors or generation failures
+    """
+    from ...utils.audio_encoding import FORMATS
+
+    model_manager, kokoro_voice = _resolve_request(request, fastapi_request)
+    if request.stream:
+        return _stream_speech(request, fastapi_request, model_manager, kokoro_voice)
+
+    audio_cache = getattr(fastapi_request.app.state, "audio_cache", None)
+
+    async def synthesize() -> bytes:
+        return await model_manager.generate_speech(
+            text=request.input,
+            voice=kokoro_voice,
+            speed=request.speed,
+            response_format=request.response_format,
+            sample_rate=request.sample_rate,
+            bitrate=request.bitrate,
+            channels=request.channels,
+        )
+
+    async with (
+        _track(fastapi_request),
+        _trace_request(request, fastapi_request, kokoro_voice) as trace,
+    ):
+        try:
+            # Generate audio (once per identical request across pods when cached)
+            if audio_cache is not None:
+                # Equivalent blend specs share one entry
+                blend = parse_voice_blend(kokoro_voice)
+                cache_key = audio_cache.make_key(
+                    text=request.input,
+                    voice=canonical_voice_blend(blend) if blend else kokoro_voice,
+                    speed=request.speed,
+                    format=request.response_format,
+                    sample_rate=request.sample_rate,
+                    bitrate=request.bitrate,
+                    channels=request.channels,
+                )
+                audio_bytes, cache_hit = await audio_cache.get_or_create(cache_key, synthesize)
+            else:
+                audio_bytes, cache_hit = await synthesize(), False
+        except Exception as e:
+            raise _generation_error(e, kokoro_voice)
+        trace.params["cache_hit"] = cache_hit
+
+    headers = {
+        "Content-Disposition": f"attachment; filename=speech.{request.response_format}",
+        "Cache-Control": "no-cache",
+        "X-Cache": "HIT" if cache_hit else "MISS",
+    }
+    if trace.kept:
+        headers["X-Trace-Id"] = trace.id
+
+    # Return audio response
+    return Response(
+        content=audio_bytes,
+        media_type=FORMATS[request.response_format].media_type,
+        headers=headers
+    )
+
+
+@router.post("/audio/speech/timestamps")
+async def create_speech_with_timestamps(
+    request: SpeechRequest, fastapi_request: Request, response: Response
+):
+    """Text-to-speech with word and phoneme timings
+
+    Same request body as /v1/audio/speech. Timings are derived from the
+    model's predicted durations during the same inference pass, so they
+    cost no extra model time. Word timings are available for English voices.
+
+    Args:
+        request: SpeechRequest with text, voice, and parameters
+        fastapi_request: FastAPI request object for app state access
+        response: Response used to set the X-Trace-Id header
+
+    Returns:
+        Dict with base64 audio, duration and word/phoneme start/end times (seconds)
+
+    Raises:
+        HTTPException: For validation errors or generation failures
+    """
+    if request.stream:
         raise HTTPException(
-            status_code=500,
+            status_code=400,
             detail={
-                "error": "internal_error",
-                "message": "An unexpected error occurred",
-                "type": "server_error"
+                "error": "validation_error",
+                "message": "stream is not supported with timestamps",
+                "type": "invalid_request_error"
             }
         )
+    model_manager, kokoro_voice = _resolve_request(request, fastapi_request)
+
+    async with (
+        _track(fastapi_request),
+        _trace_request(request, fastapi_request, kokoro_voice) as trace,
+    ):
+        try:
+            audio_bytes, timestamps = await model_manager.generate_speech_with_timestamps(
+                text=request.input,
+                voice=kokoro_voice,
+                speed=request.speed,
+                response_format=request.response_format,
+                sample_rate=request.sample_rate,
+                bitrate=request.bitrate,
+                channels=request.channels,
+            )
+        except Exception as e:
+            raise _generation_error(e, kokoro_voice)
 
+    if trace.kept:
+        response.headers["X-Trace-Id"] = trace.id
 
-@router.get("/models")
-async def list_models():
-    """List available TTS models
+    return {
+        "audio": base64.b64encode(audio_bytes).decode("ascii"),
+        "format": request.response_format,
+        "duration": timestamps["duration"],
+        "words": timestamps["words"],
+        "phonemes": timestamps["phonemes"],
+    }
 
-    Returns OpenAI-compatible model list.
 
-    Returns:
-        Dict with model list
+def _job_manager(fastapi_request: Request):
+    """Job manager from app state (created once the model has loaded)
+
+    Raises:
+        HTTPException: 404 if jobs are disabled, 503 if the model is still loading
     """
-    return {
-        "object": "list",
-        "data": [
-            {
-                "id": "tts-1",
-                "object": "model",
-                "created": 1699046400,
-                "owned_by": "pattern-tts"
-            },
-            {
-                "id": "tts-1-hd",
-                "object": "model",
-                "created": 1699046400,
-                "owned_by": "pattern-tts"
-            },
-            {
-                "id": "kokoro",
-                "object": "model",
-                "created": 1699046400,
-                "owned_by": "pattern-tts"
+    if not settings.jobs_enabled:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "jobs_disabled",
+                "message": "Speech jobs are not enabled on this deployment",
+                "type": "invalid_request_error"
             }
-        ]
-    }
+        )
+    job_manager = getattr(fastapi_request.app.state, "job_manager", None)
+    if job_manager is None:
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": "service_unavailable",
+                "message": "TTS model not ready",
+                "type": "server_error"
+            }
+        )
+    return job_manager
 
 
-@router.get("/audio/voices")
-async def list_voices(request: Request):
-    """List available voices with metadata
+def _get_job(job_manager, job_id: str) -> dict:
+    """Job record by ID
+
+    Raises:
+        HTTPException: 404 if the job does not exist (or expired)
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "error": "job_not_found",
+                "message": f"Speech job '{job_id}' not found",
+                "type": "invalid_request_error"
+            }
+        )
+    return job
+
 
-    Returns both OpenAI-compatible and native Kokoro voices.
+@router.post("/audio/speech/jobs", status_code=202)
+async def create_speech_job(request: SpeechJobRequest, fastapi_request: Request):
+    """Queue text-to-speech for a long document
+
+    Same parameters as /v1/audio/speech, with input up to jobs_max_chars.
+    The document is synthesized in the background, segment by segment,
+    and encoded into one file; poll the job and download result_url once
+    its status is "completed". Jobs survive restarts and resume from the
+    last synthesized segment.
 
     Args:
-        request: FastAPI request for app state access
+        request: SpeechJobRequest with text, voice, and parameters
+        fastapi_request: FastAPI request object for app state access
 
     Returns:
-        Dict with voice list
+        The queued job
+
+    Raises:
+        HTTPException: For validation errors or if the model is not ready
     """
-    try:
-        voice_manager = request.app.state.voice_manager
-
-        # Get all voices with metadata
-        all_voices = voice_manager.list_voices()
-
-        # Add OpenAI voice mappings
-        openai_voices = [
-            {
-                "id": openai_id,
-                "name": f"{openai_id.capitalize()} (OpenAI)",
-                "kokoro_voice": kokoro_id,
-                "metadata": voice_manager.get_voice_info(kokoro_id)
+    if request.stream:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": "validation_error",
+                "message": "stream is not supported for speech jobs",
+                "type": "invalid_request_error"
             }
-            for openai_id, kokoro_id in VOICE_MAPPING.items()
-        ]
+        )
+    _, kokoro_voice = _resolve_request(request, fastapi_request, settings.jobs_max_chars)
+    job_manager = _job_manager(fastapi_request)
+
+    job = await job_manager.submit(
+        text=request.input,
+        voice=kokoro_voice,
+        speed=request.speed,
+        response_format=request.response_format,
+        sample_rate=request.sample_rate,
+        bitrate=request.bitrate,
+        channels=request.channels,
+    )
+    return job_manager.public(job)
 
-        return {
-            "openai_compatible": openai_voices,
-            "kokoro_native": all_voices
-        }
 
-    except Exception as e:
-        logger.error(f"Error listing voices: {e}")
+@router.get("/audio/speech/jobs/{job_id}")
+async def get_speech_job(job_id: str, fastapi_request: Request):
+    """Status and progress of a speech job
+
+    Args:
+        job_id: Job ID returned on creation
+        fastapi_request: FastAPI request object for app state access
+
+    Returns:
+        The job, with segments_completed/segments_total progress and
+        result_url once completed
+    """
+    job_manager = _job_manager(fastapi_request)
+    return job_manager.public(_get_job(job_manager, job_id))
+
+
+@router.get("/audio/speech/jobs/{job_id}/content")
+async def get_speech_job_content(job_id: str, fastapi_request: Request):
+    """Download the audio of a completed speech job
+
+    Supports Range requests, so large results can be fetched in parts and
+    interrupted downloads resumed.
+
+    Args:
+        job_id: Job ID returned on creation
+        fastapi_request: FastAPI request object for app state access
+
+    Returns:
+        The encoded audio file
+
+    Raises:
+        HTTPException: 404 if unknown, 409 if the job has not completed
+    """
+    from ...utils.audio_encoding import FORMATS
+
+    job_manager = _job_manager(fastapi_request)
+    job = _get_job(job_manager, job_id)
+    if job["status"] != "completed":
         raise HTTPException(
-            status_code=500,
+            status_code=409,
             detail={
-                "error": "internal_error",
-                "message": "Failed to retrieve voice list",
-                "type": "server_error"
+                "error": "job_not_completed",
+                "message": f"Speech job '{job_id}' is {job['status']}",
+                "type": "invalid_request_error"
             }
         )
+    return FileResponse(
+        job_manager.result_path(job),
+        media_type=FORMATS[job["response_format"]].media_type,
+        filename=f"speech.{job['response_format']}",
+    )
+
+
+@router.delete("/audio/speech/jobs/{job_id}")
+async def delete_speech_job(job_id: str, fastapi_request: Request):
+    """Cancel a speech job and delete its files
+
+    Args:
+        job_id: Job ID returned on creation
+        fastapi_request: FastAPI request object for app state access
+
+    Returns:
+        Deletion confirmation
+    """
+    job_manager = _job_manager(fastapi_request)
+    _get_job(job_manager, job_id)
+    job_manager.delete(job_id)
+    return {"id": job_id, "object": "audio.speech.job.deleted", "deleted": True}
+
+
+@router.get("/models")
+async def list_models(request: Request):
+    """List available TTS models
+
+    Returns OpenAI-compatible model list (pre-serialized, with ETag).
+
+    Args:
+        request: FastAPI request (for If-None-Match)
+
+    Returns:
+        JSON model list, or 304 if unchanged
+    """
+    return _precomputed_response(MODELS_JSON, request)
+
+
+@router.get("/audio/voices")
+async def list_voices(request: Request):
+    """List available voices with metadata
+
+    Returns both OpenAI-compatible and native Kokoro voices. The body is
+    serialized once per voice registry change and served with an ETag,
+    so pollers sending If-None-Match get an empty 304.
+
+    Args:
+        request: FastAPI request for app state access
+
+    Returns:
+        JSON voice list, or 304 if unchanged
+    """
+    return _precomputed_response(request.app.state.voice_manager.voices_json, request)
@@ -1,7 +1,6 @@
 from pathlib import Path
 from typing import List, Optional
 
-import torch
 from pydantic_settings import SettingsConfigDict
 from pattern_agentic_settings import PABaseSettings
 
@@ -22,6 +21,75 @@ class Settings(PABaseSettings):
     default_voice: str
     sample_rate: int
 
+    # Voice registry: optional sidecar metadata file inside voices_dir and
+    # rescan interval for hot-loading new voice packs (0 disables); blend
+    # style tables kept resident (LRU, independent of the memory budget)
+    voice_metadata_file: str = "voice_metadata.json"
+    voice_reload_interval_s: float = 30.0
+    voice_blend_cache_size: int = 32
+
+    # Resource management: RSS/VRAM budgets in MB (0 = unlimited), idle
+    # model unload timeout in seconds (0 = never) and check interval
+    memory_budget_mb: int = 0
+    vram_budget_mb: int = 0
+    model_idle_unload_s: float = 0.0
+    resource_check_interval_s: float = 15.0
+
+    # Synthesized-audio cache: backend is none, memory, file or redis.
+    # Locks make one pod synthesize a given request while others wait.
+    audio_cache_backend: str = "memory"
+    audio_cache_max_mb: int = 64
+    audio_cache_ttl_s: float = 3600.0
+    audio_cache_dir: str = "/tmp/tts/cache"
+    audio_cache_redis_url: str = "redis://localhost:6379/0"
+    audio_cache_lock_ttl_s: float = 60.0
+    audio_cache_wait_timeout_s: float = 30.0
+
+    # Profiling: X-Admin-Token value for /admin endpoints and the X-Profile
+    # header (admin API disabled when empty), fraction of requests profiled
+    # with profiler_backend (cprofile or torch), latency above which a
+    # request's span trace is kept (0 disables), and traces kept
+    admin_token: str = ""
+    profile_sample_rate: float = 0.0
+    profiler_backend: str = "cprofile"
+    slow_request_ms: float = 5000.0
+    trace_buffer_size: int = 50
+
+    # CPU threading: concurrent inference workers (each runs one request),
+    # torch intra-/inter-op threads (0 = derive from the cgroup CPU quota and
+    # worker count) and pinning each worker to its own CPUs (needs an
+    # exclusive cpuset, e.g. Guaranteed QoS with the static CPU manager)
+    max_concurrent_requests: int = 1
+    torch_num_threads: int = 0
+    torch_interop_threads: int = 0
+    cpu_pinning: bool = False
+
+    # Streamed responses: word limit for the short first segment (0 = no
+    # short first segment) and growth factor of later segments toward
+    # target_max_tokens
+    stream_first_chunk_words: int = 8
+    stream_chunk_growth: float = 2.0
+
+    # Shutdown: on SIGTERM, fail readiness, stop admitting requests and give
+    # in-flight ones this long to finish (keep below the pod's
+    # terminationGracePeriodSeconds)
+    drain_grace_period_s: float = 25.0
+
+    # Speech jobs (/v1/audio/speech/jobs) for documents beyond the 4096
+    # character request limit. Job state, segment checkpoints and results
+    # live under jobs_dir; share it between replicas (ReadWriteMany volume)
+    # so any pod can serve and resume any job. A running job whose lease is
+    # not renewed for jobs_lease_s is taken over; finished jobs are deleted
+    # after jobs_ttl_s. Disable with more than one replica unless jobs_dir
+    # is shared
+    jobs_enabled: bool = True
+    jobs_dir: str = "/tmp/tts/jobs"
+    jobs_max_chars: int = 500_000
+    job_segment_chars: int = 1000
+    jobs_lease_s: float = 120.0
+    jobs_ttl_s: float = 86400.0
+    jobs_poll_interval_s: float = 10.0
+
     target_min_tokens: int
     target_max_tokens: int
     absolute_max_tokens: int
@@ -44,6 +112,8 @@ class Settings(PABaseSettings):
         if self.device_type:
             return self.device_type
 
+        import torch
+
         if torch.backends.mps.is_available():
             return "mps"
         elif torch.cuda.is_available():
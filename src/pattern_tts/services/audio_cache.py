@@ -0,0 +1,481 @@
+"""Synthesized-audio cache with pluggable backends for Pattern TTS Service"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import partial
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from loguru import logger
+
+from ..core.config import settings
+
+
+class CacheBackend(ABC):
+    """Storage interface for cached audio and single-flight locks
+
+    Locks are advisory leases: ``acquire_lock`` succeeds for one holder until
+    ``release_lock`` is called with the same token or the TTL expires.
+    """
+
+    name: str = "base"
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the cached value, or None if missing or expired"""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_s: float) -> None:
+        """Store a value for ttl_s seconds"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove a value if present"""
+
+    @abstractmethod
+    async def acquire_lock(self, key: str, token: str, ttl_s: float) -> bool:
+        """Try to take the lock for key; True if this token now holds it"""
+
+    @abstractmethod
+    async def release_lock(self, key: str, token: str) -> None:
+        """Release the lock for key if this token still holds it"""
+
+    async def close(self) -> None:
+        """Release backend resources"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache bounded by total value size"""
+
+    name = "memory"
+
+    def __init__(self, max_bytes: int):
+        """Initialize memory backend
+
+        Args:
+            max_bytes: Total size of cached values before LRU eviction
+        """
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._locks: Dict[str, Tuple[str, float]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires < time.monotonic():
+            await self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl_s: float) -> None:
+        if len(value) > self.max_bytes:
+            return
+        await self.delete(key)
+        self._entries[key] = (value, time.monotonic() + ttl_s)
+        self.size_bytes += len(value)
+        while self.size_bytes > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+
+    async def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= len(entry[0])
+
+    async def acquire_lock(self, key: str, token: str, ttl_s: float) -> bool:
+        now = time.monotonic()
+        holder = self._locks.get(key)
+        if holder is not None and holder[1] > now:
+            return False
+        self._locks[key] = (token, now + ttl_s)
+        return True
+
+    async def release_lock(self, key: str, token: str) -> None:
+        holder = self._locks.get(key)
+        if holder is not None and holder[0] == token:
+            del self._locks[key]
+
+
+class FileCacheBackend(CacheBackend):
+    """Directory-backed cache, shareable by processes mounting the same volume
+
+    Values are written atomically (temp file + rename) with their mtime set
+    to the expiry time.
+    Locks are exclusive-create lock files holding the owner token.
+    """
+
+    name = "file"
+
+    # Prune the directory to max_bytes every this many writes
+    PRUNE_EVERY = 64
+
+    def __init__(self, directory: str, max_bytes: int):
+        """Initialize file backend
+
+        Args:
+            directory: Cache directory (created if missing)
+            max_bytes: Total size of cached files before oldest-first pruning
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._writes = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.bin"
+
+    def _lock_path(self, key: str) -> Path:
+        return self.directory / "locks" / f"{key}.lock"
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            if path.stat().st_mtime < time.time():
+                path.unlink(missing_ok=True)
+                return None
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, key: str, value: bytes, ttl_s: float) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(value)
+        expires = time.time() + ttl_s
+        os.utime(tmp, (expires, expires))
+        os.replace(tmp, path)
+
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self._prune()
+
+    def _prune(self) -> None:
+        files = []
+        for path in self.directory.glob("*/*.bin"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def _try_lock(self, key: str, token: str, ttl_s: float) -> bool:
+        path = self._lock_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if path.stat().st_mtime + ttl_s < time.time():
+                # Stale lease from a crashed holder
+                path.unlink(missing_ok=True)
+        except FileNotFoundError:
+            pass
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w") as f:
+            f.write(token)
+        return True
+
+    def _unlock(self, key: str, token: str) -> None:
+        path = self._lock_path(key)
+        try:
+            if path.read_text() == token:
+                path.unlink(missing_ok=True)
+        except FileNotFoundError:
+            pass
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, value: bytes, ttl_s: float) -> None:
+        await asyncio.to_thread(self._write, key, value, ttl_s)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._path(key).unlink, True)
+
+    async def acquire_lock(self, key: str, token: str, ttl_s: float) -> bool:
+        return await asyncio.to_thread(self._try_lock, key, token, ttl_s)
+
+    async def release_lock(self, key: str, token: str) -> None:
+        await asyncio.to_thread(self._unlock, key, token)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache on a Redis-compatible server, shared by all pods
+
+    Speaks the RESP protocol directly over one connection (commands are
+    serialized), so any server implementing GET/SET/DEL/EVAL works.
+    """
+
+    name = "redis"
+
+    # Compare-and-delete so a holder never releases someone else's lease
+    RELEASE_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('del', KEYS[1]) else return 0 end"
+    )
+
+    def __init__(self, url: str, key_prefix: str = "pattern-tts:audio:"):
+        """Initialize Redis backend
+
+        Args:
+            url: redis://[:password@]host[:port][/db]
+            key_prefix: Namespace for all keys
+        """
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.key_prefix = key_prefix
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._conn_lock = asyncio.Lock()
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            await self._send("AUTH", self.password)
+        if self.db:
+            await self._send("SELECT", self.db)
+
+    @staticmethod
+    def _encode(args: tuple) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            raise RuntimeError(f"Redis error: {payload.decode()}")
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            return (await self._reader.readexactly(length + 2))[:-2]
+        if prefix == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        raise RuntimeError(f"Unexpected Redis reply: {line!r}")
+
+    async def _send(self, *args) -> Any:
+        self._writer.write(self._encode(args))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def _command(self, *args) -> Any:
+        async with self._conn_lock:
+            try:
+                if self._writer is None:
+                    await self._connect()
+                return await self._send(*args)
+            except BaseException:
+                # Anything between sending and a fully read reply (network
+                # errors, a malformed reply, or cancellation when a client
+                # disconnects or a wait times out) can leave an unread reply
+                # behind, which the next command would take as its own. Drop
+                # the connection; the next command reconnects.
+                self._drop()
+                raise
+
+    def _drop(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._command("GET", self.key_prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl_s: float) -> None:
+        await self._command("SET", self.key_prefix + key, value, "PX", int(ttl_s * 1000))
+
+    async def delete(self, key: str) -> None:
+        await self._command("DEL", self.key_prefix + key)
+
+    async def acquire_lock(self, key: str, token: str, ttl_s: float) -> bool:
+        reply = await self._command(
+            "SET", f"{self.key_prefix}{key}:lock", token, "NX", "PX", int(ttl_s * 1000)
+        )
+        return reply == "OK"
+
+    async def release_lock(self, key: str, token: str) -> None:
+        await self._command("EVAL", self.RELEASE_SCRIPT, 1, f"{self.key_prefix}{key}:lock", token)
+
+    async def close(self) -> None:
+        self._drop()
+
+
+class AudioCache:
+    """Single-flight cache for synthesized audio
+
+    Identical concurrent requests in this process share one in-flight
+    synthesis, run as its own task so that it outlives the request that
+    started it if that request is cancelled (client disconnect, timeout)
+    while others wait for it. Across processes, the backend lock makes one holder
+    synthesize while the others poll the backend for its result (or take
+    over if the holder's lease expires). Backend errors never fail a
+    request; they fall back to synthesizing locally.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        """Initialize audio cache
+
+        Args:
+            backend: Storage and lock backend
+        """
+        self.backend = backend
+        self.ttl_s = settings.audio_cache_ttl_s
+        self.lock_ttl_s = settings.audio_cache_lock_ttl_s
+        self.wait_timeout_s = settings.audio_cache_wait_timeout_s
+        self.poll_interval_s = 0.05
+
+        self._inflight: Dict[str, "asyncio.Task[Tuple[bytes, bool]]"] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "remote_waits": 0, "errors": 0}
+
+    @staticmethod
+    def make_key(**params: Any) -> str:
+        """Build a cache key from everything that affects the output audio
+
+        Args:
+            **params: Request parameters (text, voice, speed, format, ...)
+
+        Returns:
+            Hex digest identifying the output
+        """
+        params["_version"] = settings.app_version
+        blob = json.dumps(params, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    async def _backend_call(self, method: str, *args) -> Any:
+        try:
+            return await getattr(self.backend, method)(*args)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Audio cache {self.backend.name} {method} failed: {e}")
+            return None
+
+    async def get_or_create(
+        self, key: str, producer: Callable[[], Awaitable[bytes]]
+    ) -> Tuple[bytes, bool]:
+        """Return cached audio for key, or produce it exactly once
+
+        Args:
+            key: Cache key from make_key()
+            producer: Coroutine factory that synthesizes the audio
+
+        Returns:
+            Tuple of (audio bytes, True if served from cache)
+        """
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            value, _ = await asyncio.shield(inflight)
+            return value, True
+
+        task = asyncio.ensure_future(self._get_or_create(key, producer))
+        self._inflight[key] = task
+        task.add_done_callback(partial(self._finish_inflight, key))
+        return await asyncio.shield(task)
+
+    def _finish_inflight(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark retrieved so a failure nobody awaited does not log a warning
+            task.exception()
+
+    async def _get_or_create(
+        self, key: str, producer: Callable[[], Awaitable[bytes]]
+    ) -> Tuple[bytes, bool]:
+        value = await self._backend_call("get", key)
+        if value is not None:
+            self.stats["hits"] += 1
+            return value, True
+
+        token = uuid.uuid4().hex
+        locked = await self._backend_call("acquire_lock", key, token, self.lock_ttl_s)
+        if not locked:
+            # Another process is synthesizing this key: wait for its result
+            self.stats["remote_waits"] += 1
+            deadline = time.monotonic() + self.wait_timeout_s
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.poll_interval_s)
+                value = await self._backend_call("get", key)
+                if value is not None:
+                    self.stats["hits"] += 1
+                    return value, True
+                locked = await self._backend_call("acquire_lock", key, token, self.lock_ttl_s)
+                if locked:
+                    break
+            else:
+                logger.warning(f"Timed out waiting for shared synthesis of {key[:12]}")
+
+        self.stats["misses"] += 1
+        try:
+            value = await producer()
+            await self._backend_call("set", key, value, self.ttl_s)
+            return value, False
+        finally:
+            if locked:
+                await self._backend_call("release_lock", key, token)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+
+def create_audio_cache() -> Optional[AudioCache]:
+    """Create the audio cache configured by settings.audio_cache_backend
+
+    Returns:
+        AudioCache, or None if caching is disabled
+
+    Raises:
+        ValueError: If the configured backend is unknown
+    """
+    kind = settings.audio_cache_backend.lower()
+    max_bytes = settings.audio_cache_max_mb * 1024 * 1024
+    if kind == "none":
+        return None
+    if kind == "memory":
+        backend = MemoryCacheBackend(max_bytes)
+    elif kind == "file":
+        backend = FileCacheBackend(settings.audio_cache_dir, max_bytes)
+    elif kind == "redis":
+        backend = RedisCacheBackend(settings.audio_cache_redis_url)
+    else:
+        raise ValueError(
+            f"Unknown audio cache backend: {settings.audio_cache_backend} "
+            f"(expected none, memory, file or redis)"
+        )
+    logger.info(f"Audio cache enabled ({backend.name} backend)")
+    return AudioCache(backend)
@@ -0,0 +1,120 @@
+"""Graceful drain of in-flight work for rolling deploys and scale-downs"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from loguru import logger
+
+from ..core.config import settings
+
+
+class DrainController:
+    """Tracks in-flight speech requests and drains them before shutdown
+
+    Once draining starts, readiness fails and new speech requests are
+    rejected (503), so the load balancer moves traffic to other pods.
+    Requests already admitted, whether queued for an inference worker or
+    running, get up to the grace period to finish. Whatever is still
+    running then is counted as aborted.
+    """
+
+    def __init__(self, grace_period_s: Optional[float] = None):
+        """Initialize drain controller
+
+        Args:
+            grace_period_s: Longest wait for in-flight work
+                (defaults to settings.drain_grace_period_s)
+        """
+        self.grace_period_s = (
+            grace_period_s if grace_period_s is not None else settings.drain_grace_period_s
+        )
+        self.draining = False
+        self.in_flight = 0
+
+        # Drain metrics
+        self.in_flight_at_drain = 0
+        self.completed = 0
+        self.rejected = 0
+        self.aborted = 0
+        self.drain_seconds: Optional[float] = None
+
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._drain_task: Optional[asyncio.Task] = None
+
+    def begin(self) -> None:
+        """Count a request as in flight until the matching end()"""
+        self.in_flight += 1
+        self._idle.clear()
+
+    def end(self) -> None:
+        """Finish a request counted by begin()"""
+        self.in_flight -= 1
+        # Requests outliving the grace period are already counted as aborted
+        if self.draining and self.drain_seconds is None:
+            self.completed += 1
+        if self.in_flight == 0:
+            self._idle.set()
+
+    @asynccontextmanager
+    async def track(self) -> AsyncIterator[None]:
+        """Count a request as in flight for the duration of the block"""
+        self.begin()
+        try:
+            yield
+        finally:
+            self.end()
+
+    def reject(self) -> None:
+        """Record a request refused because the service is draining"""
+        self.rejected += 1
+
+    async def drain(self) -> None:
+        """Stop admitting work and wait for in-flight requests (idempotent)
+
+        Concurrent and repeated calls wait for the same drain.
+        """
+        if self._drain_task is None:
+            self._drain_task = asyncio.ensure_future(self._drain())
+        await asyncio.shield(self._drain_task)
+
+    async def _drain(self) -> None:
+        self.draining = True
+        self.in_flight_at_drain = self.in_flight
+        start = time.perf_counter()
+        logger.info(
+            f"Draining: {self.in_flight} requests in flight, "
+            f"grace period {self.grace_period_s:.0f}s"
+        )
+
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=self.grace_period_s)
+        except asyncio.TimeoutError:
+            # Still running: cut off at shutdown, so aborted (and never
+            # counted as completed by end(), even if they finish meanwhile)
+            self.aborted = self.in_flight
+
+        self.drain_seconds = round(time.perf_counter() - start, 3)
+        message = (
+            f"Drain finished in {self.drain_seconds:.1f}s: {self.completed} completed, "
+            f"{self.aborted} aborted, {self.rejected} rejected"
+        )
+        if self.aborted:
+            logger.warning(message)
+        else:
+            logger.info(message)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Drain state and metrics"""
+        return {
+            "draining": self.draining,
+            "in_flight": self.in_flight,
+            "grace_period_s": self.grace_period_s,
+            "in_flight_at_drain": self.in_flight_at_drain,
+            "completed": self.completed,
+            "aborted": self.aborted,
+            "rejected": self.rejected,
+            "drain_seconds": self.drain_seconds,
+        }
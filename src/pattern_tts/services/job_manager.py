@@ -0,0 +1,476 @@
+"""Asynchronous speech jobs for documents beyond the per-request input limit
+
+Each job is a directory under settings.jobs_dir:
+
+    job.json          request parameters and status (written atomically)
+    segments.json     text segments planned at submission
+    segments/N.npy    synthesized audio per segment (the checkpoint)
+    lease             owner of the pod running the job (mtime = heartbeat)
+    speech.<format>   the encoded result
+
+Segments are synthesized concurrently on the inference workers and saved
+as they finish. A pod that restarts, or any pod mounting the same volume,
+picks up queued jobs and running jobs whose lease went stale, and only
+synthesizes the segments that are not checkpointed yet. The result is
+encoded once from all segments, so it is one continuous file.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import socket
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from ..core.config import settings
+from ..utils.audio_encoding import encode_file
+from ..utils.text_chunking import plan_segments
+from .model_manager import KOKORO_SAMPLE_RATE, ModelManager
+
+# Jobs the runner picks up; "running" only once its lease has gone stale
+RUNNABLE_STATUSES = ("queued", "running")
+
+# Run expired-job cleanup at most this often (seconds)
+CLEANUP_INTERVAL_S = 60.0
+
+
+class JobCancelled(Exception):
+    """The job was deleted while it was running"""
+
+
+def _first_error(error: BaseException) -> BaseException:
+    """The first leaf exception of a (possibly nested) ExceptionGroup"""
+    while isinstance(error, BaseExceptionGroup):
+        error = error.exceptions[0]
+    return error
+
+
+class JobManager:
+    """Stores speech jobs on disk and runs them one at a time
+
+    Within a job, up to one segment per inference worker is synthesized at
+    a time, so interactive requests still interleave with job segments on
+    the worker queue.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """Initialize job manager
+
+        Args:
+            directory: Job storage directory (defaults to settings.jobs_dir)
+        """
+        self.directory = Path(directory or settings.jobs_dir)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Lease owner token: unique per process, readable in job.json
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.current_job: Optional[str] = None
+
+        self._wakeup = asyncio.Event()
+        self._cancelled: set[str] = set()
+        self._last_cleanup = 0.0
+
+    # Storage
+
+    def _job_dir(self, job_id: str) -> Path:
+        return self.directory / job_id
+
+    def _segment_path(self, job_id: str, index: int) -> Path:
+        return self._job_dir(job_id) / "segments" / f"{index:06d}.npy"
+
+    def result_path(self, job: Dict[str, Any]) -> Path:
+        """Encoded result file of a job"""
+        return self._job_dir(job["id"]) / f"speech.{job['response_format']}"
+
+    def _read_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads((self._job_dir(job_id) / "job.json").read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _write_job(self, job: Dict[str, Any]) -> None:
+        path = self._job_dir(job["id"]) / "job.json"
+        if not path.parent.is_dir():
+            raise JobCancelled(job["id"])
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        tmp.write_text(json.dumps(job))
+        os.replace(tmp, path)
+
+    def _save_segment(self, job_id: str, index: int, audio: np.ndarray) -> None:
+        path = self._segment_path(job_id, index)
+        if not path.parent.is_dir():
+            raise JobCancelled(job_id)
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, audio.astype(np.float32, copy=False))
+        os.replace(tmp, path)
+
+    def _iter_segments(self, job_id: str, count: int) -> Iterator[np.ndarray]:
+        for index in range(count):
+            yield np.load(self._segment_path(job_id, index))
+
+    # Leases
+
+    def _lease_path(self, job_id: str) -> Path:
+        return self._job_dir(job_id) / "lease"
+
+    @staticmethod
+    def _is_stale(path: Path) -> bool:
+        return path.stat().st_mtime + settings.jobs_lease_s < time.time()
+
+    def _try_lease(self, job_id: str) -> bool:
+        path = self._lease_path(job_id)
+        try:
+            # Stale lease from a pod that died mid-job
+            if self._is_stale(path) and not self._break_stale_lease(path):
+                return False
+        except FileNotFoundError:
+            pass
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except (FileExistsError, FileNotFoundError):
+            return False
+        with os.fdopen(fd, "w") as f:
+            f.write(self.owner)
+        return True
+
+    def _break_stale_lease(self, path: Path) -> bool:
+        """Remove a stale lease so it can be taken over
+
+        The lease is moved to a unique name first. A rename moves exactly one
+        file, so when several pods break the same lease only one gets it. A
+        pod that lost the race may have moved a lease that was renewed or
+        taken over in the meantime; it puts that lease back.
+
+        Returns:
+            True if the stale lease was removed by this call
+        """
+        claimed = path.with_name(f"lease.{uuid.uuid4().hex}.stale")
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            return False
+        try:
+            if self._is_stale(claimed):
+                return True
+            # Live lease: restore it unless a new one was created meanwhile
+            # (its owner then sees the loss on its next heartbeat)
+            try:
+                os.link(claimed, path)
+            except FileExistsError:
+                pass
+            return False
+        finally:
+            claimed.unlink(missing_ok=True)
+
+    def _heartbeat(self, job_id: str) -> bool:
+        """Renew this pod's lease on a job
+
+        Returns:
+            False if the lease is gone or now held by another pod
+        """
+        path = self._lease_path(job_id)
+        try:
+            if path.read_text() != self.owner:
+                return False
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    async def _keep_lease(self, job_id: str) -> None:
+        """Renew the lease every quarter lease period; return once it is lost"""
+        while True:
+            await asyncio.sleep(settings.jobs_lease_s / 4)
+            if not await asyncio.to_thread(self._heartbeat, job_id):
+                return
+
+    def _release(self, job_id: str) -> None:
+        path = self._lease_path(job_id)
+        try:
+            if path.read_text() == self.owner:
+                path.unlink(missing_ok=True)
+        except FileNotFoundError:
+            pass
+
+    # Public API
+
+    async def submit(
+        self,
+        text: str,
+        voice: str,
+        speed: float = 1.0,
+        response_format: str = "mp3",
+        sample_rate: Optional[int] = None,
+        bitrate: Optional[int] = None,
+        channels: int = 1,
+    ) -> Dict[str, Any]:
+        """Store a new job and wake the runner
+
+        Segment planning and the job files (up to jobs_max_chars of text)
+        are written off the event loop.
+
+        Args:
+            text: Document to synthesize (up to settings.jobs_max_chars)
+            voice: Kokoro voice ID
+            speed: Speech rate multiplier
+            response_format, sample_rate, bitrate, channels: Output parameters
+
+        Returns:
+            The job record
+        """
+        job = await asyncio.to_thread(
+            self._create, text, voice, speed, response_format, sample_rate, bitrate, channels
+        )
+        self._wakeup.set()
+        return job
+
+    def _create(
+        self,
+        text: str,
+        voice: str,
+        speed: float,
+        response_format: str,
+        sample_rate: Optional[int],
+        bitrate: Optional[int],
+        channels: int,
+    ) -> Dict[str, Any]:
+        job_id = f"speechjob_{uuid.uuid4().hex}"
+        segments = plan_segments(text, 0, settings.job_segment_chars, 1.0)
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "created_at": int(time.time()),
+            "started_at": None,
+            "completed_at": None,
+            "voice": voice,
+            "speed": speed,
+            "response_format": response_format,
+            "sample_rate": sample_rate,
+            "bitrate": bitrate,
+            "channels": channels,
+            "input_chars": len(text),
+            "segments_total": len(segments),
+            "segments_completed": 0,
+            "audio_seconds": None,
+            "bytes": None,
+            "error": None,
+            "owner": None,
+        }
+
+        job_dir = self._job_dir(job_id)
+        (job_dir / "segments").mkdir(parents=True)
+        (job_dir / "segments.json").write_text(json.dumps(segments))
+        self._write_job(job)
+        logger.info(f"Queued speech job {job_id}: {len(text)} chars, {len(segments)} segments")
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job record by ID, or None if unknown or deleted"""
+        if "/" in job_id or job_id.startswith("."):
+            return None
+        return self._read_job(job_id)
+
+    def delete(self, job_id: str) -> bool:
+        """Delete a job and its files; a running job stops after its current segments
+
+        Returns:
+            True if the job existed
+        """
+        if self.get(job_id) is None:
+            return False
+        self._cancelled.add(job_id)
+        shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+        logger.info(f"Deleted speech job {job_id}")
+        return True
+
+    @staticmethod
+    def public(job: Dict[str, Any]) -> Dict[str, Any]:
+        """Job record as returned by the API"""
+        view = {"object": "audio.speech.job", **job}
+        view.pop("owner", None)
+        if job["status"] == "completed":
+            view["result_url"] = f"/v1/audio/speech/jobs/{job['id']}/content"
+        return view
+
+    # Runner
+
+    async def run(self, model_manager: ModelManager) -> None:
+        """Run queued and orphaned jobs until cancelled (background task)"""
+        logger.info(f"Speech job runner started ({self.directory})")
+        while True:
+            if time.monotonic() - self._last_cleanup > CLEANUP_INTERVAL_S:
+                self._last_cleanup = time.monotonic()
+                await asyncio.to_thread(self._cleanup_expired)
+
+            try:
+                job = await asyncio.to_thread(self._claim_next)
+                if job is not None:
+                    await self._run_job(job, model_manager)
+                    continue
+            except Exception as e:
+                # Keep the runner alive; a job that failed this way stays
+                # claimable and is retried once its lease expires
+                logger.exception(f"Speech job runner error: {e}")
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.jobs_poll_interval_s)
+            except asyncio.TimeoutError:
+                pass
+
+    def _claim_next(self) -> Optional[Dict[str, Any]]:
+        """Lease the oldest runnable job, if any"""
+        candidates = []
+        for job_dir in self.directory.iterdir():
+            job = self._read_job(job_dir.name) if job_dir.is_dir() else None
+            if job and job["status"] in RUNNABLE_STATUSES:
+                candidates.append(job)
+        for job in sorted(candidates, key=lambda j: j["created_at"]):
+            if self._try_lease(job["id"]):
+                # Re-read: another pod may have finished it since the scan
+                job = self._read_job(job["id"])
+                if job and job["status"] in RUNNABLE_STATUSES:
+                    return job
+                self._release(job["id"] if job else "")
+        return None
+
+    def _cleanup_expired(self) -> None:
+        """Delete finished jobs older than settings.jobs_ttl_s"""
+        cutoff = time.time() - settings.jobs_ttl_s
+        for job_dir in self.directory.iterdir():
+            job = self._read_job(job_dir.name) if job_dir.is_dir() else None
+            if job and job["completed_at"] and job["completed_at"] < cutoff:
+                shutil.rmtree(job_dir, ignore_errors=True)
+                logger.debug(f"Expired speech job {job['id']}")
+
+    def _deleted(self, job_id: str) -> bool:
+        return job_id in self._cancelled or not self._job_dir(job_id).exists()
+
+    async def _run_job(self, job: Dict[str, Any], model_manager: ModelManager) -> None:
+        """Run a leased job while renewing its lease; stop it if the lease is lost"""
+        job_id = job["id"]
+        self.current_job = job_id
+        work = asyncio.create_task(self._process(job, model_manager))
+        heartbeat = asyncio.create_task(self._keep_lease(job_id))
+        try:
+            await asyncio.wait({work, heartbeat}, return_when=asyncio.FIRST_COMPLETED)
+            if work.done():
+                # Unexpected errors go to the runner's handler
+                work.result()
+            elif self._deleted(job_id):
+                logger.info(f"Speech job {job_id} deleted while running")
+            else:
+                logger.warning(f"Lost the lease on speech job {job_id}; stopping it here")
+        finally:
+            heartbeat.cancel()
+            work.cancel()
+            # Also on shutdown: let the job log its state before the lease goes
+            await asyncio.gather(work, heartbeat, return_exceptions=True)
+            self._release(job_id)
+            self._cancelled.discard(job_id)
+            self.current_job = None
+
+    async def _process(self, job: Dict[str, Any], model_manager: ModelManager) -> None:
+        """Synthesize the pending segments of a job and encode the result"""
+        job_id = job["id"]
+        start = time.perf_counter()
+        try:
+            segments: List[str] = json.loads((self._job_dir(job_id) / "segments.json").read_text())
+            pending = [
+                index for index in range(len(segments))
+                if not self._segment_path(job_id, index).exists()
+            ]
+            if job["status"] == "running":
+                logger.info(
+                    f"Resuming speech job {job_id}: "
+                    f"{len(segments) - len(pending)}/{len(segments)} segments checkpointed"
+                )
+            job.update(
+                status="running",
+                started_at=job["started_at"] or int(time.time()),
+                segments_completed=len(segments) - len(pending),
+                owner=self.owner,
+            )
+            await asyncio.to_thread(self._write_job, job)
+
+            await self._synthesize_segments(job, segments, pending, model_manager)
+
+            # Encode all segments into one file, then drop the checkpoints
+            result = self.result_path(job)
+            tmp = result.with_suffix(f".{uuid.uuid4().hex}.tmp")
+            await asyncio.to_thread(
+                encode_file,
+                self._iter_segments(job_id, len(segments)),
+                KOKORO_SAMPLE_RATE,
+                tmp,
+                job["response_format"],
+                model_manager.output_sample_rate(job["voice"], job["sample_rate"]),
+                job["bitrate"],
+                job["channels"],
+            )
+            os.replace(tmp, result)
+            audio_samples = sum(
+                np.load(self._segment_path(job_id, index), mmap_mode="r").size
+                for index in range(len(segments))
+            )
+            shutil.rmtree(self._job_dir(job_id) / "segments", ignore_errors=True)
+
+            job.update(
+                status="completed",
+                completed_at=int(time.time()),
+                audio_seconds=round(audio_samples / KOKORO_SAMPLE_RATE, 3),
+                bytes=result.stat().st_size,
+            )
+            await asyncio.to_thread(self._write_job, job)
+            logger.info(
+                f"Completed speech job {job_id}: {job['audio_seconds']:.0f}s audio, "
+                f"{len(segments)} segments in {time.perf_counter() - start:.0f}s"
+            )
+
+        except asyncio.CancelledError:
+            # Shutdown or lost lease: checkpoints stay and the lease is
+            # released, so the job resumes on restart or on another pod
+            if not self._deleted(job_id):
+                logger.info(f"Speech job {job_id} interrupted; will resume from checkpoints")
+            raise
+        except Exception as e:
+            error = _first_error(e)
+            if isinstance(error, JobCancelled) or self._deleted(job_id):
+                logger.info(f"Speech job {job_id} deleted while running")
+                return
+            logger.error(f"Speech job {job_id} failed: {error!r}")
+            job.update(status="failed", completed_at=int(time.time()), error=str(error))
+            try:
+                self._write_job(job)
+            except JobCancelled:
+                pass
+
+    async def _synthesize_segments(
+        self,
+        job: Dict[str, Any],
+        segments: List[str],
+        pending: List[int],
+        model_manager: ModelManager,
+    ) -> None:
+        """Synthesize and checkpoint pending segments, one per inference worker at a time"""
+        job_id = job["id"]
+        semaphore = asyncio.Semaphore(model_manager.thread_plan.workers)
+
+        async def synthesize(index: int) -> None:
+            async with semaphore:
+                if job_id in self._cancelled:
+                    raise JobCancelled(job_id)
+                audio = await model_manager.synthesize(segments[index], job["voice"], job["speed"])
+                await asyncio.to_thread(self._save_segment, job_id, index, audio)
+                job["segments_completed"] += 1
+                await asyncio.to_thread(self._write_job, job)
+
+        async with asyncio.TaskGroup() as group:
+            for index in pending:
+                group.create_task(synthesize(index))
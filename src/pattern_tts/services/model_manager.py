@@ -1,17 +1,46 @@
 """Model management for Kokoro TTS inference"""
 
 import asyncio
+import contextvars
+import itertools
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
 
 import numpy as np
+import psutil
 import torch
-from kokoro import KModel, KPipeline
 from loguru import logger
 
 from ..core.config import settings
-from ..services.voice_manager import VoiceManager
+from ..services.profiler import current_trace, instrument_model, profiling, span
+from ..services.voice_manager import VoiceManager, canonical_voice_blend, parse_voice_blend
+from ..utils.audio_encoding import StreamEncoder, encode_audio
+from ..utils.cpu import ThreadPlan, plan_threads
+from ..utils.text_chunking import plan_segments
+from ..utils.text_normalization import normalize_text
+
+if TYPE_CHECKING:
+    # kokoro pulls in misaki, spaCy and the phonemizer stack; it is imported
+    # when the model is loaded, off the event loop
+    from kokoro import KModel, KPipeline
+
+
+# KPipeline language code loaded at startup (American English)
+DEFAULT_LANG_CODE = "a"
+
+# Language codes handled by the English text normalization rules
+ENGLISH_LANG_CODES = frozenset({"a", "b"})
+
+# Kokoro always synthesizes 24kHz audio; each predicted duration frame
+# is 600 samples
+KOKORO_SAMPLE_RATE = 24000
+FRAMES_PER_SECOND = KOKORO_SAMPLE_RATE / 600
 
 
 class ModelManager:
@@ -19,24 +48,74 @@ class ModelManager:
 
     Handles model loading, initialization, and audio generation
     with proper device management (CPU/CUDA/MPS).
+
+    Voice packs and per-language pipelines are loaded on demand and kept
+    in LRU order so the ResourceManager can evict them under memory
+    pressure. After an idle unload the model is reloaded lazily on the
+    next request.
     """
 
     # Singleton instance
     _instance = None
     _lock = asyncio.Lock()
 
-    def __init__(self, model_path: str = "/models"):
+    def __init__(
+        self,
+        model_path: str = "/models",
+        voice_manager: Optional[VoiceManager] = None,
+    ):
         """Initialize model manager
 
         Args:
             model_path: Path to directory containing model files
+            voice_manager: Voice registry used to resolve voice pack files
         """
         self.model_path = Path(model_path)
-        self.model: Optional[KModel] = None
-        self.pipeline: Optional[KPipeline] = None
+        self.voice_manager = voice_manager
+        self.model: Optional["KModel"] = None
+        self.pipeline: Optional["KPipeline"] = None
         self.device: str = settings.get_device()
         self._initialized = False
 
+        # Style tables of voices and blends, keyed by voice ID or canonical
+        # blend spec (LRU order, oldest first), contiguous on the model
+        # device. Blends are also capped at settings.voice_blend_cache_size.
+        # Caches are touched from inference workers, the registry watcher
+        # and the resource manager, so access goes through _cache_lock.
+        self._voice_cache: "OrderedDict[str, torch.Tensor]" = OrderedDict()
+        self._cache_lock = threading.RLock()
+
+        # Pipelines keyed by KPipeline lang_code (LRU order, oldest first),
+        # with the RSS growth measured when each one was created
+        self.pipelines: "OrderedDict[str, KPipeline]" = OrderedDict()
+        self._pipeline_bytes: Dict[str, int] = {}
+        self._unsupported_lang_codes: set[str] = set()
+
+        # Usage tracking for idle unload
+        self.last_used: float = time.monotonic()
+        self.active_requests: int = 0
+        self.idle_unloaded: bool = False
+        self._load_lock = asyncio.Lock()
+
+        # Inference runs on a pool of max_concurrent_requests workers (one
+        # request each); torch threads are sized from the container CPU budget
+        self.thread_plan: ThreadPlan = plan_threads(
+            settings.max_concurrent_requests,
+            settings.torch_num_threads,
+            settings.torch_interop_threads,
+            settings.cpu_pinning,
+        )
+        self._threads_configured = False
+        self._worker_ids = itertools.count()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.thread_plan.workers,
+            thread_name_prefix="tts-inference",
+            initializer=self._init_worker,
+        )
+
+        if voice_manager is not None:
+            voice_manager.add_listener(self.on_voices_changed)
+
         logger.debug(f"ModelManager created with device: {self.device}")
 
     @classmethod
@@ -66,52 +145,13 @@ class ModelManager:
             return
 
         try:
-            # Determine model file paths
-            model_file = self.model_path / "kokoro-v1_0.pth"
-            config_file = self.model_path / "config.json"
-
-            # Verify files exist
-            if not model_file.exists():
-                raise FileNotFoundError(
-                    f"Model file not found: {model_file}\n"
-                    f"Expected location: {self.model_path}"
-                )
-
-            if not config_file.exists():
-                raise FileNotFoundError(
-                    f"Config file not found: {config_file}\n"
-                    f"Expected location: {self.model_path}"
-                )
-
-            logger.info(f"Loading Kokoro model from {model_file}")
-            logger.info(f"Using config: {config_file}")
-            logger.info(f"Target device: {self.device}")
-
-            # Load model with config
-            self.model = KModel(
-                config=str(config_file),
-                model=str(model_file)
-            ).eval()
-
-            # Move to appropriate device
-            if self.device == "cuda":
-                self.model = self.model.cuda()
-                logger.info("Model loaded on CUDA")
-            elif self.device == "mps":
-                self.model = self.model.to(torch.device("mps"))
-                logger.info("Model loaded on MPS (Apple Silicon)")
-            else:
-                self.model = self.model.cpu()
-                logger.info("Model loaded on CPU")
-
-            # Create pipeline with default language
-            self.pipeline = KPipeline(
-                lang_code="a",  # American English
-                model=self.model,
-                device=self.device
-            )
+            # Importing kokoro and building the model take seconds; keep
+            # them off the event loop so health checks stay responsive
+            await asyncio.to_thread(self._load_model)
 
             self._initialized = True
+            self.idle_unloaded = False
+            self.last_used = time.monotonic()
             logger.info("Kokoro model initialized successfully")
 
         except FileNotFoundError as e:
@@ -121,6 +161,125 @@ class ModelManager:
             logger.error(f"Failed to initialize model: {e}")
             raise RuntimeError(f"Model initialization failed: {e}")
 
+    def configure_threads(self) -> None:
+        """Apply the thread plan to torch (once per process)
+
+        Inter-op threads can only be set before torch starts parallel work,
+        so this runs before the model is first loaded.
+        """
+        if self._threads_configured:
+            return
+        plan = self.thread_plan
+        torch.set_num_threads(plan.intra_op_threads)
+        try:
+            torch.set_num_interop_threads(plan.inter_op_threads)
+        except RuntimeError as e:
+            logger.warning(f"Could not set torch inter-op threads: {e}")
+        self._threads_configured = True
+
+        logger.info(
+            f"CPU budget {plan.cpus}, {plan.workers} inference workers, "
+            f"torch threads intra-op={torch.get_num_threads()} "
+            f"inter-op={torch.get_num_interop_threads()}"
+        )
+        if settings.cpu_pinning and not plan.worker_cpus:
+            logger.warning(
+                "cpu_pinning ignored: the CPU affinity mask is wider than the CPU "
+                "quota (pinning needs an exclusive cpuset)"
+            )
+
+    def _init_worker(self) -> None:
+        """Inference worker thread initializer: pin to this worker's CPUs"""
+        worker = next(self._worker_ids)
+        if self.thread_plan.worker_cpus:
+            cpus = self.thread_plan.worker_cpus[worker % len(self.thread_plan.worker_cpus)]
+            # pid 0 is the calling thread; torch threads it starts inherit the mask
+            os.sched_setaffinity(0, cpus)
+            logger.debug(f"Inference worker {worker} pinned to CPUs {cpus}")
+
+    @staticmethod
+    def _profiled(fn: Callable, *args: Any) -> Any:
+        with profiling():
+            return fn(*args)
+
+    async def _run_blocking(self, fn: Callable, *args: Any) -> Any:
+        """Run blocking inference/encoding on the worker pool
+
+        Queues behind the concurrency limit and keeps the request trace
+        (context variables) and profiler in the worker thread.
+        """
+        ctx = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(ctx.run, self._profiled, fn, *args)
+        )
+
+    def thread_info(self) -> Dict[str, Any]:
+        """Thread configuration for the readiness endpoint"""
+        plan = self.thread_plan
+        return {
+            "cpu_budget": plan.cpus,
+            "workers": plan.workers,
+            "intra_op_threads": torch.get_num_threads(),
+            "inter_op_threads": torch.get_num_interop_threads(),
+            "pinned_cpus": plan.worker_cpus,
+        }
+
+    def _load_model(self) -> None:
+        """Import kokoro, load the model onto the device and create the default pipeline
+
+        Raises:
+            FileNotFoundError: If model or config file is missing
+        """
+        from kokoro import KModel
+
+        self.configure_threads()
+
+        # Determine model file paths
+        model_file = self.model_path / "kokoro-v1_0.pth"
+        config_file = self.model_path / "config.json"
+
+        # Verify files exist
+        if not model_file.exists():
+            raise FileNotFoundError(
+                f"Model file not found: {model_file}\n"
+                f"Expected location: {self.model_path}"
+            )
+
+        if not config_file.exists():
+            raise FileNotFoundError(
+                f"Config file not found: {config_file}\n"
+                f"Expected location: {self.model_path}"
+            )
+
+        logger.info(f"Loading Kokoro model from {model_file}")
+        logger.info(f"Using config: {config_file}")
+        logger.info(f"Target device: {self.device}")
+
+        # Load model with config
+        model = KModel(
+            config=str(config_file),
+            model=str(model_file)
+        ).eval()
+
+        # Move to appropriate device
+        if self.device == "cuda":
+            model = model.cuda()
+            logger.info("Model loaded on CUDA")
+        elif self.device == "mps":
+            model = model.to(torch.device("mps"))
+            logger.info("Model loaded on MPS (Apple Silicon)")
+        else:
+            model = model.cpu()
+            logger.info("Model loaded on CPU")
+
+        # Time forward passes for request traces
+        instrument_model(model)
+
+        # Create pipeline with default language
+        self.model = model
+        self.pipeline = self._new_pipeline(DEFAULT_LANG_CODE)  # American English
+        self.pipelines[DEFAULT_LANG_CODE] = self.pipeline
+
     async def initialize_with_warmup(
         self, voice_manager: VoiceManager
     ) -> tuple[str, str, int]:
@@ -150,7 +309,11 @@ class ModelManager:
             logger.info(f"Warming up model with voice '{voice}'")
 
             # Generate warmup audio (discard output)
-            _ = await self.generate_speech(warmup_text, voice=voice, speed=1.0)
+            await self._run_blocking(
+                lambda: encode_audio(
+                    self._run_pipeline(warmup_text, voice, 1.0), KOKORO_SAMPLE_RATE
+                )
+            )
 
             # Calculate warmup time
             warmup_ms = int((time.perf_counter() - start) * 1000)
@@ -173,11 +336,41 @@ class ModelManager:
         """
         return self._initialized and self.model is not None and self.pipeline is not None
 
+    def is_available(self) -> bool:
+        """Check if requests can be served (loaded, or reloadable after idle unload)
+
+        Returns:
+            True if model is ready or will be reloaded on the next request
+        """
+        return self.is_ready() or self.idle_unloaded
+
+    async def ensure_loaded(self) -> None:
+        """Reload the model if it was unloaded after being idle
+
+        Raises:
+            RuntimeError: If model was never initialized or reload fails
+        """
+        if self.is_ready():
+            return
+        if not self.idle_unloaded:
+            raise RuntimeError("Model not initialized. Call initialize() first.")
+
+        async with self._load_lock:
+            if not self.is_ready():
+                start = time.perf_counter()
+                await self.initialize()
+                reload_ms = int((time.perf_counter() - start) * 1000)
+                logger.info(f"Model reloaded after idle unload in {reload_ms}ms")
+
     async def generate_speech(
         self,
         text: str,
         voice: str = "af_sky",
-        speed: float = 1.0
+        speed: float = 1.0,
+        response_format: str = "mp3",
+        sample_rate: Optional[int] = None,
+        bitrate: Optional[int] = None,
+        channels: int = 1,
     ) -> bytes:
         """Generate audio from text
 
@@ -185,94 +378,662 @@ class ModelManager:
             text: Text to synthesize
             voice: Voice ID (af_sky, af, am, etc.)
             speed: Speech rate multiplier (0.5 - 2.0)
+            response_format: Output format (mp3, opus, aac, flac, wav, pcm, mulaw)
+            sample_rate: Output sample rate in Hz (default: the voice's sample rate)
+            bitrate: Lossy bitrate in kbps (default scales with sample rate)
+            channels: 1 (mono) or 2 (stereo)
 
         Returns:
-            Audio data as MP3 bytes
+            Encoded audio bytes
 
         Raises:
             RuntimeError: If model not ready or generation fails
         """
-        if not self.is_ready():
-            raise RuntimeError("Model not initialized. Call initialize() first.")
+        audio_array = await self._synthesize(text, voice, speed)
+        return await self._run_blocking(
+            self._encode, audio_array, voice, response_format, sample_rate, bitrate, channels
+        )
 
-        try:
-            # Load voice tensor from PVC
-            voice_path = f"/models/{voice}.pt"
+    async def generate_speech_with_timestamps(
+        self,
+        text: str,
+        voice: str = "af_sky",
+        speed: float = 1.0,
+        response_format: str = "mp3",
+        sample_rate: Optional[int] = None,
+        bitrate: Optional[int] = None,
+        channels: int = 1,
+    ) -> tuple[bytes, Dict[str, Any]]:
+        """Generate audio plus word and phoneme timings from the same inference pass
 
-            if not os.path.exists(voice_path):
-                raise FileNotFoundError(
-                    f"Voice file not found: {voice_path}\n"
-                    f"Available voices should be in /models/"
+        Timings come from the durations the model predicts for each phoneme,
+        so no separate alignment pass is needed. Word timings are only
+        available for English voices (other G2P backends do not return tokens).
+
+        Args:
+            text: Text to synthesize
+            voice: Voice ID
+            speed: Speech rate multiplier
+            response_format, sample_rate, bitrate, channels: As for generate_speech
+
+        Returns:
+            Tuple of (encoded audio, {"duration": ..., "words": [...], "phonemes": [...]})
+            where each entry has start/end times in seconds from the start of the audio
+
+        Raises:
+            RuntimeError: If model not ready or generation fails
+        """
+        timestamps: Dict[str, Any] = {"words": [], "phonemes": []}
+        audio_array = await self._synthesize(text, voice, speed, timestamps=timestamps)
+        timestamps["duration"] = round(audio_array.size / KOKORO_SAMPLE_RATE, 3)
+        encoded = await self._run_blocking(
+            self._encode, audio_array, voice, response_format, sample_rate, bitrate, channels
+        )
+        return encoded, timestamps
+
+    async def stream_speech(
+        self,
+        text: str,
+        voice: str = "af_sky",
+        speed: float = 1.0,
+        response_format: str = "mp3",
+        sample_rate: Optional[int] = None,
+        bitrate: Optional[int] = None,
+        channels: int = 1,
+    ) -> AsyncIterator[bytes]:
+        """Generate audio segment by segment, yielding encoded audio as soon as it is ready
+
+        The text is re-segmented with plan_segments: a short first segment
+        (its leading clauses, up to stream_first_chunk_words words) so the
+        first chunk only waits for a small forward pass, then segments
+        growing by stream_chunk_growth toward target_max_tokens. Segments of
+        concurrent requests interleave on the inference workers. All
+        segments go through one StreamEncoder, so compressed formats are a
+        single encoder stream (one header, no gaps at segment joins), and
+        the next segment is synthesized while the encoder works.
+
+        Args:
+            text: Text to synthesize
+            voice: Voice ID
+            speed: Speech rate multiplier
+            response_format: A streamable output format (mp3, opus, aac, pcm, mulaw)
+            sample_rate, bitrate, channels: As for generate_speech
+
+        Yields:
+            Encoded audio chunks; concatenated, they form one stream
+
+        Raises:
+            RuntimeError: If model not ready or generation fails
+        """
+        await self.ensure_loaded()
+
+        # Encoded output, handed over from the encoder's threads; None ends it
+        loop = asyncio.get_running_loop()
+        output: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue()
+        encoder = StreamEncoder(
+            lambda data: loop.call_soon_threadsafe(output.put_nowait, data),
+            KOKORO_SAMPLE_RATE,
+            response_format=response_format,
+            sample_rate=self.output_sample_rate(voice, sample_rate),
+            bitrate=bitrate,
+            channels=channels,
+        )
+
+        self.active_requests += 1
+        self.last_used = time.monotonic()
+        trace = current_trace()
+        start = time.perf_counter()
+        first_audio_ms: Optional[float] = None
+        audio_seconds = 0.0
+        segments = 0
+
+        async def produce() -> None:
+            nonlocal audio_seconds, segments
+            try:
+                pipeline, voice_tensor, prepared = await self._run_blocking(
+                    self._prepare, text, voice
                 )
+                planned = plan_segments(
+                    prepared,
+                    settings.stream_first_chunk_words,
+                    settings.target_max_tokens,
+                    settings.stream_chunk_growth,
+                )
+                audio_iter = self._iter_audio(pipeline, voice_tensor, "\n".join(planned), speed)
+                while True:
+                    audio = await self._run_blocking(self._next_segment, audio_iter)
+                    if audio is None:
+                        break
+                    # Off the inference workers: writing blocks while ffmpeg catches up
+                    await asyncio.to_thread(self._encode_segment, encoder, audio)
+                    seconds = audio.size / KOKORO_SAMPLE_RATE
+                    audio_seconds += seconds
+                    segments += 1
+                    if trace is not None:
+                        trace.mark_audio(seconds)
+                await asyncio.to_thread(encoder.close)
+            finally:
+                # Queued after all output the encoder delivered before close() returned
+                loop.call_soon_threadsafe(output.put_nowait, None)
 
-            # Load voice tensor
-            voice_tensor = torch.load(voice_path, map_location=self.device)
-
-            # Generate audio using pipeline
-            # The pipeline handles text-to-phoneme and synthesis
-            # It returns a generator of Result objects with .audio attribute
-            audio_generator = self.pipeline(
-                text,
-                voice=voice_tensor,
-                speed=speed,
-                split_pattern=r'\n'  # Split on newlines for better quality
-            )
+        producer = asyncio.create_task(produce())
+        try:
+            finished = False
+            while not finished:
+                # Coalesce what the encoder wrote meanwhile (it flushes per packet)
+                pieces = [await output.get()]
+                while not output.empty():
+                    pieces.append(output.get_nowait())
+                finished = pieces[-1] is None
+                chunk = b"".join(pieces[:-1] if finished else pieces)
+                if not chunk:
+                    continue
+                if first_audio_ms is None:
+                    first_audio_ms = (time.perf_counter() - start) * 1000
+                yield chunk
+            await producer
+        except FileNotFoundError as e:
+            logger.error(f"Voice file not found: {e}")
+            raise RuntimeError(f"Voice not available: {e}")
+        finally:
+            producer.cancel()
+            encoder.abort()
+            await asyncio.gather(producer, return_exceptions=True)
+            self.active_requests -= 1
+            self.last_used = time.monotonic()
 
-            # Collect all audio chunks from the generator
-            audio_chunks = []
-            for result in audio_generator:
-                # KPipeline.Result has an .audio attribute containing numpy array
-                if hasattr(result, 'audio'):
-                    audio_data = result.audio
-                    if isinstance(audio_data, torch.Tensor):
-                        audio_data = audio_data.cpu().numpy()
-                    if isinstance(audio_data, np.ndarray) and audio_data.size > 0:
-                        audio_chunks.append(audio_data)
-
-            # Concatenate all chunks
-            if not audio_chunks:
-                raise RuntimeError(f"No audio generated from text: '{text[:50]}...'")
-
-            audio_array = np.concatenate(audio_chunks)
-
-            # Convert to int16 format for audio export
-            audio_int16 = (audio_array * 32767).astype(np.int16)
-
-            # Convert to MP3 using pydub
-            from io import BytesIO
-            from pydub import AudioSegment
-
-            # Create AudioSegment from numpy array
-            audio_segment = AudioSegment(
-                audio_int16.tobytes(),
-                frame_rate=24000,
-                sample_width=2,
-                channels=1
-            )
+        if not segments:
+            raise RuntimeError(f"No audio generated from text: '{text[:50]}...'")
+
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"Streamed {segments} segments: first audio {first_audio_ms:.0f}ms, "
+            f"{audio_seconds:.1f}s audio in {elapsed:.1f}s "
+            f"({audio_seconds / elapsed:.2f}x realtime)"
+        )
 
-            # Export as MP3
-            buffer = BytesIO()
-            audio_segment.export(buffer, format="mp3", bitrate="24k")
-            buffer.seek(0)
+    async def synthesize(self, text: str, voice: str, speed: float = 1.0) -> np.ndarray:
+        """Synthesize float32 audio at KOKORO_SAMPLE_RATE without encoding
 
-            return buffer.read()
+        Used by speech jobs, which checkpoint raw segments and encode once
+        at the end.
 
+        Raises:
+            RuntimeError: If model not ready or generation fails
+        """
+        return await self._synthesize(text, voice, speed)
+
+    async def _synthesize(
+        self,
+        text: str,
+        voice: str,
+        speed: float,
+        timestamps: Optional[Dict[str, list]] = None,
+    ) -> np.ndarray:
+        """Run G2P and inference, returning float32 audio at KOKORO_SAMPLE_RATE
+
+        Args:
+            text: Text to synthesize
+            voice: Voice ID
+            speed: Speech rate multiplier
+            timestamps: If given, word/phoneme timings are appended to its
+                "words" and "phonemes" lists
+
+        Raises:
+            RuntimeError: If model not ready or generation fails
+        """
+        await self.ensure_loaded()
+
+        self.active_requests += 1
+        self.last_used = time.monotonic()
+        try:
+            return await self._run_blocking(self._run_pipeline, text, voice, speed, timestamps)
         except FileNotFoundError as e:
             logger.error(f"Voice file not found: {e}")
             raise RuntimeError(f"Voice not available: {e}")
         except Exception as e:
             logger.error(f"Speech generation failed: {e}")
             raise RuntimeError(f"Failed to generate speech: {e}")
+        finally:
+            self.active_requests -= 1
+            self.last_used = time.monotonic()
+
+    def _prepare(self, text: str, voice: str) -> tuple["KPipeline", torch.Tensor, str]:
+        """Load the voice pack and pipeline and normalize the text (runs on an inference worker)
+
+        Returns:
+            Tuple of (pipeline, voice tensor, normalized text)
+
+        Raises:
+            FileNotFoundError: If the voice pack file does not exist
+        """
+        with span("load"):
+            voice_tensor = self.get_voice_tensor(voice)
+            lang_code = self._voice_lang_code(voice)
+            pipeline = self.get_pipeline(lang_code)
+
+        # Spell out numbers, dates, URLs, etc. (rules are English-only)
+        if settings.advanced_text_normalization and lang_code in ENGLISH_LANG_CODES:
+            with span("normalize"):
+                text = normalize_text(text)
+        return pipeline, voice_tensor, text
+
+    def _iter_audio(
+        self,
+        pipeline: "KPipeline",
+        voice_tensor: torch.Tensor,
+        text: str,
+        speed: float,
+        timestamps: Optional[Dict[str, list]] = None,
+    ) -> Iterator[np.ndarray]:
+        """Yield float32 audio per pipeline segment
+
+        G2P and the forward pass for each segment run as it is pulled. The
+        pipeline splits the text into segments on newlines (and further if a
+        segment exceeds the model's phoneme limit).
+        """
+        audio_generator = pipeline(
+            text,
+            voice=voice_tensor,
+            speed=speed,
+            split_pattern=r'\n'  # Split on newlines for better quality
+        )
+
+        trace = current_trace()
+        offset_samples = 0
+        for result in audio_generator:
+            # KPipeline.Result has an .audio attribute containing numpy array
+            if hasattr(result, 'audio'):
+                audio_data = result.audio
+                if isinstance(audio_data, torch.Tensor):
+                    audio_data = audio_data.cpu().numpy()
+                if isinstance(audio_data, np.ndarray) and audio_data.size > 0:
+                    if timestamps is not None:
+                        self._collect_timestamps(
+                            result, offset_samples / KOKORO_SAMPLE_RATE, timestamps
+                        )
+                    offset_samples += audio_data.size
+                    if trace is not None:
+                        trace.end_segment(result, audio_data.size / KOKORO_SAMPLE_RATE)
+                    yield audio_data
+
+    def _run_pipeline(
+        self,
+        text: str,
+        voice: str,
+        speed: float,
+        timestamps: Optional[Dict[str, list]] = None,
+    ) -> np.ndarray:
+        """Blocking G2P + inference for one request (runs on an inference worker)
+
+        Raises:
+            FileNotFoundError: If the voice pack file does not exist
+            RuntimeError: If no audio was generated
+        """
+        pipeline, voice_tensor, text = self._prepare(text, voice)
+
+        trace = current_trace()
+        with span("pipeline"):
+            if trace is not None:
+                trace.start_segments()
+            audio_chunks = list(self._iter_audio(pipeline, voice_tensor, text, speed, timestamps))
+
+        # Concatenate all chunks
+        if not audio_chunks:
+            raise RuntimeError(f"No audio generated from text: '{text[:50]}...'")
+
+        return np.concatenate(audio_chunks)
+
+    @staticmethod
+    def _next_segment(audio_iter: Iterator[np.ndarray]) -> Optional[np.ndarray]:
+        """Synthesize the next segment of a streamed request (None when done)"""
+        trace = current_trace()
+        with span("pipeline"):
+            if trace is not None:
+                trace.start_segments()
+            return next(audio_iter, None)
+
+    def _collect_timestamps(
+        self, result: "KPipeline.Result", offset: float, timestamps: Dict[str, list]
+    ) -> None:
+        """Append a segment's word and phoneme timings, shifted by its offset
+
+        Args:
+            result: Pipeline result for one segment
+            offset: Start of the segment in the output audio, in seconds
+            timestamps: Dict with "words" and "phonemes" lists to extend
+        """
+        for token in result.tokens or []:
+            if token.start_ts is None or token.end_ts is None:
+                continue
+            timestamps["words"].append({
+                "word": token.text,
+                "start": round(offset + token.start_ts, 3),
+                "end": round(offset + token.end_ts, 3),
+            })
+
+        pred_dur = result.pred_dur
+        if pred_dur is None or not result.phonemes:
+            return
+
+        # pred_dur holds one duration (in frames) per input token: <bos>,
+        # each phoneme the model vocab knows, <eos>. The <bos> lead-in uses
+        # the same 3-frame offset KPipeline applies to word timestamps.
+        durations = pred_dur.tolist()
+        phonemes = [p for p in result.phonemes if p in self.model.vocab]
+        position = max(0, durations[0] - 3) / FRAMES_PER_SECOND
+        for phoneme, frames in zip(phonemes, durations[1:-1]):
+            end = position + frames / FRAMES_PER_SECOND
+            if not phoneme.isspace():
+                timestamps["phonemes"].append({
+                    "phoneme": phoneme,
+                    "start": round(offset + position, 3),
+                    "end": round(offset + end, 3),
+                })
+            position = end
+
+    def output_sample_rate(self, voice: str, sample_rate: Optional[int] = None) -> int:
+        """Output sample rate: the requested one, else the voice's native rate"""
+        if sample_rate is not None:
+            return sample_rate
+        if self.voice_manager is not None:
+            return self.voice_manager.get_sample_rate(voice)
+        return settings.sample_rate
+
+    def _encode(
+        self,
+        audio_array: np.ndarray,
+        voice: str,
+        response_format: str,
+        sample_rate: Optional[int],
+        bitrate: Optional[int],
+        channels: int,
+    ) -> bytes:
+        """Resample (once) and encode float32 audio at KOKORO_SAMPLE_RATE
+
+        Raises:
+            RuntimeError: If the output parameters are unsupported or encoding fails
+        """
+        sample_rate = self.output_sample_rate(voice, sample_rate)
+        try:
+            with span("encode"):
+                return encode_audio(
+                    audio_array,
+                    KOKORO_SAMPLE_RATE,
+                    response_format=response_format,
+                    sample_rate=sample_rate,
+                    bitrate=bitrate,
+                    channels=channels,
+                )
+        except Exception as e:
+            logger.error(f"Audio encoding failed: {e}")
+            raise RuntimeError(f"Failed to encode audio: {e}")
+
+    @staticmethod
+    def _encode_segment(encoder: StreamEncoder, audio_array: np.ndarray) -> None:
+        """Feed one segment of a streamed response to its encoder
+
+        Raises:
+            RuntimeError: If encoding fails
+        """
+        try:
+            with span("encode"):
+                encoder.write(audio_array)
+        except Exception as e:
+            logger.error(f"Audio encoding failed: {e}")
+            raise RuntimeError(f"Failed to encode audio: {e}")
+
+    def _resolve_voice_path(self, voice: str) -> Path:
+        """Resolve a voice ID to its .pt file via the registry, else model_path"""
+        if self.voice_manager is not None:
+            voice_path = self.voice_manager.get_voice_path(voice)
+            if voice_path is not None:
+                return voice_path
+        return self.model_path / f"{voice}.pt"
+
+    def get_voice_tensor(self, voice: str) -> torch.Tensor:
+        """Return the style table of a voice or blend, building it into the voice cache once
+
+        A voice pack holds one style vector per phoneme sequence length, and
+        KPipeline picks row len(phonemes) - 1 for each segment. Tables are
+        cached float32 and contiguous on the model device, so that pick is a
+        view into resident memory: no copy, reload or host-to-device
+        transfer per segment. A blend ("af_bella(2)+af_sky(1)") is the
+        weighted sum of its components' tables and is cached under its
+        canonical spec, so equivalent spellings share one table.
+
+        Args:
+            voice: Voice ID or blend spec
+
+        Returns:
+            Style table on the model device
+
+        Raises:
+            FileNotFoundError: If a voice pack file does not exist
+        """
+        blend = parse_voice_blend(voice)
+        if blend is not None:
+            voice = canonical_voice_blend(blend)
+
+        with self._cache_lock:
+            voice_tensor = self._voice_cache.get(voice)
+            if voice_tensor is not None:
+                self._voice_cache.move_to_end(voice)
+                return voice_tensor
+
+        if blend is not None:
+            # Built from the canonical (rounded) weights, so the table matches its key
+            voice_tensor = self._blend_voice_tensor(parse_voice_blend(voice))
+            source = "blend"
+        else:
+            voice_path = self._resolve_voice_path(voice)
+            if not os.path.exists(voice_path):
+                raise FileNotFoundError(
+                    f"Voice file not found: {voice_path}\n"
+                    f"Available voices should be in {voice_path.parent}/"
+                )
+            voice_tensor = torch.load(voice_path, map_location=self.device, weights_only=True)
+            source = str(voice_path)
+
+        voice_tensor = voice_tensor.to(device=self.device, dtype=torch.float32).contiguous()
+        with self._cache_lock:
+            self._voice_cache[voice] = voice_tensor
+            if blend is not None:
+                self._trim_blends()
+        logger.debug(f"Loaded voice pack '{voice}' from {source}")
+        return voice_tensor
+
+    def _trim_blends(self) -> None:
+        """Evict least recently used blends beyond settings.voice_blend_cache_size
+
+        Blend specs are client-chosen, so they get their own bound rather
+        than relying on the memory budget (which may be unlimited) to keep
+        arbitrary weight combinations from filling the voice cache.
+        """
+        blends = [spec for spec in self._voice_cache if "+" in spec]
+        for spec in blends[: max(0, len(blends) - settings.voice_blend_cache_size)]:
+            del self._voice_cache[spec]
+            logger.debug(f"Evicted voice blend '{spec}'")
+
+    def _blend_voice_tensor(self, blend: List[tuple[str, float]]) -> torch.Tensor:
+        """Weighted sum of component style tables
+
+        Weights are normalized to sum to 1 if settings.voice_weight_normalization
+        is set, else applied as given.
+        """
+        weights = torch.tensor([weight for _, weight in blend], dtype=torch.float32)
+        if settings.voice_weight_normalization:
+            weights = weights / weights.sum()
+        tables = torch.stack([self.get_voice_tensor(component) for component, _ in blend])
+        return torch.tensordot(weights.to(tables.device), tables, dims=1)
+
+    def _pipeline_voice(self, voice: Any, delimiter: str = ",") -> torch.Tensor:
+        """KPipeline.load_voice replacement resolving voices through the voice cache
+
+        The stock method only passes CPU float32 tensors through (device
+        tables would be re-resolved as names) and loads string voices
+        itself, bypassing the cache and blends.
+        """
+        if isinstance(voice, torch.Tensor):
+            return voice
+        return self.get_voice_tensor(voice)
+
+    def _new_pipeline(self, lang_code: str) -> "KPipeline":
+        """Create a pipeline on the shared model that takes style tables from the voice cache"""
+        from kokoro import KPipeline
+
+        pipeline = KPipeline(lang_code=lang_code, model=self.model, device=self.device)
+        pipeline.load_voice = self._pipeline_voice
+        return pipeline
+
+    def _voice_lang_code(self, voice: str) -> str:
+        """KPipeline language code for a voice (from the registry or ID prefix)"""
+        if self.voice_manager is not None:
+            voice_info = self.voice_manager.get_voice_info(
+                self.voice_manager.primary_voice(voice)
+            )
+            if voice_info and voice_info.lang_code:
+                return voice_info.lang_code
+        return voice[:1] or DEFAULT_LANG_CODE
+
+    def get_pipeline(self, lang_code: str = DEFAULT_LANG_CODE) -> "KPipeline":
+        """Return the pipeline for a language, creating it on first use
+
+        Pipelines share the loaded model; only the G2P stack is per language.
+        Falls back to the default pipeline if the language is unsupported.
+
+        Args:
+            lang_code: KPipeline language code ('a', 'b', 'j', 'z', ...)
+
+        Returns:
+            KPipeline instance
+        """
+        # Held while creating a pipeline so concurrent requests don't build it twice
+        with self._cache_lock:
+            pipeline = self.pipelines.get(lang_code)
+            if pipeline is not None:
+                self.pipelines.move_to_end(lang_code)
+                return pipeline
+
+            if lang_code in self._unsupported_lang_codes:
+                return self.pipeline
+
+            process = psutil.Process()
+            rss_before = process.memory_info().rss
+            try:
+                pipeline = self._new_pipeline(lang_code)
+            except Exception as e:
+                logger.warning(
+                    f"Pipeline for lang_code '{lang_code}' unavailable, using default: {e}"
+                )
+                self._unsupported_lang_codes.add(lang_code)
+                return self.pipeline
+
+            self.pipelines[lang_code] = pipeline
+            self._pipeline_bytes[lang_code] = max(0, process.memory_info().rss - rss_before)
+            logger.info(f"Created pipeline for lang_code '{lang_code}'")
+            return pipeline
+
+    def evict_voice(self, voice: str) -> int:
+        """Drop a voice pack from the voice cache
+
+        Returns:
+            Number of bytes released (0 if the voice was not loaded)
+        """
+        with self._cache_lock:
+            voice_tensor = self._voice_cache.pop(voice, None)
+        if voice_tensor is None:
+            return 0
+        logger.debug(f"Evicted voice pack '{voice}'")
+        return voice_tensor.numel() * voice_tensor.element_size()
+
+    def evict_pipeline(self, lang_code: str) -> int:
+        """Drop a non-default language pipeline
+
+        Returns:
+            Estimated number of bytes released (0 if not loaded or default)
+        """
+        with self._cache_lock:
+            if lang_code == DEFAULT_LANG_CODE or lang_code not in self.pipelines:
+                return 0
+            del self.pipelines[lang_code]
+            released = self._pipeline_bytes.pop(lang_code, 0)
+        logger.info(f"Evicted pipeline for lang_code '{lang_code}'")
+        return released
+
+    def loaded_voices(self) -> List[str]:
+        """Voice IDs in the voice cache, least recently used first"""
+        with self._cache_lock:
+            return list(self._voice_cache)
+
+    def loaded_lang_codes(self) -> List[str]:
+        """Pipeline language codes, least recently used first"""
+        with self._cache_lock:
+            return list(self.pipelines)
+
+    def residency(self) -> Dict[str, int]:
+        """Estimated resident bytes per component
+
+        Returns:
+            Mapping of component name ('model', 'pipeline:<lang>',
+            'voice:<id>') to size in bytes
+        """
+        components: Dict[str, int] = {}
+        if self.model is not None:
+            components["model"] = sum(
+                t.numel() * t.element_size()
+                for t in list(self.model.parameters()) + list(self.model.buffers())
+            )
+        # Copied under the lock: inference threads reorder both caches
+        with self._cache_lock:
+            lang_codes = list(self.pipelines)
+            pipeline_bytes = dict(self._pipeline_bytes)
+            voices = list(self._voice_cache.items())
+        for lang_code in lang_codes:
+            components[f"pipeline:{lang_code}"] = pipeline_bytes.get(lang_code, 0)
+        for voice, voice_tensor in voices:
+            components[f"voice:{voice}"] = voice_tensor.numel() * voice_tensor.element_size()
+        return components
+
+    def on_voices_changed(self, added: List[str], removed: List[str]) -> None:
+        """Voice registry listener: drop stale packs and hot-load new ones
+
+        Args:
+            added: Voice IDs that are new or whose pack file changed
+            removed: Voice IDs that were removed or whose pack file changed
+        """
+        with self._cache_lock:
+            for voice in removed:
+                self._voice_cache.pop(voice, None)
+            # Blends built from a changed pack are stale too
+            for spec in list(self._voice_cache):
+                blend = parse_voice_blend(spec)
+                if blend and any(component in removed for component, _ in blend):
+                    del self._voice_cache[spec]
+
+        if not self.is_ready():
+            return
+
+        for voice in added:
+            try:
+                self.get_voice_tensor(voice)
+            except Exception as e:
+                logger.warning(f"Failed to hot-load voice pack '{voice}': {e}")
+        if added:
+            logger.info(f"Hot-loaded {len(added)} voice packs: {', '.join(added)}")
 
     def get_supported_voices(self) -> list[str]:
         """Return list of available voices
 
-        This is a convenience method that scans the /models directory
-        for .pt voice files.
+        Uses the voice registry when available, otherwise scans the
+        model directory for .pt voice files.
 
         Returns:
             List of voice IDs (without .pt extension)
         """
+        if self.voice_manager is not None:
+            return sorted(self.voice_manager.get_voice_ids())
+
         try:
             voice_files = list(self.model_path.glob("*.pt"))
             voices = [f.stem for f in voice_files]
@@ -282,8 +1043,22 @@ class ModelManager:
             logger.warning(f"Failed to scan for voices: {e}")
             return []
 
-    def unload(self) -> None:
-        """Unload model and free resources"""
+    def shutdown(self) -> None:
+        """Stop the inference workers and unload the model (process exit)
+
+        Run after in-flight requests have drained; work still queued on
+        the workers is cancelled.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.unload()
+
+    def unload(self, idle: bool = False) -> None:
+        """Unload model and free resources
+
+        Args:
+            idle: Unloaded for inactivity; the model is reloaded lazily
+                on the next request
+        """
         if self.model is not None:
             del self.model
             self.model = None
@@ -292,6 +1067,12 @@ class ModelManager:
             del self.pipeline
             self.pipeline = None
 
+        with self._cache_lock:
+            self.pipelines.clear()
+            self._pipeline_bytes.clear()
+            self._voice_cache.clear()
+        self.idle_unloaded = idle
+
         # Clear CUDA cache if using GPU
         if self.device == "cuda" and torch.cuda.is_available():
             torch.cuda.empty_cache()
@@ -0,0 +1,372 @@
+"""Per-request span tracing, sampled profiling and slow-request capture"""
+
+import cProfile
+import io
+import math
+import pstats
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional
+
+from loguru import logger
+
+from ..core.config import settings
+
+PROFILER_BACKENDS = ("cprofile", "torch")
+
+# Rows kept from cProfile / torch.profiler reports
+PROFILE_ROWS = 30
+
+# Streamed requests summarized in the time-to-first-audio stats
+STREAM_STATS_WINDOW = 500
+
+# Held while a detailed profiler runs: cProfile (sys.monitoring from Python
+# 3.12) and torch.profiler are process-wide, one session at a time
+_profiling_lock = threading.Lock()
+
+
+class RequestTrace:
+    """Span timings for one request, plus an optional detailed profile
+
+    Spans accumulate (a span entered twice adds up); segments record what
+    the pipeline did per text segment, splitting each segment's wall time
+    into forward pass (from model hooks) and G2P/other work. All of it is
+    cheap enough to collect on every request so slow requests can be kept
+    after the fact.
+    """
+
+    def __init__(self, endpoint: str, params: Dict[str, Any], backend: Optional[str] = None):
+        """Initialize request trace
+
+        Args:
+            endpoint: Request path being traced
+            params: Request parameters worth recording (no input text)
+            backend: Detailed profiler to run ("cprofile" or "torch"), or None
+        """
+        self.id = uuid.uuid4().hex[:16]
+        self.endpoint = endpoint
+        self.params = params
+        self.backend = backend
+        self.started_at = datetime.utcnow()
+        self.total_ms = 0.0
+        self.spans: Dict[str, float] = {}
+        self.segments: List[Dict[str, Any]] = []
+        self.forward_ms: List[float] = []
+        self.kept = False
+        # Blocks run unprofiled because another request was being profiled
+        self.profile_skipped = 0
+        # Streamed responses: time until the first audio chunk was ready,
+        # and audio produced so far
+        self.first_audio_ms: Optional[float] = None
+        self.audio_seconds = 0.0
+
+        self._start = time.perf_counter()
+        self._forward_start = 0.0
+        self._segment_start = 0.0
+        self._segment_forward = 0
+        self._cprofile = cProfile.Profile() if backend == "cprofile" else None
+        self._torch_reports: List[str] = []
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time a block and add it to the named span"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.spans[name] = self.spans.get(name, 0.0) + elapsed
+
+    @contextmanager
+    def profiling(self) -> Iterator[None]:
+        """Run the detailed profiler (if any) around a block of synchronous work
+
+        Both profilers are process-wide and allow one session at a time, so
+        a block entered while another request's block is being profiled
+        runs unprofiled (counted in profile_skipped) rather than failing or
+        waiting. Work of other threads running meanwhile can show up in the
+        report. Wrap blocking sections only: awaits inside the block would
+        attribute other requests' work.
+        """
+        if self.backend is None:
+            yield
+            return
+        if not _profiling_lock.acquire(blocking=False):
+            self.profile_skipped += 1
+            yield
+            return
+        try:
+            if self._cprofile is not None:
+                self._cprofile.enable()
+                try:
+                    yield
+                finally:
+                    self._cprofile.disable()
+            else:
+                import torch
+
+                with torch.profiler.profile() as prof:
+                    yield
+                self._torch_reports.append(
+                    prof.key_averages().table(
+                        sort_by="self_cpu_time_total", row_limit=PROFILE_ROWS
+                    )
+                )
+        finally:
+            _profiling_lock.release()
+
+    def start_segments(self) -> None:
+        """Mark the start of the first pipeline segment"""
+        self._segment_start = time.perf_counter()
+        self._segment_forward = len(self.forward_ms)
+
+    def end_segment(self, result: Any, audio_seconds: float) -> None:
+        """Record a finished pipeline segment and start timing the next one
+
+        Args:
+            result: KPipeline.Result for the segment
+            audio_seconds: Duration of the segment's audio
+        """
+        now = time.perf_counter()
+        wall_ms = (now - self._segment_start) * 1000
+        forward_ms = sum(self.forward_ms[self._segment_forward:])
+        self.segments.append({
+            "index": len(self.segments),
+            "chars": len(result.graphemes or ""),
+            "phonemes": len(result.phonemes or ""),
+            "words": len(result.tokens or []),
+            "audio_s": round(audio_seconds, 3),
+            "forward_ms": round(forward_ms, 2),
+            "g2p_ms": round(wall_ms - forward_ms, 2),
+        })
+        self._segment_start = now
+        self._segment_forward = len(self.forward_ms)
+
+    def mark_audio(self, audio_seconds: float) -> None:
+        """Record a chunk of audio handed to the client (the first sets TTFA)"""
+        if self.first_audio_ms is None:
+            self.first_audio_ms = (time.perf_counter() - self._start) * 1000
+        self.audio_seconds += audio_seconds
+
+    def realtime_factor(self) -> Optional[float]:
+        """Audio seconds produced per wall-clock second (None if none recorded)"""
+        if not self.audio_seconds or not self.total_ms:
+            return None
+        return self.audio_seconds / (self.total_ms / 1000)
+
+    def finish(self) -> None:
+        """Stop the request clock"""
+        self.total_ms = (time.perf_counter() - self._start) * 1000
+
+    def profile_report(self) -> Optional[str]:
+        """Rendered detailed profile, or None if not profiled"""
+        if self._cprofile is not None:
+            out = io.StringIO()
+            stats = pstats.Stats(self._cprofile, stream=out)
+            stats.sort_stats("cumulative").print_stats(PROFILE_ROWS)
+            return out.getvalue()
+        if self._torch_reports:
+            return "\n".join(self._torch_reports)
+        return None
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact view for trace listings"""
+        spans = dict(self.spans)
+        if self.forward_ms:
+            spans["forward"] = sum(self.forward_ms)
+        summary = {
+            "id": self.id,
+            "endpoint": self.endpoint,
+            "timestamp": self.started_at.isoformat(),
+            "total_ms": round(self.total_ms, 2),
+            "profiled": self.backend is not None,
+            "segments": len(self.segments),
+            "spans_ms": {name: round(ms, 2) for name, ms in spans.items()},
+        }
+        if self.first_audio_ms is not None:
+            summary["first_audio_ms"] = round(self.first_audio_ms, 2)
+            summary["realtime_factor"] = round(self.realtime_factor() or 0.0, 3)
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Full trace including per-segment breakdown and profile report"""
+        return {
+            **self.summary(),
+            "params": self.params,
+            "segment_detail": self.segments,
+            "profiler": self.backend,
+            "profile_skipped": self.profile_skipped,
+            "profile": self.profile_report(),
+        }
+
+
+# Trace of the request being handled in the current task/thread context
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    """Trace for the current request, if tracing is active"""
+    return _current_trace.get()
+
+
+def span(name: str):
+    """Time a block into the current request's trace (no-op when untraced)"""
+    trace = _current_trace.get()
+    return trace.span(name) if trace is not None else nullcontext()
+
+
+def profiling():
+    """Run the current request's detailed profiler around a block (no-op otherwise)"""
+    trace = _current_trace.get()
+    return trace.profiling() if trace is not None else nullcontext()
+
+
+def instrument_model(model: Any) -> None:
+    """Record each forward pass duration into the current request's trace
+
+    Registers forward hooks on the torch module; they only read a context
+    variable when no request is being traced.
+    """
+
+    def before_forward(module, args):
+        trace = _current_trace.get()
+        if trace is not None:
+            trace._forward_start = time.perf_counter()
+
+    def after_forward(module, args, output):
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.forward_ms.append((time.perf_counter() - trace._forward_start) * 1000)
+
+    model.register_forward_pre_hook(before_forward)
+    model.register_forward_hook(after_forward)
+
+
+class Profiler:
+    """Decides which requests to profile and keeps recent traces
+
+    Every request gets a lightweight span trace. Requests that were
+    profiled (admin X-Profile header or random sampling) or that exceeded
+    the slow-request threshold are kept in a bounded ring buffer for the
+    admin API; the rest are dropped.
+    """
+
+    def __init__(self):
+        """Initialize profiler from settings"""
+        self.sample_rate = settings.profile_sample_rate
+        self.slow_request_ms = settings.slow_request_ms
+        self.backend = settings.profiler_backend.lower()
+        if self.backend not in PROFILER_BACKENDS:
+            raise ValueError(
+                f"Unknown profiler backend: {settings.profiler_backend} "
+                f"(expected {' or '.join(PROFILER_BACKENDS)})"
+            )
+
+        self.traces: Deque[RequestTrace] = deque(maxlen=max(1, settings.trace_buffer_size))
+        self.requests = 0
+        self.kept = 0
+        # (first audio ms, realtime factor) of recent streamed requests
+        self.stream_stats: Deque[tuple] = deque(maxlen=STREAM_STATS_WINDOW)
+
+    def should_profile(self, requested: bool = False) -> bool:
+        """Whether to run the detailed profiler for a request
+
+        Args:
+            requested: An authorized admin asked for profiling (X-Profile header)
+        """
+        return requested or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    @asynccontextmanager
+    async def trace(
+        self, endpoint: str, params: Dict[str, Any], profile: bool = False
+    ) -> AsyncIterator[RequestTrace]:
+        """Trace a request; keep the trace if profiled or slow
+
+        Args:
+            endpoint: Request path being traced
+            params: Request parameters worth recording
+            profile: Run the detailed profiler
+
+        Yields:
+            The RequestTrace (its id can be returned to the client)
+        """
+        trace = RequestTrace(endpoint, params, self.backend if profile else None)
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            try:
+                _current_trace.reset(token)
+            except ValueError:
+                # Closed from another Context: a streamed body abandoned on a
+                # client disconnect is finalized by the loop's asyncgen hook.
+                # Nothing to restore there; the bookkeeping below still runs.
+                pass
+            trace.finish()
+            self.requests += 1
+            if trace.first_audio_ms is not None:
+                self.stream_stats.append((trace.first_audio_ms, trace.realtime_factor() or 0.0))
+            slow = 0 < self.slow_request_ms <= trace.total_ms
+            if profile or slow:
+                trace.kept = True
+                self.traces.append(trace)
+                self.kept += 1
+            if slow:
+                logger.warning(
+                    f"Slow request {trace.id} on {endpoint}: {trace.total_ms:.0f}ms "
+                    f"({', '.join(f'{k}={v:.0f}ms' for k, v in trace.spans.items())})"
+                )
+
+    def get(self, trace_id: str) -> Optional[RequestTrace]:
+        """Look up a stored trace by id"""
+        for trace in self.traces:
+            if trace.id == trace_id:
+                return trace
+        return None
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Summaries of stored traces, newest first"""
+        return [trace.summary() for trace in reversed(self.traces)]
+
+    def clear(self) -> int:
+        """Drop all stored traces
+
+        Returns:
+            Number of traces removed
+        """
+        count = len(self.traces)
+        self.traces.clear()
+        return count
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Profiler configuration and counters"""
+        return {
+            "backend": self.backend,
+            "sample_rate": self.sample_rate,
+            "slow_request_ms": self.slow_request_ms,
+            "buffer_size": self.traces.maxlen,
+            "stored": len(self.traces),
+            "requests_traced": self.requests,
+            "traces_kept": self.kept,
+            "streaming": self.streaming_snapshot(),
+        }
+
+    def streaming_snapshot(self) -> Dict[str, Any]:
+        """Time-to-first-audio and throughput over recent streamed requests"""
+        if not self.stream_stats:
+            return {"requests": 0}
+        first_audio = sorted(ms for ms, _ in self.stream_stats)
+        return {
+            "requests": len(first_audio),
+            "first_audio_ms_p50": round(first_audio[len(first_audio) // 2], 2),
+            "first_audio_ms_p95": round(first_audio[math.ceil(0.95 * len(first_audio)) - 1], 2),
+            "realtime_factor_mean": round(
+                sum(rtf for _, rtf in self.stream_stats) / len(self.stream_stats), 3
+            ),
+        }
@@ -0,0 +1,178 @@
+"""Memory budget enforcement and idle unload for Pattern TTS Service"""
+
+import asyncio
+import gc
+import time
+from typing import Any, Dict, List, Tuple
+
+import psutil
+import torch
+from loguru import logger
+
+from ..core.config import settings
+from ..services.model_manager import DEFAULT_LANG_CODE, ModelManager
+
+MB = 1024 * 1024
+
+
+class ResourceManager:
+    """Keeps model, pipeline and voice residency within a memory budget
+
+    Periodically compares process RSS (and CUDA allocated memory) against
+    the configured budgets. Under pressure it evicts the least recently used
+    voice packs first, then non-default language pipelines. Optionally
+    unloads the whole model after an idle timeout; ModelManager reloads it
+    lazily on the next request.
+    """
+
+    def __init__(self, model_manager: ModelManager):
+        """Initialize resource manager
+
+        Args:
+            model_manager: ModelManager whose components are tracked
+        """
+        self.model_manager = model_manager
+        self.memory_budget_mb = settings.memory_budget_mb
+        self.vram_budget_mb = settings.vram_budget_mb
+        self.idle_unload_s = settings.model_idle_unload_s
+        self.check_interval_s = settings.resource_check_interval_s
+
+        self._process = psutil.Process()
+        self.evicted_voices = 0
+        self.evicted_pipelines = 0
+        self.idle_unloads = 0
+
+    def rss_mb(self) -> float:
+        """Resident set size of this process in MB"""
+        return self._process.memory_info().rss / MB
+
+    def vram_mb(self) -> float:
+        """CUDA memory allocated by this process in MB (0 when not on CUDA)"""
+        if self.model_manager.device != "cuda" or not torch.cuda.is_available():
+            return 0.0
+        return torch.cuda.memory_allocated() / MB
+
+    def _overage_mb(self) -> float:
+        """How far the process is over its tightest budget, in MB"""
+        overage = 0.0
+        if self.memory_budget_mb > 0:
+            overage = max(overage, self.rss_mb() - self.memory_budget_mb)
+        if self.vram_budget_mb > 0:
+            overage = max(overage, self.vram_mb() - self.vram_budget_mb)
+        return overage
+
+    def _eviction_candidates(self) -> List[Tuple[str, str]]:
+        """Evictable components in eviction order: LRU voices, then LRU pipelines"""
+        protected_voice = None
+        if self.model_manager.voice_manager is not None:
+            protected_voice = self.model_manager.voice_manager.get_default_voice()
+
+        candidates = [
+            ("voice", voice)
+            for voice in self.model_manager.loaded_voices()
+            if voice != protected_voice
+        ]
+        candidates.extend(
+            ("pipeline", lang_code)
+            for lang_code in self.model_manager.loaded_lang_codes()
+            if lang_code != DEFAULT_LANG_CODE
+        )
+        return candidates
+
+    def enforce_budget(self) -> int:
+        """Evict components until the estimated usage fits the budget
+
+        RSS rarely shrinks immediately after freeing, so eviction stops once
+        the tracked size of evicted components covers the overage.
+
+        Returns:
+            Number of bytes released (estimated)
+        """
+        overage_bytes = self._overage_mb() * MB
+        if overage_bytes <= 0:
+            return 0
+
+        released = 0
+        for kind, key in self._eviction_candidates():
+            if released >= overage_bytes:
+                break
+            # A component already evicted elsewhere (or in use) releases nothing
+            if kind == "voice":
+                freed = self.model_manager.evict_voice(key)
+                self.evicted_voices += freed > 0
+            else:
+                freed = self.model_manager.evict_pipeline(key)
+                self.evicted_pipelines += freed > 0
+            released += freed
+
+        gc.collect()
+        if self.model_manager.device == "cuda" and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+        logger.info(
+            f"Memory budget exceeded by {overage_bytes / MB:.0f}MB, "
+            f"released ~{released / MB:.1f}MB"
+        )
+        return released
+
+    def check_idle(self) -> bool:
+        """Unload the model if it has been idle longer than the timeout
+
+        Returns:
+            True if the model was unloaded
+        """
+        mm = self.model_manager
+        if self.idle_unload_s <= 0 or not mm.is_ready() or mm.active_requests > 0:
+            return False
+        idle_s = time.monotonic() - mm.last_used
+        if idle_s < self.idle_unload_s:
+            return False
+
+        logger.info(f"Model idle for {idle_s:.0f}s, unloading")
+        mm.unload(idle=True)
+        gc.collect()
+        self.idle_unloads += 1
+        return True
+
+    async def run(self) -> None:
+        """Periodic budget and idle checks (run as a background task)"""
+        if self.check_interval_s <= 0:
+            return
+        if self.memory_budget_mb <= 0 and self.vram_budget_mb <= 0 and self.idle_unload_s <= 0:
+            return
+        while True:
+            await asyncio.sleep(self.check_interval_s)
+            try:
+                if not self.check_idle():
+                    self.enforce_budget()
+            except Exception as e:
+                logger.error(f"Resource check failed: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current residency for the readiness endpoint
+
+        Returns:
+            Dict with memory usage, budgets and resident components
+        """
+        mm = self.model_manager
+        return {
+            "model_loaded": mm.is_ready(),
+            "idle_unloaded": mm.idle_unloaded,
+            "active_requests": mm.active_requests,
+            "idle_seconds": round(time.monotonic() - mm.last_used, 1),
+            "rss_mb": round(self.rss_mb(), 1),
+            "vram_mb": round(self.vram_mb(), 1),
+            "memory_budget_mb": self.memory_budget_mb,
+            "vram_budget_mb": self.vram_budget_mb,
+            "pipelines": mm.loaded_lang_codes(),
+            "voices": mm.loaded_voices(),
+            "threads": mm.thread_info(),
+            "components_mb": {
+                name: round(size / MB, 2) for name, size in mm.residency().items()
+            },
+            "evictions": {
+                "voices": self.evicted_voices,
+                "pipelines": self.evicted_pipelines,
+                "idle_unloads": self.idle_unloads,
+            },
+        }
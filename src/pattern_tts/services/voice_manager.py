@@ -1,20 +1,170 @@
 """Voice metadata management and validation for Pattern TTS Service"""
 
-from typing import Dict, List, Optional
+import asyncio
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 from loguru import logger
 
+from ..core.config import settings
+from ..utils.precomputed_json import PrecomputedJSON
+
+
+# Kokoro voice IDs encode language and gender in their prefix,
+# e.g. "af_heart" -> American English, female
+LANG_CODES: Dict[str, str] = {
+    "a": "en-us",
+    "b": "en-gb",
+    "e": "es",
+    "f": "fr-fr",
+    "h": "hi",
+    "i": "it",
+    "j": "ja",
+    "p": "pt-br",
+    "z": "zh",
+}
+
+GENDER_CODES: Dict[str, str] = {
+    "f": "female",
+    "m": "male",
+}
+
+# OpenAI voice names -> Kokoro voice IDs
+OPENAI_VOICE_MAPPING: Dict[str, str] = {
+    "alloy": "af_sky",      # Female, clear
+    "echo": "am",           # Male
+    "fable": "af",          # Female
+    "onyx": "am_adam",      # Male, deep
+    "nova": "af_bella",     # Female, warm
+    "shimmer": "af_sarah"   # Female, bright
+}
+
+# Blended voice component: voice ID with an optional weight, e.g. "af_bella(2)"
+_BLEND_COMPONENT_RE = re.compile(r"([\w-]+)(?:\(([0-9]*\.?[0-9]+)\))?")
+
+# Metadata keys stored as VoiceRecord fields; other sidecar keys go to extra
+_RECORD_FIELDS = ("name", "lang", "lang_code", "gender", "style", "sample_rate", "description")
+
+# Listener signature: (added_voice_ids, removed_voice_ids)
+VoiceChangeListener = Callable[[List[str], List[str]], None]
+
+
+def parse_voice_blend(voice: str) -> Optional[List[Tuple[str, float]]]:
+    """Parse a blended voice spec such as "af_bella+af_sky" or "af_bella(2)+af_sky(1)"
+
+    Args:
+        voice: Voice spec; components are joined with "+", each with an
+            optional weight in parentheses (default 1)
+
+    Returns:
+        List of (voice ID, weight), or None if the spec is not a blend of
+        two or more well-formed components with positive total weight
+    """
+    if "+" not in voice:
+        return None
+    components = []
+    for part in voice.split("+"):
+        match = _BLEND_COMPONENT_RE.fullmatch(part.strip())
+        if match is None:
+            return None
+        components.append((match.group(1), float(match.group(2) or 1.0)))
+    if sum(weight for _, weight in components) <= 0:
+        return None
+    return components
+
+
+def canonical_voice_blend(blend: List[Tuple[str, float]]) -> str:
+    """Canonical spec of a parsed blend, identical for equivalent specs
+
+    Components are sorted by voice ID and weights rounded to 4 decimals,
+    after normalizing them to sum to 1 if settings.voice_weight_normalization
+    is set, so "af_sky+af_bella(1)" and "af_bella(0.5)+af_sky(0.5)" map to
+    the same spec. The result parses back to the blend it describes.
+
+    Args:
+        blend: Components from parse_voice_blend()
+
+    Returns:
+        Blend spec such as "af_bella(0.5000)+af_sky(0.5000)"
+    """
+    total = sum(weight for _, weight in blend) if settings.voice_weight_normalization else 1.0
+    return "+".join(f"{voice}({weight / total:.4f})" for voice, weight in sorted(blend))
+
+
+@dataclass(frozen=True, slots=True)
+class VoiceRecord:
+    """Immutable metadata for one registered voice"""
+
+    id: str
+    name: str
+    lang: str
+    lang_code: str
+    gender: str
+    sample_rate: int
+    description: str
+    style: Optional[str] = None
+    # Additional sidecar metadata keys (read-only)
+    extra: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+
+    @classmethod
+    def from_metadata(cls, voice_id: str, metadata: Dict[str, Any]) -> "VoiceRecord":
+        """Build a record from merged derived/builtin/sidecar metadata"""
+        return cls(
+            id=voice_id,
+            name=str(metadata["name"]),
+            lang=str(metadata["lang"]),
+            lang_code=str(metadata["lang_code"]),
+            gender=str(metadata["gender"]),
+            sample_rate=int(metadata["sample_rate"]),
+            description=str(metadata["description"]),
+            style=metadata.get("style"),
+            extra=MappingProxyType(
+                {k: v for k, v in metadata.items() if k not in _RECORD_FIELDS}
+            ),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Metadata as a new dict, including the voice ID"""
+        data = {
+            "id": self.id,
+            "name": self.name,
+            "lang": self.lang,
+            "lang_code": self.lang_code,
+            "gender": self.gender,
+            "sample_rate": self.sample_rate,
+            "description": self.description,
+        }
+        if self.style is not None:
+            data["style"] = self.style
+        data.update(self.extra)
+        return data
+
 
 class VoiceManager:
     """Manager for TTS voice metadata and validation
 
     Provides voice registry, validation, and metadata management
     for Kokoro TTS voices with OpenAI compatibility.
+
+    The registry is built by scanning ``settings.voices_path`` for ``*.pt``
+    voice packs. Metadata is derived from the voice ID prefix, enriched with
+    the curated entries below and an optional sidecar metadata file, and
+    indexed by language and gender. ``watch()`` re-scans periodically and
+    notifies listeners so new voice packs are picked up without a restart.
+
+    Voices are stored as frozen VoiceRecords. The /v1/audio/voices body
+    (with its ETag) and the voice ID list used in error messages are built
+    once per registry change, so polling the list endpoint costs no
+    serialization.
     """
 
-    # Voice registry with metadata (expandable)
+    # Curated metadata for well-known voices (merged over derived metadata)
     # Format: voice_id -> metadata dict
-    VOICES: Dict[str, Dict[str, any]] = {
+    BUILTIN_METADATA: Dict[str, Dict[str, any]] = {
         # Female voices
         "af_sky": {
             "name": "Sky (Female)",
@@ -114,34 +264,231 @@ class VoiceManager:
         },
     }
 
-    # Default voice for the system
+    # Fallback default voice when settings.default_voice is not registered
     DEFAULT_VOICE: str = "af_sky"
 
-    def __init__(self):
-        """Initialize voice manager"""
-        logger.debug(f"VoiceManager initialized with {len(self.VOICES)} voices")
+    def __init__(self, voices_path: Optional[Path] = None):
+        """Initialize voice manager and scan the voices directory
+
+        Args:
+            voices_path: Directory containing *.pt voice packs
+                (defaults to settings.voices_path)
+        """
+        self.voices_path = Path(voices_path) if voices_path else settings.voices_path
+        self.metadata_path = self.voices_path / settings.voice_metadata_file
+
+        self._voices: Dict[str, VoiceRecord] = {}
+        self._paths: Dict[str, Path] = {}
+        self._by_lang: Dict[str, Tuple[str, ...]] = {}
+        self._by_gender: Dict[str, Tuple[str, ...]] = {}
+        self._signature: Optional[tuple] = None
+        self._listeners: List[VoiceChangeListener] = []
+        self._voices_json: PrecomputedJSON = PrecomputedJSON.serialize({})
+        self._voice_ids_text: str = ""
+
+        self.reload()
+        logger.debug(
+            f"VoiceManager initialized with {len(self._voices)} voices from {self.voices_path}"
+        )
+
+    def _scan_signature(self) -> tuple:
+        """Cheap fingerprint of the voices directory (names, sizes, mtimes)"""
+        entries = []
+        candidates = [self.metadata_path]
+        if self.voices_path.is_dir():
+            candidates.extend(self.voices_path.glob("*.pt"))
+        for path in candidates:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((path.name, stat.st_size, stat.st_mtime_ns))
+        return tuple(sorted(entries))
+
+    def _load_sidecar_metadata(self) -> Dict[str, Dict[str, any]]:
+        """Load optional sidecar metadata file (voice_id -> metadata)"""
+        if not self.metadata_path.is_file():
+            return {}
+        try:
+            with open(self.metadata_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring invalid voice metadata file {self.metadata_path}: {e}")
+            return {}
+        if not isinstance(data, dict):
+            logger.warning(f"Voice metadata file {self.metadata_path} must contain an object")
+            return {}
+        return {k: v for k, v in data.items() if isinstance(v, dict)}
+
+    @staticmethod
+    def _derive_metadata(voice_id: str) -> Dict[str, any]:
+        """Derive basic metadata from a Kokoro voice ID (e.g. 'bm_george')"""
+        prefix, _, name = voice_id.partition("_")
+        lang_code = prefix[0] if prefix else "a"
+        gender = GENDER_CODES.get(prefix[1:2], "unknown")
+        lang = LANG_CODES.get(lang_code, "unknown")
+        display = name.replace("_", " ").title() if name else voice_id
+        return {
+            "name": f"{display} ({gender.capitalize()})",
+            "lang": lang,
+            "lang_code": lang_code,
+            "gender": gender,
+            "sample_rate": settings.sample_rate,
+            "description": f"{display} voice ({lang})",
+        }
+
+    def reload(self, force: bool = False) -> bool:
+        """Rescan the voices directory and rebuild the registry if it changed
+
+        Args:
+            force: Rebuild even if the directory fingerprint is unchanged
+
+        Returns:
+            True if the registry changed, False otherwise
+        """
+        signature = self._scan_signature()
+        if not force and signature == self._signature:
+            return False
+
+        sidecar = self._load_sidecar_metadata()
+        voices: Dict[str, VoiceRecord] = {}
+        paths: Dict[str, Path] = {}
+        if self.voices_path.is_dir():
+            for path in sorted(self.voices_path.glob("*.pt")):
+                voice_id = path.stem
+                metadata = self._derive_metadata(voice_id)
+                metadata.update(self.BUILTIN_METADATA.get(voice_id, {}))
+                metadata.update(sidecar.get(voice_id, {}))
+                try:
+                    voices[voice_id] = VoiceRecord.from_metadata(voice_id, metadata)
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"Skipping voice '{voice_id}' with invalid metadata: {e}")
+                    continue
+                paths[voice_id] = path
+        else:
+            logger.warning(f"Voices directory not found: {self.voices_path}")
+
+        by_lang: Dict[str, List[str]] = {}
+        by_gender: Dict[str, List[str]] = {}
+        for voice_id, record in voices.items():
+            by_lang.setdefault(record.lang.lower(), []).append(voice_id)
+            by_gender.setdefault(record.gender.lower(), []).append(voice_id)
+        voices_json = self._build_voices_json(voices)
+
+        previous = set(self._voices)
+        current = set(voices)
+        # Pack files rewritten in place show up as a new size or mtime
+        old_stats = {name: stat for name, *stat in self._signature or ()}
+        new_stats = {name: stat for name, *stat in signature}
+        changed = {
+            voice_id
+            for voice_id in previous & current
+            if self._paths.get(voice_id) != paths[voice_id]
+            or self._voices.get(voice_id) != voices[voice_id]
+            or old_stats.get(paths[voice_id].name) != new_stats.get(paths[voice_id].name)
+        }
+
+        # Swap in the new registry in one step so readers never see a partial state
+        self._voices, self._paths = voices, paths
+        self._by_lang = {k: tuple(v) for k, v in by_lang.items()}
+        self._by_gender = {k: tuple(v) for k, v in by_gender.items()}
+        self._voices_json = voices_json
+        self._voice_ids_text = ", ".join(voices)
+        self._signature = signature
+
+        # Voices whose pack file changed are reported as removed + added
+        added = sorted((current - previous) | changed)
+        removed = sorted((previous - current) | changed)
+        if self._listeners and (added or removed):
+            logger.info(f"Voice registry changed: +{len(added)} -{len(removed)} voice packs")
+            for listener in self._listeners:
+                try:
+                    listener(added, removed)
+                except Exception as e:
+                    logger.error(f"Voice change listener failed: {e}")
+        return True
+
+    @staticmethod
+    def _build_voices_json(voices: Dict[str, VoiceRecord]) -> PrecomputedJSON:
+        """Serialize the /v1/audio/voices body: OpenAI mappings plus native voices"""
+        native = [record.to_dict() for record in voices.values()]
+        openai = []
+        for openai_id, kokoro_id in OPENAI_VOICE_MAPPING.items():
+            record = voices.get(kokoro_id)
+            metadata = record.to_dict() if record else None
+            if metadata:
+                del metadata["id"]
+            openai.append({
+                "id": openai_id,
+                "name": f"{openai_id.capitalize()} (OpenAI)",
+                "kokoro_voice": kokoro_id,
+                "metadata": metadata,
+            })
+        return PrecomputedJSON.serialize({"openai_compatible": openai, "kokoro_native": native})
+
+    def add_listener(self, listener: VoiceChangeListener) -> None:
+        """Register a callback invoked with (added, removed) voice IDs on reload"""
+        self._listeners.append(listener)
+
+    async def watch(self, interval: Optional[float] = None) -> None:
+        """Periodically rescan the voices directory (run as a background task)
+
+        Args:
+            interval: Seconds between scans (defaults to settings.voice_reload_interval_s)
+        """
+        interval = interval if interval is not None else settings.voice_reload_interval_s
+        if interval <= 0:
+            return
+        logger.info(f"Watching {self.voices_path} for voice pack changes every {interval}s")
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.reload)
+            except Exception as e:
+                logger.error(f"Voice registry reload failed: {e}")
 
     def validate_voice(self, voice: str) -> bool:
         """Check if voice ID is valid
 
+        Blends are valid if every component voice is registered.
+
         Args:
-            voice: Voice ID to validate
+            voice: Voice ID or blend spec to validate
 
         Returns:
-            True if voice exists in registry, False otherwise
+            True if the voice (or every blend component) exists in the registry
         """
-        return voice in self.VOICES
+        if voice in self._voices:
+            return True
+        blend = parse_voice_blend(voice)
+        return blend is not None and all(v in self._voices for v, _ in blend)
 
-    def get_voice_info(self, voice: str) -> Optional[Dict[str, any]]:
+    def primary_voice(self, voice: str) -> str:
+        """The voice whose metadata applies to a voice spec (a blend's first component)"""
+        blend = parse_voice_blend(voice)
+        return blend[0][0] if blend else voice
+
+    def get_voice_info(self, voice: str) -> Optional[VoiceRecord]:
         """Get metadata for specific voice
 
         Args:
             voice: Voice ID to retrieve info for
 
         Returns:
-            Dictionary with voice metadata, or None if voice not found
+            VoiceRecord, or None if voice not found
+        """
+        return self._voices.get(voice)
+
+    def get_voice_path(self, voice: str) -> Optional[Path]:
+        """Get the voice pack file for a specific voice
+
+        Args:
+            voice: Voice ID
+
+        Returns:
+            Path to the .pt voice pack, or None if voice not found
         """
-        return self.VOICES.get(voice)
+        return self._paths.get(voice)
 
     def list_voices(self) -> List[Dict[str, any]]:
         """Return all available voices with metadata
@@ -149,18 +496,29 @@ class VoiceManager:
         Returns:
             List of dictionaries containing voice ID and metadata
         """
-        return [
-            {"id": voice_id, **metadata}
-            for voice_id, metadata in self.VOICES.items()
-        ]
+        return [record.to_dict() for record in self._voices.values()]
+
+    @property
+    def voices_json(self) -> PrecomputedJSON:
+        """Pre-serialized /v1/audio/voices body and ETag (rebuilt on registry change)"""
+        return self._voices_json
+
+    @property
+    def voice_ids_text(self) -> str:
+        """Comma-separated voice IDs for error messages (rebuilt on registry change)"""
+        return self._voice_ids_text
 
     def get_default_voice(self) -> str:
         """Return default voice ID
 
         Returns:
-            Default voice ID (af_sky)
+            settings.default_voice if registered, else DEFAULT_VOICE
+            or the first registered voice
         """
-        return self.DEFAULT_VOICE
+        for voice in (settings.default_voice, self.DEFAULT_VOICE):
+            if voice in self._voices:
+                return voice
+        return next(iter(self._voices), self.DEFAULT_VOICE)
 
     def get_voice_ids(self) -> List[str]:
         """Get list of all available voice IDs
@@ -168,7 +526,7 @@ class VoiceManager:
         Returns:
             List of voice ID strings
         """
-        return list(self.VOICES.keys())
+        return list(self._voices.keys())
 
     def get_voices_by_gender(self, gender: str) -> List[str]:
         """Get voices filtered by gender
@@ -179,11 +537,7 @@ class VoiceManager:
         Returns:
             List of voice IDs matching the gender
         """
-        return [
-            voice_id
-            for voice_id, metadata in self.VOICES.items()
-            if metadata.get("gender") == gender.lower()
-        ]
+        return list(self._by_gender.get(gender.lower(), ()))
 
     def get_voices_by_language(self, lang: str) -> List[str]:
         """Get voices filtered by language
@@ -194,11 +548,7 @@ class VoiceManager:
         Returns:
             List of voice IDs matching the language
         """
-        return [
-            voice_id
-            for voice_id, metadata in self.VOICES.items()
-            if metadata.get("lang") == lang.lower()
-        ]
+        return list(self._by_lang.get(lang.lower(), ()))
 
     def get_sample_rate(self, voice: str) -> int:
         """Get sample rate for a specific voice
@@ -207,7 +557,7 @@ class VoiceManager:
             voice: Voice ID
 
         Returns:
-            Sample rate in Hz, or 24000 as default
+            Sample rate in Hz, or settings.sample_rate as default
         """
-        voice_info = self.get_voice_info(voice)
-        return voice_info.get("sample_rate", 24000) if voice_info else 24000
+        voice_info = self.get_voice_info(self.primary_voice(voice))
+        return voice_info.sample_rate if voice_info else settings.sample_rate
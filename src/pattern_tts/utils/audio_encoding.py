@@ -0,0 +1,453 @@
+"""Output audio negotiation: resampling, channel layout and encoding
+
+Synthesized audio is resampled once, in process, to the requested output
+rate with a polyphase filter (scipy.signal.resample_poly) whose FIR design
+is cached per rate ratio. Encoders then run at the output rate, so
+narrowband targets (8 kHz telephony) never pay for 24 kHz encoding, and
+uncompressed formats (wav, pcm, mulaw) skip ffmpeg entirely.
+"""
+
+import subprocess
+import threading
+import wave
+from functools import lru_cache
+from io import BytesIO
+from math import gcd
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+
+class OutputFormat(NamedTuple):
+    """How a response_format is encoded and served"""
+
+    media_type: str
+    # ffmpeg muxer and codec for compressed formats (None = encoded in numpy)
+    ffmpeg_format: Optional[str]
+    codec: Optional[str]
+    # Allowed output sample rates (None = any rate in MIN/MAX range)
+    sample_rates: Optional[frozenset]
+    # Whether a bitrate applies
+    lossy: bool
+    # Whether the format can be written progressively (streaming)
+    streamable: bool
+
+
+MP3_SAMPLE_RATES = frozenset({8000, 11025, 12000, 16000, 22050, 24000, 32000, 44100, 48000})
+OPUS_SAMPLE_RATES = frozenset({8000, 12000, 16000, 24000, 48000})
+
+FORMATS: Dict[str, OutputFormat] = {
+    "mp3": OutputFormat("audio/mpeg", "mp3", None, MP3_SAMPLE_RATES, True, True),
+    "opus": OutputFormat("audio/ogg", "opus", "libopus", OPUS_SAMPLE_RATES, True, True),
+    "aac": OutputFormat("audio/aac", "adts", "aac", None, True, True),
+    "flac": OutputFormat("audio/flac", "flac", None, None, False, False),
+    "wav": OutputFormat("audio/wav", None, None, None, False, False),
+    # Raw 16-bit little-endian PCM, interleaved if stereo
+    "pcm": OutputFormat("audio/L16", None, None, None, False, True),
+    # Raw G.711 mu-law (telephony), interleaved if stereo
+    "mulaw": OutputFormat("audio/basic", None, None, None, False, True),
+}
+
+MIN_SAMPLE_RATE = 8000
+MAX_SAMPLE_RATE = 48000
+
+# ffmpeg options for streams: start encoding without first buffering 5 s
+# of input to analyze it (the raw input format is given), hand each packet
+# to the pipe as soon as it is muxed, and cut Ogg pages every 100 ms
+# instead of every second
+_STREAM_INPUT_PARAMETERS = ["-probesize", "32", "-analyzeduration", "0"]
+_STREAM_PARAMETERS = ["-flush_packets", "1"]
+_STREAM_FORMAT_PARAMETERS: Dict[str, List[str]] = {
+    "opus": ["-page_duration", "100000"],
+}
+
+# G.711 mu-law constants (on 14-bit magnitudes)
+_MULAW_BIAS = 0x21
+_MULAW_CLIP = 8159
+
+
+def validate_output(
+    response_format: str, sample_rate: int, channels: int, stream: bool = False
+) -> None:
+    """Check that a format supports the requested sample rate and channels
+
+    Args:
+        response_format: Output format name (key of FORMATS)
+        sample_rate: Output sample rate in Hz
+        channels: 1 (mono) or 2 (stereo)
+        stream: The response is streamed (see StreamEncoder)
+
+    Raises:
+        ValueError: If the combination is not supported
+    """
+    output = FORMATS.get(response_format)
+    if output is None:
+        raise ValueError(
+            f"Unsupported response_format: {response_format}. "
+            f"Supported: {', '.join(FORMATS)}"
+        )
+    if stream and not output.streamable:
+        streamable = ", ".join(name for name, fmt in FORMATS.items() if fmt.streamable)
+        raise ValueError(
+            f"response_format {response_format} cannot be streamed. Streamable: {streamable}"
+        )
+    if channels not in (1, 2):
+        raise ValueError(f"Unsupported channels: {channels} (expected 1 or 2)")
+    if output.sample_rates is not None:
+        if sample_rate not in output.sample_rates:
+            rates = ", ".join(str(r) for r in sorted(output.sample_rates))
+            raise ValueError(
+                f"Unsupported sample_rate for {response_format}: {sample_rate}. "
+                f"Supported: {rates}"
+            )
+    elif not MIN_SAMPLE_RATE <= sample_rate <= MAX_SAMPLE_RATE:
+        raise ValueError(
+            f"Unsupported sample_rate: {sample_rate} "
+            f"(expected {MIN_SAMPLE_RATE}-{MAX_SAMPLE_RATE})"
+        )
+
+
+def default_bitrate(sample_rate: int, channels: int = 1) -> int:
+    """Default lossy bitrate in kbps: 1 kbps per kHz per channel, at least 16
+
+    Matches the previous fixed 24k for 24 kHz mono, and scales down for
+    narrowband output and up for 48 kHz / stereo.
+    """
+    return max(16, sample_rate // 1000) * channels
+
+
+@lru_cache(maxsize=32)
+def _resample_filter(up: int, down: int) -> np.ndarray:
+    """Anti-aliasing FIR filter for an up/down ratio (same design as resample_poly)
+
+    Designed once per ratio instead of per call, and stored as float32 so
+    the polyphase filter runs in float32 like the audio (~20% faster than
+    resample_poly's float64 default). resample_poly copies the coefficients,
+    so the cached array is never modified.
+    """
+    from scipy.signal import firwin
+
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    taps = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+    return taps.astype(np.float32)
+
+
+def resample(audio: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """Polyphase resample float32 mono audio
+
+    Args:
+        audio: Float32 samples
+        src_rate: Input sample rate in Hz
+        dst_rate: Output sample rate in Hz
+
+    Returns:
+        Float32 samples at dst_rate (the input itself if the rates match)
+    """
+    if src_rate == dst_rate or audio.size == 0:
+        return audio
+
+    # scipy.signal is slow to import; keep it off the app startup path
+    from scipy.signal import resample_poly
+
+    divisor = gcd(src_rate, dst_rate)
+    up, down = dst_rate // divisor, src_rate // divisor
+    audio = audio.astype(np.float32, copy=False)
+    return resample_poly(audio, up, down, window=_resample_filter(up, down))
+
+
+def to_int16(audio: np.ndarray, channels: int = 1) -> np.ndarray:
+    """Convert float audio in [-1, 1] to int16, interleaving for stereo
+
+    Returns:
+        int16 array of shape (samples,) for mono or (samples, 2) for stereo
+    """
+    audio_int16 = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+    if channels == 2:
+        audio_int16 = np.repeat(audio_int16[:, None], 2, axis=1)
+    return audio_int16
+
+
+def mulaw_encode(samples: np.ndarray) -> bytes:
+    """Encode int16 samples as G.711 mu-law bytes (same output as audioop.lin2ulaw)"""
+    x = samples.astype(np.int32).ravel() >> 2
+    mask = np.where(x < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(x), _MULAW_CLIP) + _MULAW_BIAS
+    segment = np.maximum(np.floor(np.log2(magnitude)).astype(np.int32) - 5, 0)
+    mantissa = (magnitude >> (segment + 1)) & 0x0F
+    encoded = np.where(segment >= 8, 0x7F, (segment << 4) | mantissa) ^ mask
+    return encoded.astype(np.uint8).tobytes()
+
+
+def encode_audio(
+    audio: np.ndarray,
+    src_rate: int,
+    response_format: str = "mp3",
+    sample_rate: Optional[int] = None,
+    bitrate: Optional[int] = None,
+    channels: int = 1,
+) -> bytes:
+    """Resample, lay out channels and encode synthesized audio
+
+    Args:
+        audio: Mono float32 samples in [-1, 1]
+        src_rate: Sample rate of audio in Hz
+        response_format: Output format name (key of FORMATS)
+        sample_rate: Output sample rate in Hz (default src_rate)
+        bitrate: Lossy bitrate in kbps (default from default_bitrate())
+        channels: 1 (mono) or 2 (stereo, duplicated mono)
+
+    Returns:
+        Encoded audio bytes
+
+    Raises:
+        ValueError: If the format, sample rate or channels are unsupported
+        RuntimeError: If encoding fails
+    """
+    sample_rate = sample_rate or src_rate
+    validate_output(response_format, sample_rate, channels)
+    output = FORMATS[response_format]
+
+    samples = to_int16(resample(audio, src_rate, sample_rate), channels)
+
+    if response_format == "pcm":
+        return samples.astype("<i2").tobytes()
+    if response_format == "mulaw":
+        return mulaw_encode(samples)
+
+    try:
+        buffer = BytesIO()
+        if response_format == "wav":
+            with wave.open(buffer, "wb") as wav_file:
+                wav_file.setnchannels(channels)
+                wav_file.setsampwidth(2)
+                wav_file.setframerate(sample_rate)
+                wav_file.writeframes(samples.astype("<i2").tobytes())
+            return buffer.getvalue()
+
+        from pydub import AudioSegment
+
+        audio_segment = AudioSegment(
+            samples.tobytes(),
+            frame_rate=sample_rate,
+            sample_width=2,
+            channels=channels
+        )
+        export_kwargs = {"format": output.ffmpeg_format}
+        if output.codec:
+            export_kwargs["codec"] = output.codec
+        if output.lossy:
+            export_kwargs["bitrate"] = f"{bitrate or default_bitrate(sample_rate, channels)}k"
+        audio_segment.export(buffer, **export_kwargs)
+        return buffer.getvalue()
+
+    except Exception as e:
+        raise RuntimeError(f"Failed to encode audio as {response_format}: {e}")
+
+
+def _ffmpeg_command(
+    response_format: str,
+    sample_rate: int,
+    bitrate: Optional[int],
+    channels: int,
+    target: str,
+    stream: bool = False,
+) -> List[str]:
+    """ffmpeg command encoding raw s16le PCM from stdin into target"""
+    # Same ffmpeg binary pydub is configured to use
+    from pydub import AudioSegment
+
+    output = FORMATS[response_format]
+    command = [AudioSegment.converter, "-v", "error", "-y"]
+    if stream:
+        command += _STREAM_INPUT_PARAMETERS
+    command += ["-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels), "-i", "pipe:0"]
+    if output.codec:
+        command += ["-c:a", output.codec]
+    if output.lossy:
+        command += ["-b:a", f"{bitrate or default_bitrate(sample_rate, channels)}k"]
+    if stream:
+        command += _STREAM_PARAMETERS + _STREAM_FORMAT_PARAMETERS.get(response_format, [])
+    return command + ["-f", output.ffmpeg_format, target]
+
+
+class StreamEncoder:
+    """Encode the chunks of one streamed response as a single continuous stream
+
+    Raw formats (pcm, mulaw) are converted in process. Compressed formats
+    are encoded by one ffmpeg process for the whole response, fed raw PCM on
+    stdin as in encode_file, so the stream has one header and no priming
+    gap at chunk joins. Its output is read on a thread and handed to
+    on_output as soon as ffmpeg writes it; only the encoder's last partial
+    frame of a chunk waits for the next chunk (or close()).
+    """
+
+    def __init__(
+        self,
+        on_output: Callable[[bytes], None],
+        src_rate: int,
+        response_format: str = "mp3",
+        sample_rate: Optional[int] = None,
+        bitrate: Optional[int] = None,
+        channels: int = 1,
+    ):
+        """Validate the output and start the encoder
+
+        Args:
+            on_output: Called with each piece of encoded output, in order
+                (on the writing thread for raw formats, else a reader thread)
+            src_rate: Sample rate of the chunks in Hz
+            response_format, sample_rate, bitrate, channels: As for encode_audio
+
+        Raises:
+            ValueError: If the format cannot be streamed or the sample rate or
+                channels are unsupported
+        """
+        self.src_rate = src_rate
+        self.sample_rate = sample_rate or src_rate
+        validate_output(response_format, self.sample_rate, channels, stream=True)
+        self.response_format = response_format
+        self.channels = channels
+        self._on_output = on_output
+        self._process: Optional[subprocess.Popen] = None
+        self._reader: Optional[threading.Thread] = None
+
+        if FORMATS[response_format].ffmpeg_format is not None:
+            self._process = subprocess.Popen(
+                _ffmpeg_command(
+                    response_format, self.sample_rate, bitrate, channels, "pipe:1", stream=True
+                ),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=0,
+            )
+            self._reader = threading.Thread(
+                target=self._read_output, name="stream-encoder", daemon=True
+            )
+            self._reader.start()
+
+    def _read_output(self) -> None:
+        while data := self._process.stdout.read(65536):
+            self._on_output(data)
+
+    def write(self, audio: np.ndarray) -> None:
+        """Encode the next chunk (blocks while the encoder catches up)
+
+        Args:
+            audio: Mono float32 samples in [-1, 1] at src_rate
+
+        Raises:
+            RuntimeError: If the encoder failed
+        """
+        samples = to_int16(resample(audio, self.src_rate, self.sample_rate), self.channels)
+        if self._process is None:
+            self._on_output(
+                samples.astype("<i2").tobytes()
+                if self.response_format == "pcm"
+                else mulaw_encode(samples)
+            )
+            return
+        try:
+            self._process.stdin.write(samples.astype("<i2").tobytes())
+        except (BrokenPipeError, ValueError):
+            # The encoder exited (or was aborted); close() reports why
+            self.close()
+            raise RuntimeError(f"Failed to encode audio as {self.response_format}")
+
+    def close(self) -> None:
+        """End the stream: flush the encoder and deliver its remaining output
+
+        Raises:
+            RuntimeError: If encoding failed
+        """
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        self._reader.join()
+        stderr = self._process.stderr.read().decode(errors="replace")
+        if self._process.wait() != 0:
+            raise RuntimeError(
+                f"Failed to encode audio as {self.response_format}: {stderr.strip()}"
+            )
+
+    def abort(self) -> None:
+        """Stop the encoder without flushing (the stream was abandoned)"""
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
+
+
+def encode_file(
+    chunks: Iterable[np.ndarray],
+    src_rate: int,
+    path: Path,
+    response_format: str = "mp3",
+    sample_rate: Optional[int] = None,
+    bitrate: Optional[int] = None,
+    channels: int = 1,
+) -> None:
+    """Encode a sequence of audio chunks into one continuous file
+
+    Chunks are resampled and written one at a time, so memory stays bounded
+    by the largest chunk however long the result is. Compressed formats are
+    encoded by a single ffmpeg process fed raw PCM on stdin, so the file has
+    one header and no gaps or priming delays between chunks. Each chunk is
+    resampled on its own; synthesized segments start and end in silence, so
+    the filter edges are inaudible.
+
+    Args:
+        chunks: Mono float32 chunks in [-1, 1], in playback order
+        src_rate: Sample rate of the chunks in Hz
+        path: Output file (overwritten)
+        response_format, sample_rate, bitrate, channels: As for encode_audio
+
+    Raises:
+        ValueError: If the format, sample rate or channels are unsupported
+        RuntimeError: If encoding fails
+    """
+    sample_rate = sample_rate or src_rate
+    validate_output(response_format, sample_rate, channels)
+
+    def pcm_chunks() -> Iterable[np.ndarray]:
+        for chunk in chunks:
+            yield to_int16(resample(chunk, src_rate, sample_rate), channels)
+
+    if response_format in ("pcm", "mulaw"):
+        with open(path, "wb") as f:
+            for samples in pcm_chunks():
+                f.write(
+                    samples.astype("<i2").tobytes()
+                    if response_format == "pcm"
+                    else mulaw_encode(samples)
+                )
+        return
+
+    if response_format == "wav":
+        with wave.open(str(path), "wb") as wav_file:
+            wav_file.setnchannels(channels)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(sample_rate)
+            for samples in pcm_chunks():
+                wav_file.writeframes(samples.astype("<i2").tobytes())
+        return
+
+    command = _ffmpeg_command(response_format, sample_rate, bitrate, channels, str(path))
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        for samples in pcm_chunks():
+            process.stdin.write(samples.astype("<i2").tobytes())
+        process.stdin.close()
+    except BrokenPipeError:
+        pass
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    stderr = process.stderr.read().decode(errors="replace")
+    if process.wait() != 0:
+        raise RuntimeError(f"Failed to encode audio as {response_format}: {stderr.strip()}")
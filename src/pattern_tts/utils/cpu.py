@@ -0,0 +1,125 @@
+"""Container CPU limits and inference thread planning
+
+PyTorch sizes its intra-op pool from the host core count, not the
+container's CFS quota, so a pod limited to 4 CPUs on a 64-core node runs
+64 threads and gets throttled. These helpers read the effective CPU
+budget (cgroup quota and affinity mask) and split it across concurrent
+inference workers.
+"""
+
+import math
+import os
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+class ThreadPlan(NamedTuple):
+    """Thread configuration derived from the CPU budget"""
+
+    cpus: int
+    workers: int
+    intra_op_threads: int
+    inter_op_threads: int
+    # CPU ids assigned to each worker (empty when pinning is off)
+    worker_cpus: List[List[int]]
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_quota(root: Path = CGROUP_ROOT) -> Optional[float]:
+    """CPU limit from the cgroup CFS quota, in CPUs
+
+    Checks cgroup v2 (cpu.max) and then v1 (cpu.cfs_quota_us /
+    cpu.cfs_period_us).
+
+    Args:
+        root: cgroup filesystem mount point
+
+    Returns:
+        Quota in CPUs (e.g. 2.5), or None if unlimited or not in a cgroup
+    """
+    cpu_max = _read(root / "cpu.max")
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+
+    for v1_dir in ("cpu", "cpu,cpuacct", "cpuacct,cpu"):
+        quota = _read(root / v1_dir / "cpu.cfs_quota_us")
+        period = _read(root / v1_dir / "cpu.cfs_period_us")
+        if quota and period:
+            if int(quota) <= 0:
+                return None
+            return int(quota) / int(period)
+    return None
+
+
+def allowed_cpus() -> List[int]:
+    """CPU ids this process may run on (affinity mask / cpuset)"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def available_cpus() -> int:
+    """Number of CPUs the process can actually use
+
+    The smaller of the affinity mask and the CFS quota (rounded up, so a
+    1.5 CPU limit allows 2 threads that share the quota).
+    """
+    cpus = len(allowed_cpus())
+    quota = cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return max(1, cpus)
+
+
+def plan_threads(
+    workers: int,
+    intra_op_override: int = 0,
+    inter_op_override: int = 0,
+    pin: bool = False,
+) -> ThreadPlan:
+    """Split the CPU budget across concurrent inference workers
+
+    Each worker runs one request at a time, so the intra-op pool (shared,
+    process-wide) is sized to the worker's share of the budget. Kokoro's
+    graph is sequential, so one inter-op thread is enough.
+
+    Args:
+        workers: Concurrent inference workers (the concurrency limit)
+        intra_op_override: Intra-op threads (0 = derive from the budget)
+        inter_op_override: Inter-op threads (0 = 1)
+        pin: Assign each worker a disjoint slice of the allowed CPUs (only
+            when the affinity mask is no wider than the CPU quota)
+
+    Returns:
+        ThreadPlan
+    """
+    cpus = available_cpus()
+    workers = max(1, workers)
+    intra = intra_op_override or max(1, cpus // workers)
+    inter = inter_op_override or 1
+
+    worker_cpus: List[List[int]] = []
+    allowed = allowed_cpus()
+    # Pinning only helps with an exclusive cpuset (e.g. the kubelet static
+    # CPU manager); with a quota narrower than the mask, pods sharing the
+    # node would all pin to the same CPUs
+    if pin and len(allowed) <= cpus:
+        if len(allowed) >= workers:
+            share = len(allowed) // workers
+            worker_cpus = [allowed[i * share:(i + 1) * share] for i in range(workers)]
+        else:
+            # Fewer CPUs than workers: workers share CPUs round-robin
+            worker_cpus = [[allowed[i % len(allowed)]] for i in range(workers)]
+
+    return ThreadPlan(cpus, workers, intra, inter, worker_cpus)
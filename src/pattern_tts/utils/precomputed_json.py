@@ -0,0 +1,37 @@
+"""Pre-serialized JSON bodies with strong ETags for hot read-only endpoints"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class PrecomputedJSON:
+    """A JSON payload serialized once, with an ETag derived from its bytes"""
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def serialize(cls, payload: Any) -> "PrecomputedJSON":
+        """Serialize a payload the way Starlette's JSONResponse does
+
+        Responses are byte-identical to returning the payload from an
+        endpoint; the payload itself is not kept.
+        """
+        body = json.dumps(
+            payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+        ).encode("utf-8")
+        return cls(body, f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"')
+
+    def matches(self, if_none_match: str) -> bool:
+        """Whether an If-None-Match header value matches this body
+
+        Accepts "*", comma-separated lists and weak validators (W/"...").
+        """
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == self.etag:
+                return True
+        return False
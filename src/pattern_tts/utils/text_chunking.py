@@ -0,0 +1,120 @@
+"""Adaptive text segmentation for streamed synthesis
+
+KPipeline synthesizes one segment per forward pass, so the first audio of
+a streamed request waits for the whole first segment. The planner makes
+the first segment deliberately short (its leading clauses, at most a few
+words) and lets later segments grow geometrically toward the token
+budget, so time-to-first-audio stays low while long inputs still run in
+large, efficient forward passes.
+
+Segment sizes are estimated in characters: English phoneme strings are
+roughly as long as the text they come from, and the plan is computed
+before G2P.
+"""
+
+import re
+from typing import List
+
+# Split after clause punctuation followed by whitespace (keeps the punctuation)
+_CLAUSE_RE = re.compile(r"(?<=[.!?;:,—])\s+")
+
+# A paragraph's last segment shorter than this joins the one before it
+MIN_SEGMENT_CHARS = 32
+
+
+def _clauses(paragraph: str, max_chars: int) -> List[str]:
+    """Clauses of a paragraph; any longer than max_chars are split between words"""
+    clauses: List[str] = []
+    for clause in _CLAUSE_RE.split(paragraph.strip()):
+        while len(clause) > max_chars and " " in clause[1:max_chars + 1]:
+            cut = clause.rindex(" ", 1, max_chars + 1)
+            clauses.append(clause[:cut])
+            clause = clause[cut + 1:].lstrip()
+        if clause:
+            clauses.append(clause)
+    return clauses
+
+
+def _first_segment(clauses: List[str], max_words: int) -> tuple[str, List[str]]:
+    """Take whole leading clauses up to max_words words (or the first max_words words)
+
+    Returns:
+        Tuple of (first segment, remaining clauses)
+    """
+    taken: List[str] = []
+    words = 0
+    for clause in clauses:
+        clause_words = len(clause.split())
+        if taken and words + clause_words > max_words:
+            break
+        if not taken and clause_words > max_words:
+            head = clause.split()
+            return " ".join(head[:max_words]), [" ".join(head[max_words:])] + clauses[1:]
+        taken.append(clause)
+        words += clause_words
+    return " ".join(taken), clauses[len(taken):]
+
+
+def plan_segments(
+    text: str,
+    first_chunk_words: int,
+    max_tokens: int,
+    growth: float = 2.0,
+) -> List[str]:
+    """Split text into segments that start short and grow toward max_tokens
+
+    Newlines are hard boundaries. After the first segment, each segment
+    collects whole clauses up to a budget that starts at `growth` times the
+    first segment's length and multiplies by `growth` per segment, capped
+    at max_tokens. A single clause longer than the budget becomes its own
+    segment; one longer than max_tokens is split between words. A short
+    remainder at the end of a paragraph (under MIN_SEGMENT_CHARS) is merged
+    into the previous segment of that paragraph when the result still fits
+    max_tokens, so no forward pass is spent on a few words; the short first
+    segment is never merged into.
+
+    Args:
+        text: Normalized input text
+        first_chunk_words: Word limit for the first segment (0 = no short
+            first segment; every segment uses the max_tokens budget)
+        max_tokens: Segment budget in estimated tokens (characters)
+        growth: Budget multiplier from one segment to the next
+
+    Returns:
+        Non-empty segments in order (joined, they reproduce the text's words)
+    """
+    segments: List[str] = []
+    budget = float(max_tokens)
+
+    for paragraph in text.split("\n"):
+        clauses = _clauses(paragraph, max_tokens)
+        if not clauses:
+            continue
+
+        if not segments and first_chunk_words > 0:
+            first, clauses = _first_segment(clauses, first_chunk_words)
+            segments.append(first)
+            budget = min(float(max_tokens), max(1.0, len(first) * growth))
+        paragraph_start = len(segments)
+
+        current = ""
+        for clause in clauses:
+            if current and len(current) + 1 + len(clause) > budget:
+                segments.append(current)
+                budget = min(float(max_tokens), budget * growth)
+                current = clause
+            else:
+                current = f"{current} {clause}" if current else clause
+        if not current:
+            continue
+        if (
+            len(current) < MIN_SEGMENT_CHARS
+            and len(segments) > paragraph_start
+            and len(segments[-1]) + 1 + len(current) <= max_tokens
+        ):
+            segments[-1] = f"{segments[-1]} {current}"
+        else:
+            segments.append(current)
+            budget = min(float(max_tokens), budget * growth)
+
+    return segments
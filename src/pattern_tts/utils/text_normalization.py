@@ -0,0 +1,480 @@
+"""Text normalization for Pattern TTS Service
+
+Rewrites numbers, currency, dates, times, phone numbers, ranges,
+fractions, ratios, version strings, decades, URLs, emails and common
+abbreviations into speakable words before G2P. The input is normalized
+in one left-to-right pass: a cheap trigger pattern locates candidate
+positions (token-initial digits, currency symbols, '@', URL prefixes,
+abbreviations), then that rule family's precompiled pattern is matched
+anchored at the position. Each matched fragment is cached so repeated
+fragments (years, prices, abbreviations) cost a dict lookup.
+"""
+
+from functools import lru_cache
+from typing import Callable, Dict
+
+import regex
+
+# Abbreviations expanded when followed by a period. Some only in context:
+# see TITLE_ABBREVIATIONS, NUMBER_ABBREVIATIONS and FINAL_ABBREVIATIONS.
+ABBREVIATIONS: Dict[str, str] = {
+    "Mr": "Mister",
+    "Mrs": "Missus",
+    "Ms": "Miz",
+    "Dr": "Doctor",
+    "Prof": "Professor",
+    "Sr": "Senior",
+    "Jr": "Junior",
+    "St": "Street",
+    "Mt": "Mount",
+    "Ave": "Avenue",
+    "Blvd": "Boulevard",
+    "Rd": "Road",
+    "Inc": "Incorporated",
+    "Ltd": "Limited",
+    "Corp": "Corporation",
+    "Co": "Company",
+    "Dept": "Department",
+    "Gov": "Governor",
+    "Gen": "General",
+    "Sgt": "Sergeant",
+    "Capt": "Captain",
+    "Lt": "Lieutenant",
+    "No": "Number",
+    "vs": "versus",
+    "etc": "et cetera",
+    "approx": "approximately",
+    "e.g": "for example",
+    "i.e": "that is",
+}
+
+# Expanded only before a capitalized word on the same line ("Dr. Smith",
+# "Co. Ltd"), so a sentence-final "Dr." or "Co." is left as written
+TITLE_ABBREVIATIONS = frozenset({
+    "Mr", "Mrs", "Ms", "Dr", "Prof", "Gov", "Gen", "Sgt", "Capt", "Lt", "Mt", "Co",
+})
+
+# Expanded only with the number that follows ("No. 5", "No.5"), never for the word "No."
+NUMBER_ABBREVIATIONS = frozenset({"No"})
+
+# Can end a sentence: at a sentence break (end of line or text, or a
+# capitalized word next) the period is kept after the expansion
+FINAL_ABBREVIATIONS = frozenset({
+    "etc", "Inc", "Ltd", "Corp", "St", "Ave", "Blvd", "Rd", "Dept", "Jr", "Sr",
+})
+
+MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+# symbol -> (singular unit, plural unit, singular subunit, plural subunit)
+CURRENCIES: Dict[str, tuple] = {
+    "$": ("dollar", "dollars", "cent", "cents"),
+    "£": ("pound", "pounds", "penny", "pence"),
+    "€": ("euro", "euros", "cent", "cents"),
+    "¥": ("yen", "yen", "sen", "sen"),
+}
+
+MAGNITUDES: Dict[str, str] = {
+    "k": "thousand",
+    "m": "million",
+    "b": "billion",
+    "t": "trillion",
+    "thousand": "thousand",
+    "million": "million",
+    "billion": "billion",
+    "trillion": "trillion",
+}
+
+URL_SYMBOLS: Dict[str, str] = {
+    ".": " dot ",
+    "/": " slash ",
+    "-": " dash ",
+    "_": " underscore ",
+    ":": " colon ",
+    "?": " question mark ",
+    "=": " equals ",
+    "&": " and ",
+    "#": " hash ",
+    "@": " at ",
+}
+
+_NUM = r"\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?"
+# Ends a whole numeric token: a match may not stop inside "98.6F", "3:2",
+# "1/2" or "555-1234" (those are left alone unless a rule reads them whole)
+_NUM_END = r"(?!\w|[.:/-]\d)"
+
+
+def _alternation(words) -> str:
+    return "|".join(regex.escape(w) for w in sorted(words, key=len, reverse=True))
+
+
+_ABBREV = _alternation(set(ABBREVIATIONS) - TITLE_ABBREVIATIONS - NUMBER_ABBREVIATIONS)
+
+# Individual rules, in priority order within each family. Each is also
+# used on its own (fullmatch) to parse a fragment once it has been located.
+RULES: Dict[str, "regex.Pattern"] = {
+    "url": regex.compile(r"(?:https?://|www\.)[^\s<>\"]+[^\s<>\".,;:!?)\]]"),
+    "email": regex.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"),
+    "date_iso": regex.compile(r"(?<!\d)(\d{4})-(\d{1,2})-(\d{1,2})(?!\d)"),
+    "date_us": regex.compile(r"(?<![\d/])(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})(?![\d/])"),
+    "time": regex.compile(
+        r"(?<![\d:])(\d{1,2}):(\d{2})(?![\d:])(?:\s?([AaPp])\.?[Mm](?!\w))?"
+    ),
+    "currency": regex.compile(
+        r"([$£€¥])\s?(" + _NUM + r")"
+        r"(?:\s?(thousand|million|billion|trillion|[KkMmBbTt])(?![\w]))?"
+    ),
+    # 555-1234, 555-123-4567, 1-800-555-1234: read digit by digit
+    "phone": regex.compile(r"(?<![\w.-])(?:1-)?(?:\d{3}-)?\d{3}-\d{4}" + _NUM_END),
+    "range": regex.compile(r"(?<![\w.-])(\d+)-(\d+)(\s?%)?" + _NUM_END),
+    "fraction": regex.compile(r"(?<![\w./])(\d+)/(\d+)" + _NUM_END),
+    "ratio": regex.compile(r"(?<![\w.:])(\d+):(\d+)" + _NUM_END),
+    "percent": regex.compile(r"(?<![\w.])(-?)(" + _NUM + r")\s?%"),
+    "ordinal": regex.compile(r"(?<![\w.])(\d+)(st|nd|rd|th)(?!\w)"),
+    "decade": regex.compile(r"(?<![\w.])(\d{3}0|[1-9]0)'?s(?!\w)"),
+    # Three or more dot-separated groups: a version or ID, not a decimal
+    "dotted": regex.compile(r"(?<![\w.])\d+(?:\.\d+){2,}(?!\w)"),
+    "saint": regex.compile(r"(?<!\w)St\."),
+    "title": regex.compile(r"(?<![\w.])(" + _alternation(TITLE_ABBREVIATIONS) + r")\."),
+    "number_abbreviation": regex.compile(
+        r"(?<![\w.])(" + _alternation(NUMBER_ABBREVIATIONS) + r")\.[ \t]*(\d+)(?![\w.,]?\d)"
+    ),
+    "final_abbreviation": regex.compile(
+        r"(?<![\w.])(" + _alternation(FINAL_ABBREVIATIONS) + r")\."
+    ),
+    "abbreviation": regex.compile(r"(?<![\w.])(" + _ABBREV + r")\.(?!\w)"),
+    "number": regex.compile(
+        r"(?<![\w.]|\d[:/-])((?<![\w-])-)?(" + _NUM + r")" + _NUM_END
+    ),
+    "ampersand": regex.compile(r"(?<=\s)&(?=\s)"),
+}
+
+# Right context a rule needs in order to apply. Checked when scanning but
+# not part of the matched fragment, so fragments stay context-free (and
+# cacheable) and the following text is left for later rules.
+CONTEXT: Dict[str, str] = {
+    "saint": r"(?=[ \t]+\p{Lu})",
+    "title": r"(?=[ \t]+\p{Lu})",
+    "final_abbreviation": r"(?=[ \t]*(?:\n|$)|\s+\p{Lu})",
+}
+
+# Rule families, keyed by the trigger group that selects them
+FAMILIES: Dict[str, tuple] = {
+    "numeric": (
+        "date_iso", "date_us", "time", "phone", "range", "fraction", "ratio", "currency",
+        "percent", "ordinal", "decade", "dotted", "number",
+    ),
+    "url": ("url",),
+    "email": ("email",),
+    "abbreviation": (
+        "saint", "title", "number_abbreviation", "final_abbreviation", "abbreviation",
+    ),
+    "ampersand": ("ampersand",),
+}
+
+# Candidate positions. Kept to literals and small character classes so the
+# scan skips plain prose quickly. Emails trigger on '@' and abbreviations
+# on '.', and are backtracked to the start of the local part / word.
+TRIGGER = regex.compile(
+    r"(?P<numeric>[\d$£€¥]|-(?=\d))"
+    r"|(?P<url>https?://|www\.)"
+    r"|(?P<email>@)"
+    r"|(?P<abbreviation>\.)"
+    r"|(?P<ampersand>&)"
+)
+
+# Per-family alternation, matched anchored at a trigger position
+FAMILY_PATTERNS: Dict[str, "regex.Pattern"] = {
+    family: regex.compile(
+        "|".join(f"(?P<{name}>{RULES[name].pattern}{CONTEXT.get(name, '')})" for name in names)
+    )
+    for family, names in FAMILIES.items()
+}
+
+_LETTERS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# Characters to backtrack over from a trigger, and how far
+BACKTRACK: Dict[str, tuple] = {
+    "email": (frozenset(_LETTERS + "0123456789._+-"), 64),
+    "abbreviation": (frozenset(_LETTERS + "."), max(len(a) for a in ABBREVIATIONS)),
+}
+
+
+@lru_cache(maxsize=1)
+def _inflect_engine():
+    """inflect engine, created on first use (importing inflect is slow)"""
+    import inflect
+
+    return inflect.engine()
+
+
+@lru_cache(maxsize=4096)
+def number_to_words(number: str) -> str:
+    """Spell out a cardinal number ('1,234.5' -> 'one thousand two hundred ...')"""
+    number = number.replace(",", "")
+    words = _inflect_engine().number_to_words(number, andword="")
+    return words.replace(",", "")
+
+
+def ordinal_to_words(number: int) -> str:
+    """Spell out an ordinal number (21 -> 'twenty-first')"""
+    engine = _inflect_engine()
+    return engine.ordinal(number_to_words(str(number)))
+
+
+def year_to_words(year: int) -> str:
+    """Spell out a year the way it is spoken (1990 -> 'nineteen ninety')"""
+    if year < 1000 or year > 2099 or 2000 <= year < 2010:
+        return number_to_words(str(year))
+    century, rest = divmod(year, 100)
+    if rest == 0:
+        return f"{number_to_words(str(century))} hundred"
+    if rest < 10:
+        return f"{number_to_words(str(century))} oh {number_to_words(str(rest))}"
+    return f"{number_to_words(str(century))} {number_to_words(str(rest))}"
+
+
+def decade_to_words(decade: str) -> str:
+    """Spell out a decade ('1990' -> 'nineteen nineties', '60' -> 'sixties')"""
+    words = year_to_words(int(decade)) if len(decade) == 4 else number_to_words(decade)
+    head, _, last = words.rpartition(" ")
+    plural = _inflect_engine().plural_noun(last)
+    return f"{head} {plural}" if head else plural
+
+
+def _date(year: int, month: int, day: int) -> str:
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return ""
+    return f"{MONTHS[month - 1]} {ordinal_to_words(day)}, {year_to_words(year)}"
+
+
+def _norm_url(m) -> str:
+    text = regex.sub(r"^https?://", "", m.group(0))
+    if text.startswith("www."):
+        text = "w w w." + text[4:]
+    for symbol, word in URL_SYMBOLS.items():
+        text = text.replace(symbol, word)
+    return " ".join(text.split())
+
+
+def _norm_email(m) -> str:
+    text = m.group(0)
+    for symbol in ("@", ".", "-", "_"):
+        text = text.replace(symbol, URL_SYMBOLS[symbol])
+    return " ".join(text.split())
+
+
+def _norm_date_iso(m) -> str:
+    year, month, day = int(m.group(1)), int(m.group(2)), int(m.group(3))
+    return _date(year, month, day) or m.group(0).replace("-", " ")
+
+
+def _norm_date_us(m) -> str:
+    month, day, year = int(m.group(1)), int(m.group(2)), m.group(3)
+    year = int(year) + 2000 if len(year) == 2 else int(year)
+    return _date(year, month, day) or m.group(0).replace("/", " slash ")
+
+
+def _norm_time(m) -> str:
+    hour, minute, meridiem = int(m.group(1)), int(m.group(2)), m.group(3)
+    if hour > 24 or minute > 59:
+        return f"{number_to_words(m.group(1))} {number_to_words(m.group(2))}"
+    words = number_to_words(str(hour))
+    if minute == 0:
+        words += "" if meridiem else " o'clock"
+    elif minute < 10:
+        words += f" oh {number_to_words(str(minute))}"
+    else:
+        words += f" {number_to_words(str(minute))}"
+    if meridiem:
+        words += " A M" if meridiem.lower() == "a" else " P M"
+    return words
+
+
+def _norm_currency(m) -> str:
+    unit, units, subunit, subunits = CURRENCIES[m.group(1)]
+    amount = m.group(2).replace(",", "")
+    magnitude = m.group(3)
+    if magnitude:
+        return f"{number_to_words(amount)} {MAGNITUDES[magnitude.lower()]} {units}"
+
+    whole, _, fraction = amount.partition(".")
+    whole_words = f"{number_to_words(whole)} {unit if whole == '1' else units}"
+    if not fraction or int(fraction) == 0:
+        return whole_words
+    cents = int(fraction[:2].ljust(2, "0"))
+    cents_words = f"{number_to_words(str(cents))} {subunit if cents == 1 else subunits}"
+    if whole == "0":
+        return cents_words
+    return f"{whole_words} and {cents_words}"
+
+
+def _norm_percent(m) -> str:
+    sign = "minus " if m.group(1) else ""
+    return f"{sign}{number_to_words(m.group(2))} percent"
+
+
+def _norm_ordinal(m) -> str:
+    return ordinal_to_words(int(m.group(1)))
+
+
+def _norm_phone(m) -> str:
+    return ", ".join(
+        " ".join(number_to_words(digit) for digit in group) for group in m.group(0).split("-")
+    )
+
+
+def _norm_range(m) -> str:
+    words = f"{_cardinal(m.group(1))} to {_cardinal(m.group(2))}"
+    return f"{words} percent" if m.group(3) else words
+
+
+def _norm_fraction(m) -> str:
+    numerator, denominator = int(m.group(1)), int(m.group(2))
+    if not 0 < numerator < denominator <= 100:
+        # Not a proper fraction ("24/7", "5/3"): read both numbers
+        return f"{number_to_words(m.group(1))} slash {number_to_words(m.group(2))}"
+    if denominator == 2:
+        unit = "half"
+    elif denominator == 4:
+        unit = "quarter"
+    else:
+        unit = ordinal_to_words(denominator)
+    if numerator > 1:
+        unit = "halves" if unit == "half" else f"{unit}s"
+    return f"{number_to_words(m.group(1))} {unit}"
+
+
+def _norm_ratio(m) -> str:
+    return f"{number_to_words(m.group(1))} to {number_to_words(m.group(2))}"
+
+
+def _norm_decade(m) -> str:
+    return decade_to_words(m.group(1))
+
+
+def _norm_dotted(m) -> str:
+    # Group by group; groups with a leading zero ("01") digit by digit
+    groups = []
+    for group in m.group(0).split("."):
+        if len(group) > 1 and group.startswith("0"):
+            groups.append(" ".join(number_to_words(digit) for digit in group))
+        else:
+            groups.append(number_to_words(group))
+    return " point ".join(groups)
+
+
+def _norm_abbreviation(m) -> str:
+    return ABBREVIATIONS[m.group(1)]
+
+
+def _norm_number_abbreviation(m) -> str:
+    return f"{ABBREVIATIONS[m.group(1)]} {number_to_words(m.group(2))}"
+
+
+def _norm_final_abbreviation(m) -> str:
+    return ABBREVIATIONS[m.group(1)] + "."
+
+
+def _cardinal(number: str) -> str:
+    """Spell out a number, reading 1100-2099 as a year"""
+    if len(number) == 4 and number.isdigit() and 1100 <= int(number) <= 2099:
+        return year_to_words(int(number))
+    return number_to_words(number)
+
+
+def _norm_number(m) -> str:
+    if m.group(1):
+        return "minus " + number_to_words(m.group(2))
+    return _cardinal(m.group(2))
+
+
+# Rules whose replacement does not depend on the matched text
+LITERALS: Dict[str, str] = {
+    "saint": "Saint",
+    "ampersand": "and",
+}
+
+HANDLERS: Dict[str, Callable] = {
+    "url": _norm_url,
+    "email": _norm_email,
+    "date_iso": _norm_date_iso,
+    "date_us": _norm_date_us,
+    "time": _norm_time,
+    "phone": _norm_phone,
+    "range": _norm_range,
+    "fraction": _norm_fraction,
+    "ratio": _norm_ratio,
+    "currency": _norm_currency,
+    "percent": _norm_percent,
+    "ordinal": _norm_ordinal,
+    "decade": _norm_decade,
+    "dotted": _norm_dotted,
+    "title": _norm_abbreviation,
+    "number_abbreviation": _norm_number_abbreviation,
+    "final_abbreviation": _norm_final_abbreviation,
+    "abbreviation": _norm_abbreviation,
+    "number": _norm_number,
+}
+
+
+@lru_cache(maxsize=8192)
+def normalize_fragment(kind: str, fragment: str) -> str:
+    """Normalize one matched fragment (cached)
+
+    Args:
+        kind: Rule name from RULES
+        fragment: Text matched by that rule
+
+    Returns:
+        Speakable replacement text
+    """
+    if kind in LITERALS:
+        return LITERALS[kind]
+    m = RULES[kind].fullmatch(fragment)
+    if m is None:
+        return fragment
+    return HANDLERS[kind](m)
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for synthesis in a single pass
+
+    Args:
+        text: Raw input text
+
+    Returns:
+        Text with numbers, currency, dates, times, version strings,
+        decades, URLs, emails and abbreviations spelled out
+    """
+    pieces = []
+    last = pos = 0
+    search = TRIGGER.search
+    while True:
+        trigger = search(text, pos)
+        if trigger is None:
+            break
+        family = trigger.lastgroup
+        start = trigger.start()
+        if family in BACKTRACK:
+            # Back up to the start of the token (not yet emitted, so still replaceable)
+            chars, limit = BACKTRACK[family]
+            floor = max(last, start - limit)
+            while start > floor and text[start - 1] in chars:
+                start -= 1
+
+        m = FAMILY_PATTERNS[family].match(text, start)
+        if m is None or m.end() <= trigger.start():
+            pos = trigger.end()
+            continue
+
+        pieces.append(text[last:start])
+        pieces.append(normalize_fragment(m.lastgroup, m.group()))
+        last = pos = m.end()
+
+    if not pieces:
+        return text
+    pieces.append(text[last:])
+    return "".join(pieces)
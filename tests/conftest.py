@@ -0,0 +1,8 @@
+"""Shared test setup"""
+
+import os
+from pathlib import Path
+
+# Settings load when pattern_tts modules are imported; fall back to the
+# example configuration so the suite runs without a local .env
+os.environ.setdefault("PA_TTS_DOT_ENV", str(Path(__file__).parents[1] / "env.example"))
@@ -0,0 +1,286 @@
+"""Tests for the audio cache backends and single-flight synthesis"""
+
+import asyncio
+import time
+
+import pytest
+
+from pattern_tts.services.audio_cache import (
+    AudioCache,
+    FileCacheBackend,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+)
+
+
+class RespStandIn:
+    """Minimal Redis stand-in speaking RESP: GET, SET [NX] [PX], DEL and the release EVAL
+
+    Replies to GET on keys listed in ``stall`` are delayed by ``stall_s``,
+    to interrupt a client mid-command.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.connections = 0
+        self.stall = set()
+        self.stall_s = 0.5
+        self._server = None
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"redis://127.0.0.1:{port}/0"
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    def _get(self, key):
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires is not None and expires < time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    @staticmethod
+    def _bulk(value) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    async def _execute(self, args) -> bytes:
+        command = args[0].decode().upper()
+        if command in ("AUTH", "SELECT"):
+            return b"+OK\r\n"
+        if command == "GET":
+            if args[1] in self.stall:
+                await asyncio.sleep(self.stall_s)
+            return self._bulk(self._get(args[1]))
+        if command == "SET":
+            options = [a.decode().upper() for a in args[3:]]
+            if "NX" in options and self._get(args[1]) is not None:
+                return b"$-1\r\n"
+            expires = None
+            if "PX" in options:
+                expires = time.monotonic() + int(options[options.index("PX") + 1]) / 1000
+            self.data[args[1]] = (args[2], expires)
+            return b"+OK\r\n"
+        if command == "DEL":
+            return b":%d\r\n" % (self.data.pop(args[1], None) is not None)
+        if command == "EVAL":
+            # Only the compare-and-delete release script is used
+            key, token = args[3], args[4]
+            if self._get(key) == token:
+                del self.data[key]
+                return b":1\r\n"
+            return b":0\r\n"
+        return b"-ERR unknown command\r\n"
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                args = []
+                for _ in range(int(line[1:-2])):
+                    length = int((await reader.readline())[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                writer.write(await self._execute(args))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+async def stand_in():
+    server = RespStandIn()
+    server.url = await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture(params=["memory", "file", "redis"])
+async def backend(request, tmp_path, stand_in):
+    if request.param == "memory":
+        backend = MemoryCacheBackend(1024 * 1024)
+    elif request.param == "file":
+        backend = FileCacheBackend(str(tmp_path), 1024 * 1024)
+    else:
+        backend = RedisCacheBackend(stand_in.url)
+    yield backend
+    await backend.close()
+
+
+def make_cache(backend) -> AudioCache:
+    cache = AudioCache(backend)
+    cache.poll_interval_s = 0.01
+    cache.wait_timeout_s = 5.0
+    return cache
+
+
+async def test_get_set_delete(backend):
+    assert await backend.get("k1") is None
+    await backend.set("k1", b"audio", 60)
+    assert await backend.get("k1") == b"audio"
+    await backend.set("k1", b"replaced", 60)
+    assert await backend.get("k1") == b"replaced"
+    await backend.delete("k1")
+    assert await backend.get("k1") is None
+
+
+async def test_ttl_expiry(backend):
+    await backend.set("k1", b"audio", 0.1)
+    assert await backend.get("k1") == b"audio"
+    await asyncio.sleep(0.2)
+    assert await backend.get("k1") is None
+
+
+async def test_lock_is_exclusive_and_released_by_owner_only(backend):
+    assert await backend.acquire_lock("k1", "a", 60)
+    assert not await backend.acquire_lock("k1", "b", 60)
+    await backend.release_lock("k1", "b")
+    assert not await backend.acquire_lock("k1", "b", 60)
+    await backend.release_lock("k1", "a")
+    assert await backend.acquire_lock("k1", "b", 60)
+
+
+async def test_lock_expiry(backend):
+    assert await backend.acquire_lock("k1", "a", 0.1)
+    assert not await backend.acquire_lock("k1", "b", 0.1)
+    # File locks are stale by mtime at one-second resolution on some filesystems
+    await asyncio.sleep(1.1 if isinstance(backend, FileCacheBackend) else 0.2)
+    assert await backend.acquire_lock("k1", "b", 0.1)
+
+
+async def test_single_flight_in_process(backend):
+    cache = make_cache(backend)
+    calls = 0
+
+    async def producer():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return b"audio"
+
+    results = await asyncio.gather(*(cache.get_or_create("k1", producer) for _ in range(8)))
+
+    assert calls == 1
+    assert [value for value, _ in results] == [b"audio"] * 8
+    assert sorted(cached for _, cached in results) == [False] + [True] * 7
+    assert cache.stats["coalesced"] == 7
+    # Later requests are served from the backend
+    assert await cache.get_or_create("k1", producer) == (b"audio", True)
+    assert calls == 1
+
+
+async def test_single_flight_across_instances(stand_in):
+    # Two caches with their own connections, as in two pods sharing one Redis
+    caches = [make_cache(RedisCacheBackend(stand_in.url)) for _ in range(2)]
+    calls = 0
+
+    async def producer():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.2)
+        return b"audio"
+
+    results = await asyncio.gather(
+        *(cache.get_or_create("k1", producer) for cache in caches for _ in range(4))
+    )
+
+    assert calls == 1
+    assert all(value == b"audio" for value, _ in results)
+    assert sum(cache.stats["remote_waits"] for cache in caches) == 1
+    for cache in caches:
+        await cache.close()
+
+
+async def test_waiter_takes_over_expired_lease(stand_in):
+    holder = RedisCacheBackend(stand_in.url)
+    cache = make_cache(RedisCacheBackend(stand_in.url))
+    cache.lock_ttl_s = 60
+    # A crashed holder's lease, expiring shortly
+    assert await holder.acquire_lock("k1", "crashed", 0.2)
+
+    async def producer():
+        return b"audio"
+
+    start = time.monotonic()
+    assert await cache.get_or_create("k1", producer) == (b"audio", False)
+    assert time.monotonic() - start >= 0.2
+    assert cache.stats["remote_waits"] == 1
+    await holder.close()
+    await cache.close()
+
+
+async def test_failed_producer_propagates_to_waiters(backend):
+    cache = make_cache(backend)
+
+    async def producer():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("synthesis failed")
+
+    results = await asyncio.gather(
+        *(cache.get_or_create("k1", producer) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    # The lock was released, so the next request synthesizes again
+    assert await backend.acquire_lock("k1", "next", 60)
+
+
+async def test_cancelled_command_does_not_desync_connection(stand_in):
+    backend = RedisCacheBackend(stand_in.url)
+    await backend.set("other", b"other-value", 60)
+    stand_in.stall.add(b"pattern-tts:audio:slow")
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(backend.get("slow"), 0.05)
+
+    # The stalled GET reply must not be read as the reply to this command
+    await asyncio.sleep(stand_in.stall_s)
+    assert await backend.get("other") == b"other-value"
+    assert stand_in.connections == 2
+    await backend.close()
+
+
+async def test_backend_errors_fall_back_to_synthesis():
+    # Nothing listens on this port
+    cache = make_cache(RedisCacheBackend("redis://127.0.0.1:1/0"))
+
+    async def producer():
+        return b"audio"
+
+    assert await cache.get_or_create("k1", producer) == (b"audio", False)
+    assert cache.stats["errors"] > 0
+
+
+async def test_cancelled_leader_does_not_cancel_waiters(backend):
+    cache = make_cache(backend)
+    calls = 0
+
+    async def producer():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return b"audio"
+
+    leader = asyncio.create_task(cache.get_or_create("k1", producer))
+    await asyncio.sleep(0.01)
+    follower = asyncio.create_task(cache.get_or_create("k1", producer))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await follower == (b"audio", True)
+    assert leader.cancelled()
+    assert calls == 1
+    # The synthesis finished for the cache too
+    assert await backend.get("k1") == b"audio"
@@ -0,0 +1,80 @@
+"""Tests for streamed audio encoding"""
+
+import shutil
+import subprocess
+import time
+
+import numpy as np
+import pytest
+
+from pattern_tts.utils.audio_encoding import StreamEncoder, encode_audio
+
+SAMPLE_RATE = 24000
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+
+
+def tone(seconds: float, frequency: float = 220.0) -> np.ndarray:
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (0.3 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def decode(data: bytes) -> np.ndarray:
+    result = subprocess.run(
+        ["ffmpeg", "-v", "error", "-i", "pipe:0", "-f", "s16le", "-ac", "1",
+         "-ar", str(SAMPLE_RATE), "pipe:1"],
+        input=data,
+        capture_output=True,
+        check=True,
+    )
+    return np.frombuffer(result.stdout, dtype="<i2")
+
+
+@pytest.mark.parametrize("response_format", ["pcm", "mulaw"])
+def test_raw_stream_matches_whole_encoding(response_format):
+    segments = [tone(0.5), tone(0.7, 330.0)]
+    output = []
+    encoder = StreamEncoder(output.append, SAMPLE_RATE, response_format, sample_rate=16000)
+    for segment in segments:
+        encoder.write(segment)
+    encoder.close()
+
+    # Segments are resampled independently, so compare per segment
+    assert b"".join(output) == b"".join(
+        encode_audio(segment, SAMPLE_RATE, response_format, sample_rate=16000)
+        for segment in segments
+    )
+
+
+@needs_ffmpeg
+@pytest.mark.parametrize("response_format", ["mp3", "aac", "opus"])
+def test_compressed_stream_is_one_continuous_stream(response_format):
+    output = []
+    encoder = StreamEncoder(output.append, SAMPLE_RATE, response_format)
+    for _ in range(3):
+        encoder.write(tone(1.0))
+    encoder.close()
+
+    audio = decode(b"".join(output))
+    # One encoder: a single priming delay, not one per segment
+    assert abs(len(audio) / SAMPLE_RATE - 3.0) < 0.1
+
+
+@needs_ffmpeg
+def test_compressed_output_arrives_before_close():
+    output = []
+    encoder = StreamEncoder(output.append, SAMPLE_RATE, "mp3")
+    encoder.write(tone(2.0))
+    try:
+        for _ in range(100):
+            if output:
+                break
+            time.sleep(0.02)
+        assert output
+    finally:
+        encoder.abort()
+
+
+def test_unstreamable_format_is_rejected():
+    with pytest.raises(ValueError, match="cannot be streamed"):
+        StreamEncoder(lambda data: None, SAMPLE_RATE, "wav")
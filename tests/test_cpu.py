@@ -0,0 +1,110 @@
+"""Tests for cgroup CPU quota parsing and inference thread planning"""
+
+import pytest
+
+from pattern_tts.utils import cpu
+from pattern_tts.utils.cpu import cgroup_cpu_quota, plan_threads
+
+
+def write_files(root, files):
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+@pytest.mark.parametrize(
+    "files, expected",
+    [
+        # cgroup v2
+        ({"cpu.max": "400000 100000\n"}, 4.0),
+        ({"cpu.max": "150000 100000\n"}, 1.5),
+        ({"cpu.max": "50000 100000\n"}, 0.5),
+        ({"cpu.max": "max 100000\n"}, None),
+        # cgroup v1, under the controller directory names in use
+        ({"cpu/cpu.cfs_quota_us": "200000", "cpu/cpu.cfs_period_us": "100000"}, 2.0),
+        (
+            {"cpu,cpuacct/cpu.cfs_quota_us": "250000", "cpu,cpuacct/cpu.cfs_period_us": "100000"},
+            2.5,
+        ),
+        ({"cpu/cpu.cfs_quota_us": "-1", "cpu/cpu.cfs_period_us": "100000"}, None),
+        # v1 period missing
+        ({"cpu/cpu.cfs_quota_us": "200000"}, None),
+        # Not in a cgroup
+        ({}, None),
+    ],
+)
+def test_cgroup_cpu_quota(tmp_path, files, expected):
+    write_files(tmp_path, files)
+    assert cgroup_cpu_quota(tmp_path) == expected
+
+
+def test_cgroup_v2_takes_precedence_over_v1(tmp_path):
+    write_files(tmp_path, {
+        "cpu.max": "300000 100000",
+        "cpu/cpu.cfs_quota_us": "100000",
+        "cpu/cpu.cfs_period_us": "100000",
+    })
+    assert cgroup_cpu_quota(tmp_path) == 3.0
+
+
+def test_missing_root(tmp_path):
+    assert cgroup_cpu_quota(tmp_path / "missing") is None
+
+
+@pytest.fixture
+def cpus(monkeypatch):
+    """Set the affinity mask and CFS quota seen by plan_threads"""
+
+    def configure(allowed, quota=None):
+        monkeypatch.setattr(cpu, "allowed_cpus", lambda: list(allowed))
+        monkeypatch.setattr(cpu, "cgroup_cpu_quota", lambda root=None: quota)
+
+    return configure
+
+
+@pytest.mark.parametrize(
+    "allowed, quota, workers, expected_cpus, expected_intra",
+    [
+        (range(8), None, 2, 8, 4),
+        (range(64), 4.0, 2, 4, 2),
+        # A fractional quota rounds up
+        (range(64), 1.5, 1, 2, 2),
+        (range(64), 0.5, 1, 1, 1),
+        # More workers than CPUs still get one thread each
+        (range(2), None, 4, 2, 1),
+        (range(4), None, 0, 4, 4),
+    ],
+)
+def test_plan_threads_splits_the_budget(
+    cpus, allowed, quota, workers, expected_cpus, expected_intra
+):
+    cpus(allowed, quota)
+    plan = plan_threads(workers)
+    assert (plan.cpus, plan.intra_op_threads, plan.inter_op_threads) == (
+        expected_cpus,
+        expected_intra,
+        1,
+    )
+    assert plan.worker_cpus == []
+
+
+def test_plan_threads_overrides(cpus):
+    cpus(range(8))
+    plan = plan_threads(2, intra_op_override=3, inter_op_override=2)
+    assert (plan.intra_op_threads, plan.inter_op_threads) == (3, 2)
+
+
+def test_pinning_splits_an_exclusive_cpuset(cpus):
+    cpus([2, 3, 4, 5, 6], quota=5.0)
+    assert plan_threads(2, pin=True).worker_cpus == [[2, 3], [4, 5]]
+
+
+def test_pinning_round_robins_when_workers_outnumber_cpus(cpus):
+    cpus([0, 1])
+    assert plan_threads(3, pin=True).worker_cpus == [[0], [1], [0]]
+
+
+def test_no_pinning_with_a_quota_narrower_than_the_mask(cpus):
+    cpus(range(16), quota=4.0)
+    assert plan_threads(2, pin=True).worker_cpus == []
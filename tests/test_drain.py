@@ -0,0 +1,126 @@
+"""Tests for in-flight tracking and drain accounting"""
+
+import asyncio
+
+from pattern_tts.api.routers.openai_compatible import _TrackedStreamingResponse
+from pattern_tts.services.drain import DrainController
+
+
+async def test_drain_waits_for_in_flight_work():
+    drain = DrainController(grace_period_s=5)
+
+    async def request():
+        async with drain.track():
+            await asyncio.sleep(0.1)
+
+    task = asyncio.create_task(request())
+    await asyncio.sleep(0)
+    await drain.drain()
+    await task
+
+    assert drain.snapshot() | {"drain_seconds": None} == {
+        "draining": True,
+        "in_flight": 0,
+        "grace_period_s": 5,
+        "in_flight_at_drain": 1,
+        "completed": 1,
+        "aborted": 0,
+        "rejected": 0,
+        "drain_seconds": None,
+    }
+
+
+async def test_work_outliving_the_grace_period_is_aborted():
+    drain = DrainController(grace_period_s=0.05)
+    drain.begin()
+    drain.begin()
+
+    await drain.drain()
+    assert (drain.aborted, drain.completed) == (2, 0)
+
+    # Finishing after the grace period does not make it completed
+    drain.end()
+    drain.end()
+    assert (drain.aborted, drain.completed, drain.in_flight) == (2, 0, 0)
+
+
+async def stream_response(response, disconnect=False):
+    sent = []
+
+    async def receive():
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        if disconnect:
+            raise OSError("client went away")
+        sent.append(message)
+
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+    try:
+        await response(scope, receive, send)
+    except Exception:
+        pass
+    return sent
+
+
+async def test_streamed_response_is_in_flight_before_it_starts():
+    drain = DrainController(grace_period_s=5)
+
+    async def chunks():
+        yield b"audio"
+
+    response = _TrackedStreamingResponse(chunks(), drain)
+    # Admitted but not yet sent: a drain starting now must wait for it
+    assert drain.in_flight == 1
+
+    draining = asyncio.create_task(drain.drain())
+    await asyncio.sleep(0.05)
+    assert not draining.done()
+
+    sent = await stream_response(response)
+    await draining
+    assert b"audio" in [m.get("body") for m in sent]
+    assert (drain.in_flight, drain.completed, drain.aborted) == (0, 1, 0)
+
+
+async def test_streamed_response_released_when_client_disconnects_before_body():
+    drain = DrainController(grace_period_s=5)
+
+    async def chunks():
+        yield b"audio"
+
+    await stream_response(_TrackedStreamingResponse(chunks(), drain), disconnect=True)
+    assert drain.in_flight == 0
+
+
+async def test_streamed_body_is_closed_when_the_client_disconnects():
+    drain = DrainController(grace_period_s=5)
+    closed = asyncio.Event()
+
+    async def chunks():
+        try:
+            yield b"audio"
+            yield b"more"
+        finally:
+            closed.set()
+
+    async def receive():
+        await asyncio.sleep(3600)
+
+    sent = []
+
+    async def send(message):
+        # The client goes away after the first body chunk
+        if message.get("body"):
+            raise OSError("client went away")
+        sent.append(message)
+
+    response = _TrackedStreamingResponse(chunks(), drain)
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+    try:
+        await response(scope, receive, send)
+    except Exception:
+        pass
+
+    assert closed.is_set()
+    assert drain.in_flight == 0
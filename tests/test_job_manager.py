@@ -0,0 +1,111 @@
+"""Tests for speech job leases, resume from checkpoints and deletion"""
+
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from pattern_tts.core.config import settings
+from pattern_tts.services.job_manager import JobManager
+
+TEXT = "First sentence here.\nSecond sentence here.\nThird sentence here."
+
+
+class StubModelManager:
+    """Synthesizes one sample per character; optionally blocks until released"""
+
+    def __init__(self):
+        self.thread_plan = SimpleNamespace(workers=1)
+        self.synthesized = []
+        self.started = asyncio.Event()
+        self.release = None
+
+    async def synthesize(self, text, voice, speed):
+        self.synthesized.append(text)
+        self.started.set()
+        if self.release is not None:
+            await self.release.wait()
+        return np.zeros(len(text), dtype=np.float32)
+
+    def output_sample_rate(self, voice, sample_rate):
+        return sample_rate or 24000
+
+
+@pytest.fixture(autouse=True)
+def short_segments(monkeypatch):
+    monkeypatch.setattr(settings, "job_segment_chars", 30)
+    monkeypatch.setattr(settings, "jobs_lease_s", 60.0)
+
+
+def create_job(manager: JobManager) -> dict:
+    return manager._create(TEXT, "af_heart", 1.0, "pcm", None, None, 1)
+
+
+def test_live_lease_cannot_be_claimed(tmp_path):
+    first, second = JobManager(str(tmp_path)), JobManager(str(tmp_path))
+    job = create_job(first)
+
+    assert first._claim_next()["id"] == job["id"]
+    assert second._claim_next() is None
+    assert (tmp_path / job["id"] / "lease").read_text() == first.owner
+
+
+async def test_stale_lease_is_taken_over_and_resumes_from_checkpoints(tmp_path):
+    crashed, manager = JobManager(str(tmp_path)), JobManager(str(tmp_path))
+    job = create_job(crashed)
+    assert job["segments_total"] == 3
+
+    # A pod that died after checkpointing the first segment
+    assert crashed._claim_next() is not None
+    job.update(status="running", started_at=int(time.time()), owner=crashed.owner)
+    crashed._write_job(job)
+    crashed._save_segment(job["id"], 0, np.zeros(20, dtype=np.float32))
+    lease = tmp_path / job["id"] / "lease"
+    stale = time.time() - settings.jobs_lease_s - 1
+    os.utime(lease, (stale, stale))
+
+    claimed = manager._claim_next()
+    assert claimed["id"] == job["id"]
+    assert lease.read_text() == manager.owner
+
+    model = StubModelManager()
+    await manager._run_job(claimed, model)
+
+    assert model.synthesized == ["Second sentence here.", "Third sentence here."]
+    done = manager.get(job["id"])
+    assert done["status"] == "completed"
+    assert done["segments_completed"] == 3
+    # 20 checkpointed samples plus one per synthesized character, as 16-bit PCM
+    assert done["bytes"] == (20 + 21 + 20) * 2
+    assert not lease.exists()
+
+
+async def test_deleting_a_running_job_stops_it_without_failing_it(tmp_path, monkeypatch):
+    manager = JobManager(str(tmp_path))
+    job = create_job(manager)
+    statuses = []
+    write_job = manager._write_job
+
+    def record_write(record):
+        statuses.append(record["status"])
+        write_job(record)
+
+    monkeypatch.setattr(manager, "_write_job", record_write)
+
+    model = StubModelManager()
+    model.release = asyncio.Event()
+    run = asyncio.create_task(manager._run_job(manager._claim_next(), model))
+    await asyncio.wait_for(model.started.wait(), 5)
+
+    assert manager.delete(job["id"])
+    model.release.set()
+    await asyncio.wait_for(run, 5)
+
+    assert model.synthesized == ["First sentence here."]
+    assert "failed" not in statuses
+    assert manager.get(job["id"]) is None
+    assert not (tmp_path / job["id"]).exists()
+    assert manager.current_job is None
@@ -0,0 +1,64 @@
+"""Tests for word and phoneme timestamps collected from pipeline results"""
+
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+from pattern_tts.services.model_manager import FRAMES_PER_SECOND, ModelManager
+
+
+def collect(result, offset=0.0, vocab="hɛlo wɝd"):
+    # Only the model vocab is read from the manager
+    manager = SimpleNamespace(model=SimpleNamespace(vocab=set(vocab)))
+    timestamps = {"words": [], "phonemes": []}
+    ModelManager._collect_timestamps(manager, result, offset, timestamps)
+    return timestamps
+
+
+def make_result(phonemes, durations, tokens=()):
+    return SimpleNamespace(
+        tokens=list(tokens), phonemes=phonemes, pred_dur=torch.tensor(durations)
+    )
+
+
+def test_frames_are_40_per_second():
+    assert FRAMES_PER_SECOND == 40
+
+
+def test_phoneme_durations_map_frames_to_seconds():
+    # <bos> 5 frames (2 after the 3-frame lead-in), h 4, ɛ 8, l 2, o 6, <eos> 10
+    timestamps = collect(make_result("hɛlo", [5, 4, 8, 2, 6, 10]))
+    assert timestamps["phonemes"] == [
+        {"phoneme": "h", "start": 0.05, "end": 0.15},
+        {"phoneme": "ɛ", "start": 0.15, "end": 0.35},
+        {"phoneme": "l", "start": 0.35, "end": 0.4},
+        {"phoneme": "o", "start": 0.4, "end": 0.55},
+    ]
+
+
+def test_offset_spaces_and_unknown_phonemes():
+    # "!" is not in the vocab, so it has no duration; the space takes time but
+    # is not reported
+    timestamps = collect(make_result("hɛ! wɝ", [3, 4, 4, 8, 2, 2, 1]), offset=1.5)
+    assert timestamps["phonemes"] == [
+        {"phoneme": "h", "start": 1.5, "end": 1.6},
+        {"phoneme": "ɛ", "start": 1.6, "end": 1.7},
+        {"phoneme": "w", "start": 1.9, "end": 1.95},
+        {"phoneme": "ɝ", "start": 1.95, "end": 2.0},
+    ]
+
+
+def test_word_timestamps_are_shifted_by_the_offset():
+    tokens = [
+        SimpleNamespace(text="hello", start_ts=0.05, end_ts=0.55),
+        SimpleNamespace(text="!", start_ts=None, end_ts=None),
+    ]
+    timestamps = collect(make_result("hɛlo", [5, 4, 8, 2, 6, 10], tokens), offset=2.0)
+    assert timestamps["words"] == [{"word": "hello", "start": 2.05, "end": 2.55}]
+
+
+@pytest.mark.parametrize("phonemes, pred_dur", [("hɛlo", None), ("", torch.tensor([3, 3]))])
+def test_no_phoneme_timestamps_without_durations(phonemes, pred_dur):
+    result = SimpleNamespace(tokens=[], phonemes=phonemes, pred_dur=pred_dur)
+    assert collect(result)["phonemes"] == []
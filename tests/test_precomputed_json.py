@@ -0,0 +1,63 @@
+"""Tests for pre-serialized JSON bodies and their ETags"""
+
+import json
+
+import pytest
+from fastapi.responses import JSONResponse
+
+from pattern_tts.services.voice_manager import VoiceManager
+from pattern_tts.utils.precomputed_json import PrecomputedJSON
+
+PAYLOAD = {"voices": ["af_heart", "ëf_ünïcode"], "count": 2}
+
+
+def test_body_matches_json_response():
+    assert PrecomputedJSON.serialize(PAYLOAD).body == JSONResponse(PAYLOAD).body
+
+
+def test_etag_is_strong_and_follows_the_body():
+    etag = PrecomputedJSON.serialize(PAYLOAD).etag
+    assert etag.startswith('"') and etag.endswith('"')
+    assert PrecomputedJSON.serialize(dict(PAYLOAD)).etag == etag
+    assert PrecomputedJSON.serialize({**PAYLOAD, "count": 3}).etag != etag
+
+
+@pytest.mark.parametrize(
+    "header, matches",
+    [
+        ("{etag}", True),
+        ("W/{etag}", True),
+        ("*", True),
+        ('"other", {etag}', True),
+        ('W/"other" , W/{etag}', True),
+        ("", False),
+        ('"other"', False),
+        ('W/"other", "another"', False),
+        # The quotes are part of the tag
+        ("{bare}", False),
+    ],
+)
+def test_if_none_match(header, matches):
+    payload = PrecomputedJSON.serialize(PAYLOAD)
+    header = header.format(etag=payload.etag, bare=payload.etag.strip('"'))
+    assert payload.matches(header) is matches
+
+
+def test_voices_body_is_rebuilt_on_reload(tmp_path):
+    (tmp_path / "af_heart.pt").write_bytes(b"")
+    manager = VoiceManager(tmp_path)
+    before = manager.voices_json
+    native = json.loads(before.body)["kokoro_native"]
+    assert [voice["id"] for voice in native] == ["af_heart"]
+
+    # Unchanged directory: the same body and ETag are served
+    assert not manager.reload()
+    assert manager.voices_json is before
+
+    (tmp_path / "bm_george.pt").write_bytes(b"")
+    assert manager.reload()
+    after = manager.voices_json
+    native = json.loads(after.body)["kokoro_native"]
+    assert [voice["id"] for voice in native] == ["af_heart", "bm_george"]
+    assert after.etag != before.etag
+    assert not after.matches(before.etag)
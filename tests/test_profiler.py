@@ -0,0 +1,60 @@
+"""Tests for request tracing and profiling"""
+
+import asyncio
+import contextvars
+import threading
+
+from pattern_tts.services.profiler import Profiler, RequestTrace, current_trace
+
+
+async def test_trace_is_recorded_when_closed_from_another_context():
+    profiler = Profiler()
+    profiler.slow_request_ms = 0.001
+
+    async def body():
+        async with profiler.trace("/v1/audio/speech", {}) as trace:
+            trace.mark_audio(1.0)
+            yield b"audio"
+            yield b"more"
+
+    stream = body()
+    assert await stream.__anext__() == b"audio"
+    # As the loop's asyncgen finalizer does for a body abandoned on disconnect
+    await asyncio.create_task(stream.aclose(), context=contextvars.Context())
+
+    assert profiler.requests == 1
+    assert profiler.kept == 1
+    assert profiler.streaming_snapshot()["requests"] == 1
+
+
+async def test_trace_restores_the_context():
+    profiler = Profiler()
+    async with profiler.trace("/v1/audio/speech", {}) as trace:
+        assert current_trace() is trace
+    assert current_trace() is None
+
+
+def test_one_profiling_session_at_a_time():
+    first = RequestTrace("/a", {}, backend="cprofile")
+    second = RequestTrace("/b", {}, backend="cprofile")
+    entered, release = threading.Event(), threading.Event()
+
+    def profiled():
+        with first.profiling():
+            entered.set()
+            release.wait(5)
+
+    worker = threading.Thread(target=profiled)
+    worker.start()
+    entered.wait(5)
+    with second.profiling():
+        sum(range(1000))
+    release.set()
+    worker.join()
+
+    assert (first.profile_skipped, second.profile_skipped) == (0, 1)
+    assert first.profile_report() is not None
+    # The session is free again
+    with second.profiling():
+        sum(range(1000))
+    assert second.profile_skipped == 1
@@ -0,0 +1,108 @@
+"""Tests for memory budget enforcement and idle unload"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from pattern_tts.services.model_manager import DEFAULT_LANG_CODE
+from pattern_tts.services.resource_manager import MB, ResourceManager
+
+
+class StubModelManager:
+    """Resident voices and pipelines with fixed sizes; evicting one twice frees nothing"""
+
+    def __init__(self, voices, pipelines):
+        self.device = "cpu"
+        self.voice_manager = SimpleNamespace(get_default_voice=lambda: "af_heart")
+        self.voices = dict(voices)
+        self.pipelines = dict(pipelines)
+        self.evicted = []
+        self.ready = True
+        self.active_requests = 0
+        self.last_used = time.monotonic()
+        self.unloads = []
+
+    def loaded_voices(self):
+        return list(self.voices)
+
+    def loaded_lang_codes(self):
+        return list(self.pipelines)
+
+    def evict_voice(self, voice):
+        self.evicted.append(voice)
+        return self.voices.pop(voice, 0)
+
+    def evict_pipeline(self, lang_code):
+        self.evicted.append(lang_code)
+        return self.pipelines.pop(lang_code, 0)
+
+    def is_ready(self):
+        return self.ready
+
+    def unload(self, idle=False):
+        self.ready = False
+        self.unloads.append(idle)
+
+
+def make_manager(monkeypatch, model, rss_mb, budget_mb=100):
+    manager = ResourceManager(model)
+    manager.memory_budget_mb = budget_mb
+    manager.vram_budget_mb = 0
+    monkeypatch.setattr(manager, "rss_mb", lambda: rss_mb)
+    return manager
+
+
+def test_within_budget_evicts_nothing(monkeypatch):
+    model = StubModelManager({"af_sky": 10 * MB}, {"j": 50 * MB})
+    manager = make_manager(monkeypatch, model, rss_mb=90)
+
+    assert manager.enforce_budget() == 0
+    assert model.evicted == []
+
+
+def test_evicts_voices_before_pipelines_until_overage_is_covered(monkeypatch):
+    model = StubModelManager(
+        {"af_heart": 10 * MB, "af_sky": 10 * MB, "am_adam": 10 * MB},
+        {DEFAULT_LANG_CODE: 200 * MB, "j": 50 * MB, "z": 50 * MB},
+    )
+    manager = make_manager(monkeypatch, model, rss_mb=125)
+
+    assert manager.enforce_budget() == 70 * MB
+    # The default voice and default pipeline are never evicted
+    assert model.evicted == ["af_sky", "am_adam", "j"]
+    assert (manager.evicted_voices, manager.evicted_pipelines) == (2, 1)
+
+
+def test_evictions_that_free_nothing_are_not_counted(monkeypatch):
+    model = StubModelManager({"af_sky": 10 * MB}, {"j": 50 * MB})
+    manager = make_manager(monkeypatch, model, rss_mb=130)
+    # Already evicted by a concurrent request
+    model.voices["af_sky"] = 0
+
+    assert manager.enforce_budget() == 50 * MB
+    assert model.evicted == ["af_sky", "j"]
+    assert (manager.evicted_voices, manager.evicted_pipelines) == (0, 1)
+
+
+@pytest.mark.parametrize(
+    "idle_unload_s, idle_s, active, unloaded",
+    [
+        (60, 120, 0, True),
+        (60, 30, 0, False),
+        (60, 120, 1, False),
+        (0, 120, 0, False),
+    ],
+)
+def test_idle_unload(monkeypatch, idle_unload_s, idle_s, active, unloaded):
+    model = StubModelManager({}, {})
+    model.last_used = time.monotonic() - idle_s
+    model.active_requests = active
+    manager = make_manager(monkeypatch, model, rss_mb=0)
+    manager.idle_unload_s = idle_unload_s
+
+    assert manager.check_idle() is unloaded
+    assert model.unloads == ([True] if unloaded else [])
+    assert manager.idle_unloads == int(unloaded)
+    # Already unloaded: nothing more to do
+    assert not manager.check_idle()
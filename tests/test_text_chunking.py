@@ -0,0 +1,64 @@
+"""Tests for adaptive text segmentation"""
+
+import pytest
+
+from pattern_tts.utils.text_chunking import MIN_SEGMENT_CHARS, plan_segments
+
+TEXT = (
+    "Hello there, my friend. This is a longer sentence that goes on for quite a while, "
+    "with clauses. And another clause follows here, making things longer. Yes."
+)
+
+
+def words(segments):
+    return " ".join(segments).split()
+
+
+def test_first_segment_takes_whole_leading_clauses():
+    segments = plan_segments(TEXT, 3, 60)
+    assert segments[0] == "Hello there,"
+    assert words(segments) == TEXT.split()
+
+
+def test_first_segment_cuts_a_long_first_clause_at_the_word_limit():
+    text = "One two three four five six seven eight nine ten. Eleven twelve."
+    segments = plan_segments(text, 4, 200)
+    assert segments == ["One two three four", "five six seven eight nine ten. Eleven twelve."]
+
+
+def test_segments_grow_toward_the_budget():
+    text = " ".join(f"Clause number {i} is here," for i in range(40))
+    segments = plan_segments(text, 5, 150, growth=3.0)
+    lengths = [len(segment) for segment in segments]
+    assert lengths[:3] == [24, 49, 149]
+    assert max(lengths) <= 150
+    assert words(segments) == text.split()
+
+
+def test_no_short_first_segment_when_disabled():
+    assert plan_segments(TEXT, 0, 200) == [TEXT]
+
+
+@pytest.mark.parametrize("first_chunk_words", [0, 3])
+def test_short_remainder_joins_the_previous_segment(first_chunk_words):
+    segments = plan_segments(TEXT, first_chunk_words, 60)
+    assert segments[-1] == "making things longer. Yes."
+    assert len("Yes.") < MIN_SEGMENT_CHARS
+    assert words(segments) == TEXT.split()
+
+
+def test_short_remainder_stays_separate_when_merging_exceeds_the_budget():
+    text = "A" * 50 + ". Yes."
+    assert plan_segments(text, 0, 52) == ["A" * 50 + ".", "Yes."]
+
+
+def test_short_first_segment_is_not_merged_into():
+    assert plan_segments("Hello there, friend.", 2, 100) == ["Hello there,", "friend."]
+
+
+def test_newlines_are_hard_boundaries():
+    text = "A first paragraph that is long enough to stand alone.\nOk."
+    assert plan_segments(text, 0, 200) == [
+        "A first paragraph that is long enough to stand alone.",
+        "Ok.",
+    ]
@@ -0,0 +1,163 @@
+"""Tests for text normalization rules"""
+
+import pytest
+
+from pattern_tts.utils.text_normalization import normalize_text
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Room No. 5 is free.", "Room Number five is free."),
+        ("See No.7 below.", "See Number seven below."),
+        ("He said No. Then he left.", "He said No. Then he left."),
+        ("No, not now.", "No, not now."),
+    ],
+)
+def test_number_abbreviation_only_before_a_number(text, expected):
+    assert normalize_text(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Call Dr. Smith today.", "Call Doctor Smith today."),
+        ("Ask the Dr. tomorrow.", "Ask the Dr. tomorrow."),
+        ("Acme Co. Ltd. sells apples.", "Acme Company Limited sells apples."),
+        ("Sold by Smith & Co.", "Sold by Smith and Co."),
+        ("Dr.\nSmith", "Dr.\nSmith"),
+        ("St. Louis is far.", "Saint Louis is far."),
+        ("Meet on Main St. in town.", "Meet on Main Street in town."),
+    ],
+)
+def test_title_abbreviations_only_before_a_capitalized_word(text, expected):
+    assert normalize_text(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Apples, pears, etc. The end.", "Apples, pears, et cetera. The end."),
+        ("Apples, pears, etc.", "Apples, pears, et cetera."),
+        ("Apples, pears, etc. and more.", "Apples, pears, et cetera and more."),
+        ("It was Main St.\nNext", "It was Main Street.\nNext"),
+        ("approx. 5 people vs. 42", "approximately five people versus forty-two"),
+    ],
+)
+def test_sentence_final_abbreviations_keep_the_period(text, expected):
+    assert normalize_text(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Version 1.2.3 is out.", "Version one point two point three is out."),
+        ("Upgrade to 10.0.1.", "Upgrade to ten point zero point one."),
+        ("Build 2.05.1", "Build two point zero five point one"),
+        ("It costs 3.5 units.", "It costs three point five units."),
+    ],
+)
+def test_dotted_numbers_read_group_by_group(text, expected):
+    assert normalize_text(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Music of the 1990s.", "Music of the nineteen nineties."),
+        ("In the 1800s.", "In the eighteen hundreds."),
+        ("In the 2000s.", "In the two thousands."),
+        ("In the 2010s.", "In the twenty tens."),
+        ("Back in the 60s.", "Back in the sixties."),
+        ("The 1990's.", "The nineteen nineties."),
+        ("In 1990.", "In nineteen ninety."),
+    ],
+)
+def test_decades(text, expected):
+    assert normalize_text(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("It read 98.6F at noon.", "It read 98.6F at noon."),
+        ("Model 3.5B is small.", "Model 3.5B is small."),
+        ("Use 1,2,3 as keys.", "Use one,two,three as keys."),
+        ("It dropped to -5 today.", "It dropped to minus five today."),
+    ],
+)
+def test_numbers_are_not_split_mid_token(text, expected):
+    assert normalize_text(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Mix at 3:2 by weight.", "Mix at three to two by weight."),
+        ("A 16:9 screen.", "A sixteen to nine screen."),
+        ("At 5:30 we leave.", "At five thirty we leave."),
+    ],
+)
+def test_ratios(text, expected):
+    assert normalize_text(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Add 1/2 cup.", "Add one half cup."),
+        ("About 3/4 of it.", "About three quarters of it."),
+        ("Only 2/3 left.", "Only two thirds left."),
+        ("Cut 5/8 inch.", "Cut five eighths inch."),
+        ("Open 24/7 now.", "Open twenty-four slash seven now."),
+        ("Due 12/25/2024.", "Due December twenty-fifth, twenty twenty-four."),
+    ],
+)
+def test_fractions(text, expected):
+    assert normalize_text(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Call 555-1234 now.", "Call five five five, one two three four now."),
+        (
+            "Call 555-123-4567 now.",
+            "Call five five five, one two three, four five six seven now.",
+        ),
+        (
+            "Dial 1-800-555-1234.",
+            "Dial one, eight zero zero, five five five, one two three four.",
+        ),
+    ],
+)
+def test_phone_numbers_read_digit_by_digit(text, expected):
+    assert normalize_text(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Read pages 10-20.", "Read pages ten to twenty."),
+        ("Up 10-20% this year.", "Up ten to twenty percent this year."),
+        ("From 1990-1995 only.", "From nineteen ninety to nineteen ninety-five only."),
+    ],
+)
+def test_ranges(text, expected):
+    assert normalize_text(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Pay $12.50 today.", "Pay twelve dollars and fifty cents today."),
+        (
+            "On 2024-01-15 at 3:30 pm.",
+            "On January fifteenth, twenty twenty-four at three thirty P M.",
+        ),
+        ("It was the 21st time.", "It was the twenty-first time."),
+        ("Growth of 45%.", "Growth of forty-five percent."),
+    ],
+)
+def test_existing_rules_unchanged(text, expected):
+    assert normalize_text(text) == expected
@@ -0,0 +1,124 @@
+"""Tests for voice blend parsing, canonical blend specs and registry reloads"""
+
+import asyncio
+
+import pytest
+
+from pattern_tts.core.config import settings
+from pattern_tts.services.voice_manager import (
+    VoiceManager,
+    canonical_voice_blend,
+    parse_voice_blend,
+)
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("af_bella+af_sky", [("af_bella", 1.0), ("af_sky", 1.0)]),
+        ("af_bella(2) + af_sky(.5)", [("af_bella", 2.0), ("af_sky", 0.5)]),
+        ("af_bella", None),
+        ("af_bella(x)+af_sky", None),
+        ("af_bella(0)+af_sky(0)", None),
+    ],
+)
+def test_parse_voice_blend(spec, expected):
+    assert parse_voice_blend(spec) == expected
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        "af_sky+af_bella",
+        "af_bella(1)+af_sky(1)",
+        "af_sky(0.5) + af_bella(0.5)",
+        "af_bella(3)+af_sky(3)",
+    ],
+)
+def test_equivalent_blends_share_a_canonical_spec(spec, monkeypatch):
+    monkeypatch.setattr(settings, "voice_weight_normalization", True)
+    assert canonical_voice_blend(parse_voice_blend(spec)) == "af_bella(0.5000)+af_sky(0.5000)"
+
+
+def test_canonical_spec_round_trips(monkeypatch):
+    monkeypatch.setattr(settings, "voice_weight_normalization", True)
+    canonical = canonical_voice_blend(parse_voice_blend("af_sky(1)+af_bella(2)"))
+    assert canonical == "af_bella(0.6667)+af_sky(0.3333)"
+    assert canonical_voice_blend(parse_voice_blend(canonical)) == canonical
+
+
+def test_canonical_spec_keeps_weights_without_normalization(monkeypatch):
+    monkeypatch.setattr(settings, "voice_weight_normalization", False)
+    spec = canonical_voice_blend(parse_voice_blend("af_sky(1)+af_bella(2)"))
+    assert spec == "af_bella(2.0000)+af_sky(1.0000)"
+
+
+@pytest.fixture
+def voices_dir(tmp_path):
+    (tmp_path / "af_heart.pt").write_bytes(b"pack")
+    return tmp_path
+
+
+def test_reload_reports_added_changed_and_removed_packs(voices_dir):
+    manager = VoiceManager(voices_dir)
+    changes = []
+    manager.add_listener(lambda added, removed: changes.append((added, removed)))
+
+    (voices_dir / "bm_george.pt").write_bytes(b"pack")
+    assert manager.reload()
+    assert manager.validate_voice("bm_george")
+    assert manager.get_voice_info("bm_george").lang_code == "b"
+
+    # A replaced pack is reported as removed and added again
+    (voices_dir / "af_heart.pt").write_bytes(b"new pack")
+    assert manager.reload()
+
+    (voices_dir / "bm_george.pt").unlink()
+    assert manager.reload()
+    assert not manager.validate_voice("bm_george")
+    assert not manager.validate_voice("af_heart+bm_george")
+
+    assert not manager.reload()
+    assert changes == [
+        (["bm_george"], []),
+        (["af_heart"], ["af_heart"]),
+        ([], ["bm_george"]),
+    ]
+
+
+async def test_watch_fires_listeners_once_per_change(voices_dir):
+    manager = VoiceManager(voices_dir)
+    changes = []
+    manager.add_listener(lambda added, removed: changes.append((added, removed)))
+
+    async def wait_for_changes(count):
+        while len(changes) < count:
+            await asyncio.sleep(0.01)
+        # Several more scans of an unchanged directory
+        await asyncio.sleep(0.1)
+
+    watcher = asyncio.create_task(manager.watch(interval=0.01))
+    try:
+        (voices_dir / "bm_george.pt").write_bytes(b"pack")
+        await asyncio.wait_for(wait_for_changes(1), 5)
+        (voices_dir / "bm_george.pt").unlink()
+        await asyncio.wait_for(wait_for_changes(2), 5)
+    finally:
+        watcher.cancel()
+
+    assert changes == [(["bm_george"], []), ([], ["bm_george"])]
+
+
+def test_failing_listener_does_not_stop_the_others(voices_dir):
+    manager = VoiceManager(voices_dir)
+    changes = []
+
+    def failing(added, removed):
+        raise RuntimeError("listener failed")
+
+    manager.add_listener(failing)
+    manager.add_listener(lambda added, removed: changes.append((added, removed)))
+    (voices_dir / "bm_george.pt").write_bytes(b"pack")
+
+    assert manager.reload()
+    assert changes == [(["bm_george"], [])]